@@ -0,0 +1,174 @@
+"""
+İstek süresi ve veritabanı sorgusu ölçümü (isteğe bağlı).
+
+`REQUEST_TIMING_ENABLED` ayarı açıksa her istek için view adı, toplam süre,
+sorgu sayısı ve sorgu süresi ölçülür:
+
+- Sorgular `connection.execute_wrapper` ile sayılır ve süreleri toplanır.
+- Personel kullanıcılara (veya DEBUG modunda herkese) `Server-Timing`
+  başlığı gönderilir; tarayıcının geliştirici araçlarında görünür.
+- Her view için son `REQUEST_TIMING_WINDOW` ölçüm süreç içinde tutulur ve
+  /admin/request-timing/ sayfasında gecikme histogramı olarak gösterilir.
+
+Ayar kapalıyken middleware başlangıçta MiddlewareNotUsed fırlatır ve Django
+onu middleware zincirinden çıkarır; isteklere hiçbir ek yük binmez.
+
+Ölçümler sürece özeldir; birden fazla worker çalışıyorsa sayfa sadece isteği
+karşılayan worker'ın ölçümlerini gösterir. Akış (streaming) yanıtlarında süre
+yanıt nesnesi oluşturulana kadar ölçülür.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.admin import site
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.shortcuts import redirect, render
+
+
+# Gecikme histogramının üst sınırları (milisaniye); sonuncusu sınırsız
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, None)
+
+
+def _bucket_labels():
+    labels = []
+    lower = 0
+    for upper in LATENCY_BUCKETS_MS:
+        if upper is None:
+            labels.append(f'≥{lower}')
+        else:
+            labels.append(f'<{upper}' if lower == 0 else f'{lower}–{upper}')
+        lower = upper
+    return labels
+
+
+LATENCY_BUCKET_LABELS = _bucket_labels()
+
+# Çözümlenemeyen (404) istekler için view adı
+UNRESOLVED_VIEW = '<çözümlenmemiş>'
+
+
+class _QueryTimer:
+    """execute_wrapper: çalışan sorguları sayar ve sürelerini toplar."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def _percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+class TimingRegistry:
+    """View başına son ölçümleri tutan thread-safe, boyut sınırlı kayıt."""
+
+    def __init__(self, window):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, total_ms, query_count, db_ms):
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = self._samples[view_name] = deque(maxlen=self.window)
+            samples.append((total_ms, query_count, db_ms))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        """View başına özet değerler; en yavaş (p95) view önce."""
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+
+        rows = []
+        for name, values in samples.items():
+            totals = sorted(total for total, _, _ in values)
+            histogram = []
+            lower = 0
+            for upper in LATENCY_BUCKETS_MS:
+                count = sum(1 for total in totals if total >= lower and (upper is None or total < upper))
+                histogram.append({'lower': lower, 'upper': upper, 'count': count})
+                lower = upper
+            rows.append({
+                'view': name,
+                'count': len(values),
+                'p50_ms': _percentile(totals, 50),
+                'p95_ms': _percentile(totals, 95),
+                'max_ms': totals[-1],
+                'avg_queries': sum(count for _, count, _ in values) / len(values),
+                'avg_db_ms': sum(db for _, _, db in values) / len(values),
+                'histogram': histogram,
+            })
+        rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return rows
+
+
+registry = TimingRegistry(getattr(settings, 'REQUEST_TIMING_WINDOW', 500))
+
+
+class RequestTimingMiddleware:
+    """
+    Her isteğin süresini ve sorgularını ölçer. MIDDLEWARE listesinin başında
+    olmalıdır; böylece diğer middleware'lerin sorguları da ölçüme dahil olur.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed('REQUEST_TIMING_ENABLED kapalı')
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_timer = _QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_timer))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = query_timer.duration * 1000
+
+        match = request.resolver_match
+        view_name = match.view_name if match else UNRESOLVED_VIEW
+        registry.record(view_name, total_ms, query_timer.count, db_ms)
+
+        user = getattr(request, 'user', None)
+        if settings.DEBUG or (user is not None and user.is_staff):
+            response['Server-Timing'] = (
+                f'total;dur={total_ms:.1f}, '
+                f'db;dur={db_ms:.1f};desc="{query_timer.count} queries", '
+                f'app;dur={max(0.0, total_ms - db_ms):.1f}'
+            )
+        return response
+
+
+@staff_member_required
+def timing_report(request):
+    """Yönetici sayfası: view başına gecikme histogramı ve sorgu istatistikleri."""
+    if request.method == 'POST' and 'clear' in request.POST:
+        registry.clear()
+        return redirect(request.path)
+    return render(request, 'admin/request_timing.html', {
+        **site.each_context(request),
+        'title': 'İstek süreleri',
+        'enabled': getattr(settings, 'REQUEST_TIMING_ENABLED', False),
+        'window': registry.window,
+        'rows': registry.snapshot(),
+        'bucket_labels': LATENCY_BUCKET_LABELS,
+    })
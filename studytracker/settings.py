@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'studytracker.instrumentation.RequestTimingMiddleware',  # İstek süresi / sorgu ölçümü (REQUEST_TIMING kapalıysa devre dışı)
     'django.middleware.security.SecurityMiddleware',  # Güvenlik middleware'i
     'django.contrib.sessions.middleware.SessionMiddleware',  # Oturum middleware'i
     'django.middleware.common.CommonMiddleware',  # Ortak middleware
@@ -64,7 +65,7 @@ ROOT_URLCONF = 'studytracker.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],  # Ek şablon dizinleri
+        'DIRS': [BASE_DIR / 'studytracker' / 'templates'],  # Proje şablonları (yönetici sayfaları)
         'APP_DIRS': True,  # Uygulama dizinlerinde şablon arama
         'OPTIONS': {
             'context_processors': [
@@ -83,16 +84,74 @@ WSGI_APPLICATION = 'studytracker.wsgi.application'
 # Veritabanı yapılandırması
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',  # PostgreSQL veritabanı motoru
-        'NAME': os.getenv('DB_NAME', 'studytracker_db'),  # Veritabanı adı - .env dosyasından okunuyor
-        'USER': os.getenv('DB_USER', 'postgres'),  # Veritabanı kullanıcı adı - .env dosyasından okunuyor
-        'PASSWORD': os.getenv('DB_PASSWORD', ''),  # Veritabanı şifresi - .env dosyasından okunuyor
-        'HOST': os.getenv('DB_HOST', 'localhost'),  # Veritabanı sunucu adresi - .env dosyasından okunuyor
-        'PORT': os.getenv('DB_PORT', '5432'),  # Veritabanı bağlantı portu - .env dosyasından okunuyor
+# DB_ENGINE=sqlite ise PostgreSQL yerine yerel SQLite dosyası kullanılır (geliştirme ve ölçümler için)
+
+if os.getenv('DB_ENGINE', 'postgresql') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',  # SQLite veritabanı motoru
+            'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),  # Veritabanı dosyası - .env dosyasından okunuyor
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',  # PostgreSQL veritabanı motoru
+            'NAME': os.getenv('DB_NAME', 'studytracker_db'),  # Veritabanı adı - .env dosyasından okunuyor
+            'USER': os.getenv('DB_USER', 'postgres'),  # Veritabanı kullanıcı adı - .env dosyasından okunuyor
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),  # Veritabanı şifresi - .env dosyasından okunuyor
+            'HOST': os.getenv('DB_HOST', 'localhost'),  # Veritabanı sunucu adresi - .env dosyasından okunuyor
+            'PORT': os.getenv('DB_PORT', '5432'),  # Veritabanı bağlantı portu - .env dosyasından okunuyor
+        }
+    }
+
+# Bağlantıların yeniden kullanımı
+# - DB_CONN_MAX_AGE: kalıcı bağlantının saniye cinsinden ömrü (varsayılan 0 = her istekte yeni bağlantı;
+#   kalıcı bağlantı için örn. 60, bkz. `manage.py benchmark_connections`)
+# - DB_CONN_HEALTH_CHECKS: kalıcı bağlantı yeniden kullanılmadan önce kontrol edilir (kopmuş bağlantı hatası olmaz)
+# - DB_POOL=True: PostgreSQL için psycopg 3 bağlantı havuzu (psycopg[pool] paketi gerekli, bkz. requirements.txt).
+#   Havuz kullanılırken kalıcı bağlantı kapatılır; bağlantılar istek sonunda havuza geri döner.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True' and DATABASES['default']['ENGINE'].endswith('postgresql')
+
+DATABASES['default']['CONN_MAX_AGE'] = 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '0'))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),  # Açık tutulan en az bağlantı
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),  # Süreç başına en fazla bağlantı
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),  # Boş bağlantı bekleme süresi (saniye)
+        },
+    }
+
+
+# Önbellek yapılandırması
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# REDIS_URL tanımlıysa Redis (süreçler arası paylaşılan), değilse süreç içi bellek önbelleği kullanılır.
+# Önbellek sürümleri veritabanında tutulduğu için süreç içi önbellekte de geçersiz kılma tüm süreçlere ulaşır;
+# Redis sadece hesaplanan değerlerin süreçler arasında paylaşılmasını sağlar.
+# Dashboard aggregate değerleri bu önbelleğin önünde ayrıca süreç içi LRU ile tutulur (bkz. tracker/cache.py).
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',  # Redis önbelleği (redis paketi gerekli)
+            'LOCATION': os.getenv('REDIS_URL'),  # Redis bağlantı adresi - .env dosyasından okunuyor
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',  # Süreç içi bellek önbelleği
+            'LOCATION': 'studytracker',
+        }
+    }
+
+
+# İstek süresi ve sorgu ölçümü (bkz. studytracker/instrumentation.py)
+# Açıkken Server-Timing başlığı (personel kullanıcılara) ve /admin/request-timing/ sayfası kullanılabilir.
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING', 'False') == 'True'
+REQUEST_TIMING_WINDOW = int(os.getenv('REQUEST_TIMING_WINDOW', '500'))  # View başına saklanan son ölçüm sayısı
 
 
 # Şifre doğrulama
@@ -17,7 +17,10 @@ Başka bir URLconf dahil etme
 from django.contrib import admin
 from django.urls import path, include
 
+from studytracker import instrumentation
+
 urlpatterns = [
+    path('admin/request-timing/', instrumentation.timing_report, name='request_timing'),  # İstek süreleri (sadece yöneticiler)
     path('admin/', admin.site.urls),  # Django yönetim paneli
     path('', include('tracker.urls')),  # Tracker uygulamasının URL'lerini dahil et
 ]
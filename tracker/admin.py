@@ -1,5 +1,7 @@
+from django import forms
 from django.contrib import admin
-from .models import StudySession, CalendarEvent
+from . import subjects
+from .models import StudySession, CalendarEvent, Subject
 
 # Modellerinizi buraya kaydedin.
 
@@ -76,3 +78,37 @@ class CalendarEventAdmin(admin.ModelAdmin):
     list_filter = ['date', 'user']
     search_fields = ['title']
     ordering = ['-date']
+
+
+class SubjectAdminForm(forms.ModelForm):
+    """
+    Anahtar her zaman addan türetilir (bkz. subjects.normalize_subject).
+    Anahtar formda salt okunur olduğundan (kullanıcı, anahtar) benzersizliği
+    burada denetlenir; kullanıcının başka bir dersiyle çakışan ad hata verir.
+    """
+
+    class Meta:
+        model = Subject
+        fields = ['user', 'name']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        user, name = cleaned_data.get('user'), cleaned_data.get('name')
+        if user is None or name is None:
+            return cleaned_data
+        key = subjects.normalize_subject(name)
+        clash = Subject.objects.filter(user=user, key=key).exclude(pk=self.instance.pk).first()
+        if clash is not None:
+            self.add_error('name', f'Bu kullanıcının aynı anahtarlı bir dersi zaten var: "{clash.name}".')
+        else:
+            self.instance.key = key
+        return cleaned_data
+
+
+@admin.register(Subject)
+class SubjectAdmin(admin.ModelAdmin):
+    form = SubjectAdminForm
+    list_display = ['user', 'name', 'key', 'created_at']
+    list_filter = ['user']
+    search_fields = ['name', 'key']
+    readonly_fields = ['key']
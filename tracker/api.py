@@ -0,0 +1,278 @@
+"""
+Salt okunur JSON API (v1): çalışma kayıtları, görevler, takvim etkinlikleri,
+hedefler ve hesaplanmış istatistikler.
+
+Tüm uç noktalar kullanıcıya özel ETag üretir ve Django'nun `condition`
+dekoratörüyle koşullu GET'i destekler; veri değişmediyse liste sorguları ve
+aggregate hesapları hiç çalışmadan `304 Not Modified` döner.
+
+- Liste uç noktalarında (sessions, todos, events) doğrulayıcılar tek bir
+  `Count` + `Max(updated_at)` sorgusundan türetilir ve Last-Modified de
+  gönderilir. Silinen kayıtlar `updated_at` değerini ilerletmediği için kayıt
+  sayısı ETag'e katılır; If-None-Match gönderen istemciler silmeleri de görür.
+- Hesaplanmış uç noktalarda (stats, goals) ETag kullanıcının önbellek sürümü
+  (bkz. cache.get_user_version) ve yerel tarihten oluşur; sadece sürüm satırı
+  okunur, aggregate hesapları çalışmaz. Bu değerler gece yarısı da değiştiği
+  için Last-Modified gönderilmez.
+"""
+import hashlib
+from datetime import date, timedelta
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from . import cache, export
+from .models import UserStudyGoal
+from .pagination import InvalidCursor, keyset_page
+
+
+API_VERSION = 'v1'
+
+# Liste uç noktalarında varsayılan ve en büyük sayfa boyutu
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 500
+
+# Kullanıcının hedef kaydı yoksa gösterilecek varsayılan hedefler (dakika)
+DEFAULT_GOALS = {'daily_goal_minutes': 60, 'weekly_goal_minutes': 420, 'monthly_goal_minutes': 1800}
+
+
+class ApiError(ValueError):
+    """Geçersiz sorgu parametresi; 400 olarak döner."""
+
+
+def api_view(view):
+    """
+    API view'ları için ortak sarmalayıcı: oturum açılmamışsa 401, GET / HEAD
+    dışındaki isteklerde 405 döner; ApiError'ları 400 JSON yanıtına çevirir.
+    Yanıtlar tarayıcıda saklanabilir ama her seferinde doğrulanmalıdır.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'ok': False, 'error': 'Giriş yapmalısınız'}, status=401)
+        if request.method not in ('GET', 'HEAD'):
+            response = JsonResponse({'ok': False, 'error': 'Sadece GET desteklenir'}, status=405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        try:
+            response = view(request, *args, **kwargs)
+        except ApiError as exc:
+            return JsonResponse({'ok': False, 'error': str(exc)}, status=400)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
+
+
+def _etag(*parts):
+    raw = ':'.join(str(part) for part in (API_VERSION,) + parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+# ==========================
+# DOĞRULAYICILAR (ETag / Last-Modified)
+# ==========================
+
+def _list_validators(request, dataset):
+    """
+    Veri türünün kayıt sayısı ve en son güncellenme zamanı. `condition`
+    ETag ve Last-Modified fonksiyonlarını ayrı ayrı çağırdığı için sonuç
+    istek üzerinde saklanır; istek başına tek sorgu çalışır.
+    """
+    memo = request.__dict__.setdefault('_api_validators', {})
+    if dataset not in memo:
+        model = export.EXPORT_DATASETS[dataset][0]
+        memo[dataset] = model.objects.filter(user=request.user).aggregate(
+            count=Count('pk'), last_modified=Max('updated_at')
+        )
+    return memo[dataset]
+
+
+def _list_etag(dataset):
+    def etag(request, *args, **kwargs):
+        validators = _list_validators(request, dataset)
+        last_modified = validators['last_modified']
+        return _etag(
+            dataset,
+            request.user.id,
+            validators['count'],
+            last_modified.timestamp() if last_modified else 0,
+        )
+    return etag
+
+
+def _list_last_modified(dataset):
+    def last_modified(request, *args, **kwargs):
+        return _list_validators(request, dataset)['last_modified']
+    return last_modified
+
+
+def _computed_etag(name):
+    """Önbellek sürümü her kayıt / görev / hedef değişiminde yenilenir (bkz. signals)."""
+    def etag(request, *args, **kwargs):
+        user_id = request.user.id
+        return _etag(name, user_id, cache.get_user_version(user_id), timezone.localdate().isoformat())
+    return etag
+
+
+def list_endpoint(dataset):
+    """Liste uç noktası: ETag + Last-Modified ile koşullu GET."""
+    return condition(etag_func=_list_etag(dataset), last_modified_func=_list_last_modified(dataset))
+
+
+def computed_endpoint(name):
+    """Hesaplanmış değerler: sadece ETag ile koşullu GET."""
+    return condition(etag_func=_computed_etag(name))
+
+
+# ==========================
+# PARAMETRELER VE SAYFALAMA
+# ==========================
+
+def _date_param(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f'Geçersiz tarih: {name} (yyyy-mm-dd bekleniyor)')
+
+
+def _date_range(request, queryset, field):
+    start = _date_param(request, 'start')
+    end = _date_param(request, 'end')
+    if start and end and start > end:
+        raise ApiError('Başlangıç tarihi bitiş tarihinden sonra olamaz')
+    if start:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{field}__lte': end})
+    return queryset
+
+
+def _paginated(request, queryset, dataset):
+    """
+    Keyset sayfalamayla bir sayfa kayıt döndürür. Sonraki sayfa için
+    `next_cursor` değeri `?cursor=` parametresiyle gönderilir.
+    """
+    try:
+        limit = int(request.GET.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Geçersiz limit')
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+
+    fields = export.export_fields(dataset)
+    try:
+        page = keyset_page(queryset.only(*fields), limit, after=request.GET.get('cursor') or None)
+    except InvalidCursor:
+        raise ApiError('Geçersiz cursor')
+
+    return {
+        'ok': True,
+        'results': [
+            {name: export.serialize_value(getattr(obj, name)) for name in fields}
+            for obj in page
+        ],
+        'next_cursor': page.next_cursor,
+    }
+
+
+def _model(dataset):
+    return export.EXPORT_DATASETS[dataset][0]
+
+
+# ==========================
+# UÇ NOKTALAR
+# ==========================
+
+@api_view
+@list_endpoint('sessions')
+def sessions(request):
+    """Çalışma kayıtları (en yeni önce). Parametreler: start, end, limit, cursor."""
+    queryset = _date_range(request, _model('sessions').objects.filter(user=request.user), 'date')
+    return JsonResponse(_paginated(request, queryset, 'sessions'))
+
+
+@api_view
+@list_endpoint('todos')
+def todos(request):
+    """Görevler (en yeni önce). Parametreler: status (all/pending/completed), limit, cursor."""
+    queryset = _model('todos').objects.filter(user=request.user)
+    status = request.GET.get('status', 'all')
+    if status == 'pending':
+        queryset = queryset.filter(completed=False)
+    elif status == 'completed':
+        queryset = queryset.filter(completed=True)
+    elif status != 'all':
+        raise ApiError('Geçersiz status')
+    return JsonResponse(_paginated(request, queryset, 'todos'))
+
+
+@api_view
+@list_endpoint('events')
+def events(request):
+    """Takvim etkinlikleri (tarih sırasıyla). Parametreler: start, end, limit, cursor."""
+    queryset = _date_range(request, _model('events').objects.filter(user=request.user), 'date')
+    return JsonResponse(_paginated(request, queryset, 'events'))
+
+
+def _period_minutes(date_totals, today, days):
+    start = today - timedelta(days=days - 1)
+    return sum(minutes for day, minutes in date_totals.items() if start <= day <= today)
+
+
+@api_view
+@computed_endpoint('goals')
+def goals(request):
+    """Günlük / haftalık / aylık hedefler ve bugünkü, son 7 / 30 günlük ilerleme."""
+    user = request.user
+    today = timezone.localdate()
+    goal = UserStudyGoal.objects.filter(user=user).values(*DEFAULT_GOALS).first() or DEFAULT_GOALS
+    date_totals = {day: minutes for day, (minutes, _) in cache.daily_totals(user, today).items()}
+
+    payload = {'ok': True, 'date': today}
+    for name, days in (('daily', 1), ('weekly', 7), ('monthly', 30)):
+        target = goal[f'{name}_goal_minutes']
+        minutes = _period_minutes(date_totals, today, days)
+        payload[name] = {
+            'goal_minutes': target,
+            'minutes': minutes,
+            'progress_percent': min(100, minutes * 100 // target) if target else 0,
+        }
+    return JsonResponse(payload)
+
+
+@api_view
+@computed_endpoint('stats')
+def stats(request):
+    """İstatistik sayfasının özet değerleri: toplamlar, streak'ler ve görev sayıları."""
+    user = request.user
+    today = timezone.localdate()
+    totals = cache.daily_totals(user, today)
+    date_totals = {day: minutes for day, (minutes, _) in totals.items()}
+    threshold = cache.daily_threshold(user, today)
+    streak = cache.streak_summary(user, today)
+
+    return JsonResponse({
+        'ok': True,
+        'date': today,
+        'study': {
+            'total_minutes': sum(date_totals.values()),
+            'total_sessions': sum(session_count for _, session_count in totals.values()),
+            'study_days': len(date_totals),
+            'first_study_date': min(date_totals) if date_totals else None,
+            'today_minutes': date_totals.get(today, 0),
+            'last_7_days_minutes': _period_minutes(date_totals, today, 7),
+            'last_30_days_minutes': _period_minutes(date_totals, today, 30),
+        },
+        'streak': {
+            'threshold_minutes': threshold,
+            'current': streak['current'],
+            'longest': streak['longest'],
+        },
+        'todos': cache.todo_summary(user, today),
+    })
@@ -7,3 +7,7 @@ class TrackerConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'  # Varsayılan otomatik alan türü
     name = 'tracker'  # Uygulama adı
+
+    def ready(self):
+        # Sinyal alıcılarını kaydet (özet tabloların senkronizasyonu)
+        from . import signals  # noqa: F401
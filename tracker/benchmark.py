@@ -0,0 +1,447 @@
+"""
+Performans ölçümü için sentetik veri üretimi ve sayfa ölçümleri.
+
+`seed_benchmark_data` komutu gerçekçi dağılımlarla (yıllarca geçmiş, uzun
+streak'ler, ara sıra boşluklar, baskın birkaç ders) kullanıcılar oluşturur;
+`benchmark_views` komutu ana sayfaları bu kullanıcılarla çalıştırıp süre ve
+sorgu sayılarını JSON olarak yazar. İki çalışmanın çıktısı `--compare` ile
+karşılaştırılabilir.
+
+`benchmark_connections` komutu ise ucuz bir isteği her istekte yeni
+bağlantı, kalıcı bağlantı (CONN_MAX_AGE) ve bağlantı havuzu modlarında
+çalıştırıp istek başına bağlantı maliyetini ölçer.
+
+Sayfalar RequestFactory ile doğrudan view fonksiyonu çağrılarak ölçülür;
+middleware (oturum, CSRF) süreleri dahil değildir. PostgreSQL gerekmez,
+`DB_ENGINE=sqlite` ile yerelde çalışır.
+"""
+import platform
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.core.signals import request_finished, request_started
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from . import cache, rollups, subjects
+from .models import CalendarEvent, StudySession, TodoItem, UserStudyGoal
+
+
+# Veritabanına tek seferde yazılacak kayıt sayısı
+SEED_BATCH_SIZE = 2000
+
+# Zaman damgalarını yazan toplu güncellemenin tek sorgudaki kayıt sayısı;
+# her kayıt CASE ifadesine bir koşul ekler, büyük gruplar yavaşlar
+TIMESTAMP_BATCH_SIZE = 200
+
+# Ölçülen sayfalar: (ad, URL adı, GET parametreleri)
+BENCHMARK_VIEWS = (
+    ('index', 'tracker:index', {}),
+    ('study_tracking', 'tracker:study_tracking', {}),
+    ('statistics', 'tracker:statistics', {}),
+    ('todo_list', 'tracker:todo_list', {}),
+    ('calendar_view', 'tracker:calendar', {}),
+)
+
+# Bağlantı ölçümünde kalıcı bağlantı modunun ömrü (saniye)
+PERSISTENT_CONN_MAX_AGE = 600
+
+# Ders adları ve ağırlıkları: birkaç ders kayıtların çoğunu oluşturur
+SUBJECTS = (
+    ('Matematik', 30), ('Fizik', 18), ('Kimya', 12), ('Biyoloji', 10), ('Türkçe', 9),
+    ('Tarih', 6), ('Coğrafya', 5), ('İngilizce', 5), ('Felsefe', 3), ('Geometri', 2),
+)
+
+TODO_TITLES = (
+    'Deneme sınavı çöz', 'Konu tekrarı yap', 'Ödevi teslim et', 'Formül kartlarını hazırla',
+    'Soru bankası 20 soru', 'Kitap özeti çıkar', 'Video dersi izle', 'Notları temize çek',
+)
+
+EVENT_TITLES = ('Sınav', 'Deneme', 'Ödev teslimi', 'Proje', 'Etüt', 'Quiz')
+
+
+def _bulk_create_with_timestamps(model, rows, batch_size):
+    """
+    Kayıtları toplu ekler, ardından created_at / updated_at değerlerini
+    toplu güncellemeyle yazar; böylece üretilen kayıtların zamanları geçmişe
+    yayılabilir (saatlik dağılım ve son 7 gün görev özeti için gerekli).
+    bulk_create auto_now / auto_now_add alanlarını şimdiki zamanla doldurur.
+    """
+    if not rows:
+        return
+    stamps = [(row.created_at, row.updated_at) for row in rows]
+    model.objects.bulk_create(rows, batch_size=batch_size)
+    if rows[0].pk is None:
+        # bulk_create bazı veritabanlarında (SQLite < 3.35) id döndürmez;
+        # transaction içinde eklenen kayıtlar tablonun son id'leridir
+        ids = model.objects.order_by('-id').values_list('id', flat=True)[:len(rows)]
+        for row, pk in zip(rows, sorted(ids)):
+            row.pk = pk
+    for row, (created_at, updated_at) in zip(rows, stamps):
+        row.created_at, row.updated_at = created_at, updated_at
+    model.objects.bulk_update(rows, ['created_at', 'updated_at'], batch_size=TIMESTAMP_BATCH_SIZE)
+
+
+def _local_datetime(day, rng, start_hour=7, end_hour=24):
+    """Günün yerel saatinde rastgele bir an (akşam saatleri daha olası)."""
+    hour = min(end_hour - 1, int(rng.triangular(start_hour, end_hour, 20)))
+    moment = datetime.combine(day, dt_time(hour, rng.randrange(60), rng.randrange(60)))
+    return timezone.make_aware(moment)
+
+
+def _study_days(rng, days, today):
+    """
+    Çalışılan günleri üretir: uzun çalışma dönemleri (streak) ile kısa
+    boşluklar birbirini izler. Dönem uzunlukları kullanıcıya göre değişir.
+    """
+    mean_run = rng.uniform(15, 90)
+    mean_break = rng.uniform(1.5, 6)
+    day = today - timedelta(days=days - 1)
+    studying = rng.random() < 0.8
+    while day <= today:
+        length = max(1, int(rng.expovariate(1 / (mean_run if studying else mean_break))))
+        for _ in range(length):
+            if day > today:
+                break
+            if studying:
+                yield day
+            day += timedelta(days=1)
+        studying = not studying
+
+
+def _sessions_for_day(user, day, rng, subject_refs, weights):
+    """Bir gün için 1-4 oturum; toplam süre çoğunlukla streak eşiğinin üstünde."""
+    rows = []
+    names = list(subject_refs)
+    for _ in range(rng.choices((1, 2, 3, 4), weights=(30, 40, 20, 10))[0]):
+        duration = max(5, min(240, int(rng.lognormvariate(3.8, 0.5))))
+        moment = _local_datetime(day, rng)
+        name = rng.choices(names, weights=weights)[0]
+        rows.append(StudySession(
+            user=user,
+            subject=name,
+            subject_ref=subject_refs[name],
+            duration=duration,
+            date=day,
+            note='Tekrar yapıldı' if rng.random() < 0.15 else None,
+            created_at=moment,
+            updated_at=moment,
+        ))
+    return rows
+
+
+def _todos(user, days, today, rng):
+    rows = []
+    for _ in range(max(1, days // 3)):
+        created = _local_datetime(today - timedelta(days=rng.randrange(days)), rng)
+        age_days = (timezone.now() - created).days
+        completed = rng.random() < (0.95 if age_days > 14 else 0.5)
+        important = not completed and rng.random() < 0.2
+        updated = created + timedelta(hours=rng.randrange(1, 72)) if completed else created
+        rows.append(TodoItem(
+            user=user,
+            title=rng.choice(TODO_TITLES),
+            completed=completed,
+            is_important=important,
+            important_marked_at=created if important else None,
+            created_at=created,
+            updated_at=min(updated, timezone.now()),
+        ))
+    return rows
+
+
+def _events(user, days, today, rng):
+    colors = [color for color, _ in CalendarEvent.COLOR_CHOICES]
+    rows = []
+    for _ in range(max(1, days // 7)):
+        # Etkinliklerin bir kısmı gelecekte (yaklaşan sınavlar)
+        day = today + timedelta(days=rng.randrange(-days, 60))
+        created = _local_datetime(min(day, today), rng)
+        rows.append(CalendarEvent(
+            user=user,
+            date=day,
+            title=rng.choice(EVENT_TITLES),
+            color=rng.choice(colors),
+            created_at=created,
+            updated_at=created,
+        ))
+    return rows
+
+
+def seed(users=5, days=3 * 365, prefix='bench_', seed_value=0, password='benchmark', batch_size=SEED_BATCH_SIZE):
+    """
+    `users` adet kullanıcı ve her biri için `days` günlük geçmiş oluşturur.
+    Aynı `seed_value` ile aynı veri üretilir. Oluşturulan kayıt sayılarını döndürür.
+    """
+    rng = random.Random(seed_value)
+    today = timezone.localdate()
+    subject_names = [name for name, _ in SUBJECTS]
+    weights = [weight for _, weight in SUBJECTS]
+    counts = {'users': 0, 'sessions': 0, 'todos': 0, 'events': 0}
+
+    # Parola özeti bir kez hesaplanır; kullanıcı başına hash maliyeti olmaz
+    password_hash = make_password(password)
+    with transaction.atomic():
+        created_users = User.objects.bulk_create([
+            User(username=f'{prefix}{i}', password=password_hash) for i in range(users)
+        ])
+        # bulk_create bazı veritabanlarında (SQLite < 3.35) id döndürmez
+        created_users = list(User.objects.filter(username__in=[user.username for user in created_users]).order_by('id'))
+        counts['users'] = len(created_users)
+
+        UserStudyGoal.objects.bulk_create([
+            UserStudyGoal(
+                user=user,
+                weekly_goal_minutes=rng.choice((300, 420, 600, 840)),
+                monthly_goal_minutes=rng.choice((1200, 1800, 2400, 3600)),
+            )
+            for user in created_users
+        ])
+
+        for user in created_users:
+            subject_refs = subjects.resolve_subjects(user.id, subject_names)
+            batch = []
+            for day in _study_days(rng, days, today):
+                batch.extend(_sessions_for_day(user, day, rng, subject_refs, weights))
+                if len(batch) >= batch_size:
+                    _bulk_create_with_timestamps(StudySession, batch, batch_size)
+                    counts['sessions'] += len(batch)
+                    batch = []
+            _bulk_create_with_timestamps(StudySession, batch, batch_size)
+            counts['sessions'] += len(batch)
+
+            todos = _todos(user, days, today, rng)
+            _bulk_create_with_timestamps(TodoItem, todos, batch_size)
+            counts['todos'] += len(todos)
+
+            events = _events(user, days, today, rng)
+            _bulk_create_with_timestamps(CalendarEvent, events, batch_size)
+            counts['events'] += len(events)
+
+        # bulk_create sinyal göndermez; türetilmiş veriler bir kez güncellenir
+        user_ids = [user.id for user in created_users]
+        rollups.rebuild_daily_totals(user_ids=user_ids, batch_size=batch_size)
+        for user_id in user_ids:
+            cache.invalidate_user(user_id)
+    return counts
+
+
+def _clear_caches():
+    django_cache.clear()
+    cache.local_cache.clear()
+
+
+def _run_view(view, request):
+    response = view(request)
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    return response
+
+
+def measure_view(users, url_name, params, repeat=10):
+    """
+    Bir sayfayı her kullanıcı için önce soğuk (önbellekler boş), sonra
+    `repeat` kez sıcak önbellekle çalıştırır. Süreler milisaniyedir.
+    """
+    factory = RequestFactory()
+    path = reverse(url_name)
+    view = resolve(path).func
+    cold, warm, cold_queries, queries = [], [], [], []
+
+    # Ölçülmeyen ilk çağrı: şablon derleme, URL çözümleme gibi süreç başı maliyetler
+    warmup = factory.get(path, params)
+    warmup.user = users[0]
+    _run_view(view, warmup)
+
+    for user in users:
+        for run in range(repeat + 1):
+            if run == 0:
+                _clear_caches()
+            request = factory.get(path, params)
+            request.user = user
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = _run_view(view, request)
+                elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                raise RuntimeError(f'{url_name} {response.status_code} döndürdü')
+            if run == 0:
+                cold.append(elapsed)
+                cold_queries.append(len(ctx.captured_queries))
+            else:
+                warm.append(elapsed)
+                queries.append(len(ctx.captured_queries))
+
+    warm.sort()
+    return {
+        'runs': len(warm),
+        'cold_ms': round(statistics.mean(cold), 2),
+        'cold_queries': max(cold_queries),
+        'queries': max(queries),
+        'mean_ms': round(statistics.mean(warm), 2),
+        'p50_ms': round(statistics.median(warm), 2),
+        'p95_ms': round(warm[min(len(warm) - 1, int(len(warm) * 0.95))], 2),
+        'min_ms': round(warm[0], 2),
+        'max_ms': round(warm[-1], 2),
+    }
+
+
+def _environment():
+    return {
+        'database': connection.vendor,
+        'django': django.get_version(),
+        'python': platform.python_version(),
+    }
+
+
+def run(users, repeat=10, views=BENCHMARK_VIEWS):
+    """Tüm sayfaları ölçer ve JSON'a yazılabilir sonuç sözlüğünü döndürür."""
+    return {
+        'created_at': timezone.now().isoformat(),
+        'environment': _environment(),
+        'users': [user.username for user in users],
+        'data': {
+            'sessions': StudySession.objects.filter(user__in=users).count(),
+            'todos': TodoItem.objects.filter(user__in=users).count(),
+            'events': CalendarEvent.objects.filter(user__in=users).count(),
+        },
+        'repeat': repeat,
+        'results': {name: measure_view(users, url_name, params, repeat) for name, url_name, params in views},
+    }
+
+
+def compare(previous, current):
+    """
+    İki sonuç arasındaki farklar: [(sayfa, metrik, önceki, şimdiki, değişim %), ...].
+    Sadece her iki sonuçta da olan sayfalar karşılaştırılır.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if not before:
+            continue
+        for metric in ('queries', 'cold_queries', 'p50_ms', 'p95_ms', 'cold_ms'):
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = ((new - old) / old * 100) if old else (0.0 if new == old else float('inf'))
+            rows.append((name, metric, old, new, change))
+    return rows
+
+
+# ==========================
+# BAĞLANTI YENİDEN KULLANIMI
+# ==========================
+
+def _connection_modes(settings_dict):
+    """Karşılaştırılan modlar: (ad, CONN_MAX_AGE, havuz ayarları)."""
+    pool = settings_dict.get('OPTIONS', {}).get('pool')
+    modes = [
+        ('per_request', 0, None),
+        ('persistent', PERSISTENT_CONN_MAX_AGE, None),
+    ]
+    if pool:
+        modes.append(('pool', 0, pool))
+    return modes
+
+
+@contextmanager
+def _connection_mode(max_age, pool):
+    """Varsayılan bağlantının ayarlarını ölçüm süresince değiştirir ve sonra geri yükler."""
+    settings_dict = connection.settings_dict
+    options = settings_dict.setdefault('OPTIONS', {})
+    saved_max_age = settings_dict.get('CONN_MAX_AGE', 0)
+    saved_pool = options.get('pool')
+    connection.close()
+    settings_dict['CONN_MAX_AGE'] = max_age
+    if pool:
+        options['pool'] = pool
+    else:
+        options.pop('pool', None)
+    try:
+        yield
+    finally:
+        connection.close()
+        settings_dict['CONN_MAX_AGE'] = saved_max_age
+        if saved_pool:
+            options['pool'] = saved_pool
+        else:
+            options.pop('pool', None)
+
+
+def _simulated_request(user, day):
+    """
+    `calendar_add_event` benzeri ucuz bir istek: istek başı / sonu sinyalleri
+    (bağlantıyı kapatan veya havuza döndüren close_old_connections) ve tek
+    bir INSERT.
+    """
+    request_started.send(sender=__name__)
+    try:
+        return CalendarEvent.objects.create(user=user, date=day, title='Bağlantı ölçümü').pk
+    finally:
+        request_finished.send(sender=__name__)
+
+
+def measure_connection_reuse(user, requests=200):
+    """
+    Aynı ucuz isteği her istekte yeni bağlantı, kalıcı bağlantı ve (ayarlıysa)
+    bağlantı havuzu modlarında `requests` kez çalıştırır. Her mod için süreler
+    (ms), açılan bağlantı sayısı ve istek başına kazanç döner. Oluşturulan
+    etkinlikler ölçüm sonunda silinir.
+    """
+    if connection.in_atomic_block:
+        raise RuntimeError('Bağlantı ölçümü bir transaction içinde çalıştırılamaz.')
+
+    day = timezone.localdate()
+    results = {}
+    for name, max_age, pool in _connection_modes(connection.settings_dict):
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        durations, created = [], []
+        connection_created.connect(count_connection, weak=False)
+        try:
+            with _connection_mode(max_age, pool):
+                # Ölçülmeyen ilk istek (havuzun açılması vb.)
+                created.append(_simulated_request(user, day))
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    created.append(_simulated_request(user, day))
+                    durations.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(count_connection)
+        CalendarEvent.objects.filter(pk__in=created).delete()
+
+        durations.sort()
+        results[name] = {
+            'conn_max_age': max_age,
+            'pool': bool(pool),
+            'connections_opened': opened.count(connection.alias),
+            'mean_ms': round(statistics.mean(durations), 3),
+            'p50_ms': round(statistics.median(durations), 3),
+            'p95_ms': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+        }
+
+    baseline = results['per_request']['mean_ms']
+    for values in results.values():
+        values['saved_ms_per_request'] = round(baseline - values['mean_ms'], 3)
+
+    return {
+        'created_at': timezone.now().isoformat(),
+        'environment': _environment(),
+        'requests': requests,
+        'results': results,
+    }
@@ -0,0 +1,207 @@
+"""
+Kullanıcı bazlı dashboard aggregate önbelleği.
+
+İki katmanlıdır: süreç içi küçük bir LRU önbellek ve arkasında Django cache
+backend'i (settings.CACHES). Anahtarlar kullanıcı, veri sürümü ve yerel
+tarihten (Europe/Istanbul) oluşur:
+
+    tracker:agg:<user_id>:<sürüm>:<yyyy-mm-dd>:<ad>
+
+Kullanıcının bir StudySession, TodoItem veya UserStudyGoal kaydı değiştiğinde
+sürüm yenilenir (bkz. tracker/signals.py); eski anahtarlara bir daha
+erişilmez ve LRU'dan zamanla düşer. Sürüm veritabanında (CacheVersion)
+tutulur ve yazmayla aynı transaction içinde yenilenir; Django cache'i süreç
+içi (LocMemCache) olsa bile başka süreçlerdeki önbellekler de commit anında
+geçersiz olur. Sürüm istek başına bir kez okunur. Tarih anahtarın parçası
+olduğundan gece yarısı geçişinde yeni gün için değerler yeniden hesaplanır.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.utils import timezone
+
+from . import stats, streaks, subjects
+from .models import CacheVersion, DailyStudyTotal
+
+
+# Süreç içi önbellekte tutulacak en fazla anahtar sayısı
+LOCAL_CACHE_SIZE = 2048
+
+# Django cache backend'inde aggregate değerlerinin yaşam süresi (saniye)
+CACHE_TIMEOUT = 60 * 60 * 24
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """Thread-safe, boyut sınırlı süreç içi LRU önbellek."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalLRUCache(LOCAL_CACHE_SIZE)
+
+
+# İstek boyunca okunan sürümler (thread başına; istek dışında kullanılmaz)
+_request_versions = threading.local()
+
+
+def _start_request(**kwargs):
+    _request_versions.memo = {}
+
+
+def _finish_request(**kwargs):
+    _request_versions.memo = None
+
+
+request_started.connect(_start_request, dispatch_uid='tracker_cache_request_started')
+request_finished.connect(_finish_request, dispatch_uid='tracker_cache_request_finished')
+
+
+def get_user_version(user_id):
+    """
+    Kullanıcının veri sürümünü döndürür; istek içinde ilk okumada tek sorgu
+    çalışır, sonrakiler hafızadan okunur. Sürüm satırı kullanıcıyla birlikte
+    oluşturulur (bkz. signals.create_cache_version); sinyalsiz oluşturulan
+    kullanıcılar için burada yeni ve benzersiz bir sürümle eklenir.
+    """
+    memo = getattr(_request_versions, 'memo', None)
+    if memo is not None and user_id in memo:
+        return memo[user_id]
+    version = CacheVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first()
+    if version is None:
+        version = CacheVersion.objects.get_or_create(user_id=user_id, defaults={'version': uuid.uuid4().hex})[0].version
+    if memo is not None:
+        memo[user_id] = version
+    return version
+
+
+def invalidate_user(user_id):
+    """
+    Kullanıcının tüm önbelleğe alınmış aggregate değerlerini geçersiz kılar.
+
+    Sürüm çağıranın transaction'ı içinde yenilenir: diğer istekler commit'e
+    kadar eski veriyi eski sürümle, commit'ten sonra yeni veriyi yeni
+    sürümle görür; transaction geri alınırsa eski sürüm geri gelir. Sürüm
+    satırı yoksa kullanıcı için henüz önbelleğe alınmış değer yoktur.
+    Sinyal göndermeyen toplu işlemlerden (QuerySet.update, bulk_create)
+    sonra elle çağrılmalıdır.
+    """
+    if not user_id:
+        return
+    version = uuid.uuid4().hex
+    if CacheVersion.objects.filter(user_id=user_id).update(version=version):
+        memo = getattr(_request_versions, 'memo', None)
+        if memo is not None:
+            memo[user_id] = version
+
+
+def get_or_compute(user_id, name, compute, day=None):
+    """
+    `name` adlı aggregate değerini önce süreç içi LRU'dan, sonra Django
+    cache'inden okur; ikisinde de yoksa `compute()` ile hesaplayıp her iki
+    katmana yazar.
+    """
+    day = day or timezone.localdate()
+    key = f'tracker:agg:{user_id}:{get_user_version(user_id)}:{day.isoformat()}:{name}'
+
+    value = local_cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, CACHE_TIMEOUT)
+    local_cache.set(key, value)
+    return value
+
+
+def dashboard_summary(user, today=None):
+    """
+    Ana sayfa ve çalışma takibi sayfasının ortak aggregate değerleri:
+    bugünkü toplam süre, mevcut streak ve bekleyen görev sayısı.
+    """
+    today = today or timezone.localdate()
+
+    streak = streak_summary(user, today)
+    return {
+        'today_total_duration': streak['today_minutes'],
+        'streak': streak['current'],
+        'pending_todos_count': todo_counts(user, today)['pending'],
+    }
+
+
+def streak_summary(user, today=None):
+    """Mevcut / en uzun streak ve bugünkü toplam süre (bkz. streaks.streak_summary), önbellekli."""
+    today = today or timezone.localdate()
+    return get_or_compute(user.id, 'streak', lambda: streaks.streak_summary(user, today), day=today)
+
+
+def daily_threshold(user, today=None):
+    """Kullanıcının günlük hedefi / streak eşiği (bkz. streaks.daily_threshold), önbellekli."""
+    return get_or_compute(user.id, 'daily_threshold', lambda: streaks.daily_threshold(user.id), day=today)
+
+
+def todo_counts(user, today=None):
+    """Kullanıcının görev sayaçları (bkz. stats.todo_counts), önbellekli."""
+    return get_or_compute(user.id, 'todo_counts', lambda: stats.todo_counts(user), day=today)
+
+
+def daily_totals(user, today=None):
+    """
+    Kullanıcının günlük özet satırlarını `{tarih: (dakika, oturum sayısı)}`
+    sözlüğü olarak döndürür (önbellekli).
+    """
+    def compute():
+        return {
+            day: (minutes, session_count)
+            for day, minutes, session_count in DailyStudyTotal.objects.filter(user=user)
+            .order_by('date')
+            .values_list('date', 'minutes', 'session_count')
+        }
+
+    return get_or_compute(user.id, 'daily_totals', compute, day=today)
+
+
+def subject_breakdown(user, today=None, start=None):
+    """İstatistik sayfasının ders dağılımı (bkz. stats.subject_breakdown), önbellekli."""
+    today = today or timezone.localdate()
+    name = f"subjects:{start.isoformat() if start else 'all'}"
+    return get_or_compute(user.id, name, lambda: stats.subject_breakdown(user, today, start), day=today)
+
+
+def top_subjects(user, today=None):
+    """Kullanıcının en çok kullanılan dersleri (bkz. subjects.top_subjects), önbellekli."""
+    return get_or_compute(user.id, 'top_subjects', lambda: subjects.top_subjects(user.id), day=today)
+
+
+def todo_summary(user, today=None):
+    """İstatistik sayfasının görev özeti (bkz. stats.todo_summary), önbellekli."""
+    today = today or timezone.localdate()
+    return get_or_compute(user.id, 'todo_summary', lambda: stats.todo_summary(user, today), day=today)
@@ -0,0 +1,127 @@
+"""
+Kullanıcı verilerinin (çalışma kayıtları, görevler, takvim etkinlikleri)
+CSV / JSON olarak dışa aktarımı.
+
+Satırlar `QuerySet.iterator(chunk_size=...)` ile parça parça okunur ve
+üreteçlerle (generator) yazılır; bellek kullanımı kayıt sayısından
+bağımsızdır. Web tarafında StreamingHttpResponse, `export_data` yönetim
+komutunda dosya / stdout aynı üreteçleri kullanır.
+"""
+import csv
+import json
+from datetime import date, datetime
+
+from django.utils import timezone
+
+from .models import CalendarEvent, StudySession, TodoItem
+
+
+# Veritabanından tek seferde okunacak satır sayısı
+EXPORT_CHUNK_SIZE = 2000
+
+# Çıktıya tek parça halinde yazılacak satır sayısı (çok küçük parçalar yazmamak için)
+EXPORT_FLUSH_ROWS = 500
+
+# Veri türü -> (model, dışa aktarılan alanlar, tarih filtresi alanı)
+EXPORT_DATASETS = {
+    'sessions': (
+        StudySession,
+        ('id', 'date', 'subject', 'duration', 'note', 'created_at', 'updated_at'),
+        'date',
+    ),
+    'todos': (
+        TodoItem,
+        ('id', 'title', 'completed', 'is_important', 'important_marked_at', 'is_edited', 'created_at', 'updated_at'),
+        'created_at__date',
+    ),
+    'events': (
+        CalendarEvent,
+        ('id', 'date', 'title', 'color', 'created_at', 'updated_at'),
+        'date',
+    ),
+}
+
+EXPORT_FORMATS = ('csv', 'json')
+
+
+def export_fields(dataset):
+    """Veri türünün dışa aktarılan alan adları (CSV başlık satırı)."""
+    return EXPORT_DATASETS[dataset][1]
+
+
+def export_queryset(user, dataset, start=None, end=None):
+    """Kullanıcının verilen türdeki kayıtları; `start` / `end` tarihleri dahildir."""
+    model, fields, date_field = EXPORT_DATASETS[dataset]
+    qs = model.objects.filter(user=user)
+    if start:
+        qs = qs.filter(**{f'{date_field}__gte': start})
+    if end:
+        qs = qs.filter(**{f'{date_field}__lte': end})
+    return qs.order_by('id').values_list(*fields)
+
+
+def serialize_value(value):
+    """Tarih / tarih-saat değerlerini ISO 8601 metnine çevirir."""
+    if isinstance(value, datetime):
+        # Tarih-saatler uygulama saat diliminde (Europe/Istanbul) yazılır
+        return timezone.localtime(value).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def iter_rows(user, dataset, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Kayıtları serileştirilmiş değer listeleri olarak parça parça okur."""
+    for row in export_queryset(user, dataset, start, end).iterator(chunk_size=chunk_size):
+        yield [serialize_value(value) for value in row]
+
+
+def _buffered(pieces, size=EXPORT_FLUSH_ROWS):
+    """Küçük metin parçalarını `size` adetlik bloklar halinde birleştirir."""
+    buffer = []
+    for piece in pieces:
+        buffer.append(piece)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+class _Echo:
+    """csv.writer için yazılan satırı geri döndüren sahte dosya nesnesi."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(user, dataset, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tek bir veri türünü başlık satırıyla birlikte CSV metin parçaları olarak üretir."""
+    writer = csv.writer(_Echo())
+
+    def pieces():
+        yield writer.writerow(export_fields(dataset))
+        for row in iter_rows(user, dataset, start, end, chunk_size):
+            yield writer.writerow(row)
+
+    return _buffered(pieces())
+
+
+def iter_json(user, datasets, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Verilen veri türlerini `{"sessions": [...], "todos": [...], ...}` biçiminde
+    JSON metin parçaları olarak üretir.
+    """
+    def pieces():
+        yield '{'
+        for i, dataset in enumerate(datasets):
+            fields = export_fields(dataset)
+            yield ('' if i == 0 else ',') + json.dumps(dataset) + ':['
+            separator = ''
+            for row in iter_rows(user, dataset, start, end, chunk_size):
+                yield separator + json.dumps(dict(zip(fields, row)), ensure_ascii=False)
+                separator = ','
+            yield ']'
+        yield '}\n'
+
+    return _buffered(pieces())
@@ -77,15 +77,17 @@ class TodoForm(forms.ModelForm):
 
 
 class StudyGoalForm(forms.ModelForm):
-    """Haftalık ve aylık çalışma hedefi formu."""
+    """Günlük, haftalık ve aylık çalışma hedefi formu."""
     class Meta:
         model = UserStudyGoal
-        fields = ['weekly_goal_minutes', 'monthly_goal_minutes']
+        fields = ['daily_goal_minutes', 'weekly_goal_minutes', 'monthly_goal_minutes']
         labels = {
+            'daily_goal_minutes': 'Günlük hedef (dakika)',
             'weekly_goal_minutes': 'Haftalık hedef (dakika)',
             'monthly_goal_minutes': 'Aylık hedef (dakika)',
         }
         widgets = {
+            'daily_goal_minutes': forms.NumberInput(attrs={'min': 1, 'max': 1440, 'class': 'goal-input'}),
             'weekly_goal_minutes': forms.NumberInput(attrs={'min': 1, 'max': 10080, 'class': 'goal-input'}),
             'monthly_goal_minutes': forms.NumberInput(attrs={'min': 1, 'max': 43200, 'class': 'goal-input'}),
         }
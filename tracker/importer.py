@@ -0,0 +1,168 @@
+"""
+Çalışma kayıtlarının CSV dosyasından toplu içe aktarımı.
+
+Satırlar form yerine hafif bir doğrulayıcıyla parça parça kontrol edilir ve
+geçerli kayıtlar tek bir transaction içinde `bulk_create(batch_size=...)`
+ile yazılır. bulk_create sinyal göndermediği için günlük özet tablosu ve
+önbellek satır başına değil, içe aktarma sonunda bir kez güncellenir; kayıtların
+dersleri (Subject) her parça için toplu olarak eşlenir.
+
+Beklenen sütunlar: date, subject, duration ve isteğe bağlı note. Fazladan
+sütunlar (ör. dışa aktarılan dosyadaki id, created_at) yok sayılır; böylece
+`export_data` çıktısı doğrudan geri yüklenebilir.
+"""
+import csv
+from datetime import datetime
+
+from django.db import transaction
+
+from . import cache, rollups, subjects
+from .models import StudySession
+
+
+# Veritabanına tek seferde yazılacak kayıt sayısı
+IMPORT_BATCH_SIZE = 1000
+
+# Raporlanacak en fazla satır hatası (sonrası sadece sayılır)
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+# Tek bir kaydın en uzun süresi (dakika) - bir gün
+IMPORT_MAX_DURATION = 24 * 60
+
+REQUIRED_COLUMNS = ('date', 'subject', 'duration')
+
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y')
+
+SUBJECT_MAX_LENGTH = StudySession._meta.get_field('subject').max_length
+
+
+class InvalidImportFile(ValueError):
+    """Dosyanın tamamını geçersiz kılan hata (ör. eksik başlık sütunu)."""
+
+
+class ImportResult:
+    """İçe aktarma sonucu: eklenen kayıt sayısı ve satır hataları."""
+
+    def __init__(self):
+        self.created = 0
+        self.rows = 0
+        self.error_count = 0
+        self.errors = []  # [(satır numarası, mesaj), ...]
+        self.rolled_back = False
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f'Geçersiz tarih: {value!r}')
+
+
+def parse_row(row):
+    """
+    CSV satırını doğrular ve (tarih, ders, süre, not) döndürür.
+    Geçersiz satırda ValueError fırlatılır.
+    """
+    day = _parse_date((row.get('date') or '').strip())
+
+    subject = (row.get('subject') or '').strip()
+    if not subject:
+        raise ValueError('Ders adı boş olamaz')
+    if len(subject) > SUBJECT_MAX_LENGTH:
+        raise ValueError(f'Ders adı en fazla {SUBJECT_MAX_LENGTH} karakter olabilir')
+
+    raw_duration = (row.get('duration') or '').strip()
+    try:
+        duration = int(raw_duration)
+    except ValueError:
+        raise ValueError(f'Geçersiz süre: {raw_duration!r}')
+    if not 1 <= duration <= IMPORT_MAX_DURATION:
+        raise ValueError(f'Süre 1 ile {IMPORT_MAX_DURATION} dakika arasında olmalı')
+
+    note = (row.get('note') or '').strip() or None
+    return day, subject, duration, note
+
+
+def _read_rows(reader):
+    """Okuma hatalarını (bozuk CSV, UTF-8 olmayan dosya) InvalidImportFile'a çevirir."""
+    try:
+        yield from reader
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise InvalidImportFile(f'Dosya okunamadı (satır {reader.line_num}): {exc}') from exc
+
+
+def _create_batch(user, batch, batch_size, refs):
+    """
+    Bir parça kaydı derslerine bağlayıp toplu olarak ekler. `refs` önceki
+    parçalarda eşlenen dersleri (`{ad: Subject}`) tutar; sadece yeni adlar sorgulanır.
+    """
+    # Dosyadaki sırayla: yeni dersin adı ilk görülen yazım olur
+    names = [name for name in dict.fromkeys(session.subject for session in batch) if name not in refs]
+    if names:
+        refs.update(subjects.resolve_subjects(user.id, names, batch_size=batch_size))
+    for session in batch:
+        session.subject_ref = refs[session.subject]
+    StudySession.objects.bulk_create(batch, batch_size=batch_size)
+
+
+def import_sessions(user, lines, batch_size=IMPORT_BATCH_SIZE, skip_invalid=False, max_rows=None):
+    """
+    CSV satırlarını (`lines`: metin satırları üreten dosya nesnesi) kullanıcının
+    çalışma kayıtları olarak ekler.
+
+    Varsayılan olarak herhangi bir satır geçersizse hiçbir kayıt eklenmez
+    (transaction geri alınır) ve hatalar raporlanır. `skip_invalid=True` ise
+    geçerli satırlar eklenir, geçersizler atlanır. Dosya düzeyindeki hatalarda
+    InvalidImportFile fırlatılır.
+    """
+    reader = csv.DictReader(lines)
+    try:
+        columns = [name.strip() for name in (reader.fieldnames or [])]
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise InvalidImportFile(f'Dosya okunamadı: {exc}') from exc
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise InvalidImportFile(f"Eksik sütun: {', '.join(missing)}")
+    reader.fieldnames = columns
+
+    result = ImportResult()
+    with transaction.atomic():
+        batch = []
+        refs = {}
+        for row in _read_rows(reader):
+            result.rows += 1
+            if max_rows is not None and result.rows > max_rows:
+                raise InvalidImportFile(f'Dosya en fazla {max_rows} satır içerebilir')
+            try:
+                day, subject, duration, note = parse_row(row)
+            except ValueError as exc:
+                # line_num dosyadaki satır numarasıdır (başlık 1. satır)
+                result.add_error(reader.line_num, str(exc))
+                continue
+            batch.append(StudySession(user=user, date=day, subject=subject, duration=duration, note=note))
+            if len(batch) >= batch_size:
+                _create_batch(user, batch, batch_size, refs)
+                result.created += len(batch)
+                batch = []
+        if batch:
+            _create_batch(user, batch, batch_size, refs)
+            result.created += len(batch)
+
+        if result.error_count and not skip_invalid:
+            transaction.set_rollback(True)
+            result.rolled_back = True
+            result.created = 0
+            return result
+
+        if result.created:
+            # Türetilmiş veriler satır başına değil, sonda bir kez güncellenir
+            rollups.rebuild_daily_totals(user_ids=[user.id], batch_size=batch_size)
+            cache.invalidate_user(user.id)
+    return result
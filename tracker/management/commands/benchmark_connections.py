@@ -0,0 +1,47 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    """
+    Veritabanı bağlantısının yeniden kullanımının istek başına kazancını ölçer:
+    her istekte yeni bağlantı, kalıcı bağlantı ve (DB_POOL açıksa) bağlantı havuzu.
+
+    Kullanım:
+        python manage.py benchmark_connections --requests 500 --output baglanti.json
+    """
+    help = 'Yeni bağlantı / kalıcı bağlantı / bağlantı havuzu modlarında istek sürelerini karşılaştırır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', dest='username', help='Ölçümde kullanılacak kullanıcı (varsayılan: ilk bench_ kullanıcısı).')
+        parser.add_argument('--requests', type=int, default=200, help='Mod başına istek sayısı.')
+        parser.add_argument('--output', help='Sonuç dosyası (varsayılan: standart çıktı).')
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['username']:
+            user = users.filter(username=options['username']).first()
+        else:
+            user = users.filter(username__startswith='bench_').first()
+        if user is None:
+            raise CommandError('Kullanıcı bulunamadı; --user verin veya önce seed_benchmark_data çalıştırın.')
+        if options['requests'] < 1:
+            raise CommandError('--requests en az 1 olmalı.')
+
+        result = benchmark.measure_connection_reuse(user, requests=options['requests'])
+        output = json.dumps(result, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        for name, values in result['results'].items():
+            self.stderr.write(
+                f"{name:<12} {values['connections_opened']:>5} bağlantı  ort. {values['mean_ms']:>7.3f} ms  "
+                f"p95 {values['p95_ms']:>7.3f} ms  kazanç {values['saved_ms_per_request']:>7.3f} ms/istek"
+            )
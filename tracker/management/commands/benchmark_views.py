@@ -0,0 +1,92 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    """
+    Ana sayfaların (index, study_tracking, statistics, todo_list, calendar_view)
+    süre ve sorgu sayılarını ölçer ve JSON olarak yazar. Önce
+    `seed_benchmark_data` ile veri oluşturulmalıdır.
+
+    Kullanım:
+        python manage.py benchmark_views --output sonuc.json
+        python manage.py benchmark_views --compare onceki.json --max-regression 20
+    """
+    help = 'Sayfaların süre ve sorgu sayılarını ölçer; sonuçları JSON olarak yazar ve karşılaştırır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='bench_', help='Ölçümde kullanılacak kullanıcıların ön eki.')
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Ön ek yerine bu kullanıcıyla ölç (birden fazla verilebilir).',
+        )
+        parser.add_argument('--repeat', type=int, default=10, help='Kullanıcı başına sıcak önbellekle tekrar sayısı.')
+        parser.add_argument(
+            '--view',
+            action='append',
+            dest='views',
+            choices=[name for name, _, _ in benchmark.BENCHMARK_VIEWS],
+            help='Sadece bu sayfayı ölç (birden fazla verilebilir).',
+        )
+        parser.add_argument('--output', help='Sonuç dosyası (varsayılan: standart çıktı).')
+        parser.add_argument('--compare', help='Karşılaştırılacak önceki sonuç dosyası.')
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            help='p50 süresi bu yüzdeden fazla artarsa veya sorgu sayısı artarsa hata ile çık.',
+        )
+
+    def handle(self, *args, **options):
+        if options['usernames']:
+            users = list(User.objects.filter(username__in=options['usernames']).order_by('id'))
+        else:
+            users = list(User.objects.filter(username__startswith=options['prefix']).order_by('id'))
+        if not users:
+            raise CommandError('Ölçülecek kullanıcı bulunamadı; önce seed_benchmark_data çalıştırın.')
+        if options['repeat'] < 1:
+            raise CommandError('--repeat en az 1 olmalı.')
+
+        views = benchmark.BENCHMARK_VIEWS
+        if options['views']:
+            views = [view for view in views if view[0] in options['views']]
+
+        result = benchmark.run(users, repeat=options['repeat'], views=views)
+        output = json.dumps(result, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        for name, values in result['results'].items():
+            self.stderr.write(
+                f"{name:<16} {values['queries']:>3} sorgu  p50 {values['p50_ms']:>8.1f} ms  "
+                f"p95 {values['p95_ms']:>8.1f} ms  soğuk {values['cold_ms']:>8.1f} ms"
+            )
+
+        if options['compare']:
+            self._compare(options['compare'], result, options['max_regression'])
+
+    def _compare(self, path, result, max_regression):
+        try:
+            with open(path, encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Önceki sonuç okunamadı: {exc}')
+
+        regressions = []
+        for name, metric, old, new, change in benchmark.compare(previous, result):
+            self.stderr.write(f'{name:<16} {metric:<13} {old:>10} -> {new:>10} ({change:+.1f}%)')
+            if metric.endswith('queries') and new > old:
+                regressions.append(f'{name} {metric}: {old} -> {new}')
+            elif metric == 'p50_ms' and max_regression is not None and change > max_regression:
+                regressions.append(f'{name} p50: {old} -> {new} ms ({change:+.1f}%)')
+
+        if regressions and max_regression is not None:
+            raise CommandError('Performans gerilemesi: ' + '; '.join(regressions))
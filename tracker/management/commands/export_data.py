@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import export
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Geçersiz tarih: {value} (yyyy-mm-dd bekleniyor)')
+
+
+class Command(BaseCommand):
+    """
+    Bir kullanıcının verilerini CSV veya JSON olarak dışa aktarır.
+    Kayıtlar parça parça okunup yazıldığı için bellek kullanımı sabittir.
+
+    Kullanım:
+        python manage.py export_data --user ali --type sessions --output ali.csv
+        python manage.py export_data --user ali --type all --format json --start 2025-01-01
+    """
+    help = 'Kullanıcının çalışma kayıtlarını, görevlerini ve takvim etkinliklerini dışa aktarır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, dest='username', help='Kullanıcı adı.')
+        parser.add_argument(
+            '--type',
+            default='sessions',
+            choices=list(export.EXPORT_DATASETS) + ['all'],
+            help="Veri türü ('all' sadece JSON ile).",
+        )
+        parser.add_argument('--format', default='csv', choices=export.EXPORT_FORMATS, help='Çıktı biçimi.')
+        parser.add_argument('--start', type=_parse_date, help='Başlangıç tarihi (yyyy-mm-dd, dahil).')
+        parser.add_argument('--end', type=_parse_date, help='Bitiş tarihi (yyyy-mm-dd, dahil).')
+        parser.add_argument('--output', help='Çıktı dosyası (varsayılan: standart çıktı).')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=export.EXPORT_CHUNK_SIZE,
+            help='Veritabanından tek seferde okunacak satır sayısı.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"Kullanıcı bulunamadı: {options['username']}")
+
+        dataset = options['type']
+        if dataset == 'all' and options['format'] != 'json':
+            raise CommandError("'all' veri türü sadece JSON formatında kullanılabilir.")
+
+        start, end, chunk_size = options['start'], options['end'], options['chunk_size']
+        if options['format'] == 'csv':
+            chunks = export.iter_csv(user, dataset, start, end, chunk_size)
+        else:
+            datasets = list(export.EXPORT_DATASETS) if dataset == 'all' else [dataset]
+            chunks = export.iter_json(user, datasets, start, end, chunk_size)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Veriler {options['output']} dosyasına yazıldı."))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
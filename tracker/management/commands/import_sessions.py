@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import importer
+
+
+class Command(BaseCommand):
+    """
+    CSV dosyasındaki çalışma kayıtlarını bir kullanıcıya toplu olarak ekler.
+
+    Kullanım:
+        python manage.py import_sessions --user ali kayitlar.csv
+        python manage.py import_sessions --user ali --skip-invalid --batch-size 5000 kayitlar.csv
+    """
+    help = 'CSV dosyasından (date, subject, duration, note) çalışma kayıtlarını içe aktarır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV dosyasının yolu.')
+        parser.add_argument('--user', required=True, dest='username', help='Kayıtların ekleneceği kullanıcı.')
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help='Hatalı satırları atlayıp geçerli satırları ekle (varsayılan: hiçbir satırı ekleme).',
+        )
+        parser.add_argument('--batch-size', type=int, default=importer.IMPORT_BATCH_SIZE, help='Toplu ekleme boyutu.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"Kullanıcı bulunamadı: {options['username']}")
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as lines:
+                result = importer.import_sessions(
+                    user,
+                    lines,
+                    batch_size=options['batch_size'],
+                    skip_invalid=options['skip_invalid'],
+                )
+        except OSError as exc:
+            raise CommandError(f'Dosya açılamadı: {exc}')
+        except importer.InvalidImportFile as exc:
+            raise CommandError(str(exc))
+
+        for line, error in result.errors:
+            self.stderr.write(f'Satır {line}: {error}')
+        if result.error_count > len(result.errors):
+            self.stderr.write(f'... ve {result.error_count - len(result.errors)} hata daha.')
+
+        if result.rolled_back:
+            raise CommandError(f'{result.error_count} hatalı satır nedeniyle hiçbir kayıt eklenmedi.')
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.created} çalışma kaydı eklendi ({result.rows} satır, {result.error_count} hatalı).'
+        ))
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.rollups import rebuild_daily_totals
+
+
+class Command(BaseCommand):
+    """
+    Günlük çalışma özet tablosunu (DailyStudyTotal) ham kayıtlardan yeniden oluşturur.
+
+    Kullanım:
+        python manage.py rebuild_daily_totals
+        python manage.py rebuild_daily_totals --user ali --user veli
+    """
+    help = 'Günlük çalışma özet tablosunu StudySession kayıtlarından sıfırdan oluşturur.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Sadece bu kullanıcının özetini yeniden oluştur (birden fazla verilebilir).',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Toplu ekleme boyutu.')
+
+    def handle(self, *args, **options):
+        user_ids = None
+        usernames = options['usernames']
+        if usernames:
+            users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            missing = sorted(set(usernames) - set(users))
+            if missing:
+                raise CommandError(f"Kullanıcı bulunamadı: {', '.join(missing)}")
+            user_ids = list(users.values())
+
+        created = rebuild_daily_totals(user_ids=user_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{created} günlük özet satırı oluşturuldu.'))
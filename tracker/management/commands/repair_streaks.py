@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.streaks import rebuild_streak_states
+
+
+class Command(BaseCommand):
+    """
+    Kullanıcıların saklanan streak durumunu (StreakState) ham çalışma
+    kayıtlarından yeniden hesaplar ve farklı olanları düzeltir.
+
+    Kullanım:
+        python manage.py repair_streaks
+        python manage.py repair_streaks --user ali --user veli
+        python manage.py repair_streaks --check
+    """
+    help = 'Streak durumlarını StudySession kayıtlarından yeniden hesaplar ve düzeltir.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Sadece bu kullanıcının durumunu onar (birden fazla verilebilir).',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Hiçbir şey yazmadan sadece hatalı durumları raporla; hata varsa sıfırdan farklı kodla çık.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Toplu güncelleme boyutu.')
+
+    def handle(self, *args, **options):
+        user_ids = None
+        usernames = options['usernames']
+        if usernames:
+            users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            missing = sorted(set(usernames) - set(users))
+            if missing:
+                raise CommandError(f"Kullanıcı bulunamadı: {', '.join(missing)}")
+            user_ids = list(users.values())
+
+        changed = rebuild_streak_states(
+            user_ids=user_ids,
+            from_sessions=True,
+            dry_run=options['check'],
+            batch_size=options['batch_size'],
+        )
+        if changed:
+            names = User.objects.filter(id__in=changed).order_by('username').values_list('username', flat=True)
+            self.stdout.write(f"Hatalı streak durumu: {', '.join(names)}")
+
+        if options['check']:
+            if changed:
+                raise CommandError(f'{len(changed)} kullanıcının streak durumu hatalı.')
+            self.stdout.write(self.style.SUCCESS('Tüm streak durumları doğru.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(changed)} kullanıcının streak durumu düzeltildi.'))
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import benchmark
+
+
+class Command(BaseCommand):
+    """
+    Performans ölçümü için sentetik kullanıcılar ve yıllarca geçmiş oluşturur.
+    Aynı --seed değeriyle her seferinde aynı veri üretilir.
+
+    Kullanım:
+        python manage.py seed_benchmark_data --users 5 --days 1095
+        python manage.py seed_benchmark_data --flush --users 20 --prefix yuk_
+    """
+    help = 'Çalışma kaydı, görev, takvim etkinliği ve hedef içeren sentetik kullanıcılar oluşturur.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5, help='Oluşturulacak kullanıcı sayısı.')
+        parser.add_argument('--days', type=int, default=3 * 365, help='Kullanıcı başına geçmiş gün sayısı.')
+        parser.add_argument('--prefix', default='bench_', help='Kullanıcı adı ön eki.')
+        parser.add_argument('--seed', type=int, default=0, help='Rastgele sayı üreteci tohumu.')
+        parser.add_argument('--password', default='benchmark', help='Kullanıcıların parolası.')
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Önce bu ön ekle başlayan kullanıcıları ve tüm verilerini sil.',
+        )
+        parser.add_argument('--batch-size', type=int, default=benchmark.SEED_BATCH_SIZE, help='Toplu ekleme boyutu.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['days'] < 1:
+            raise CommandError('--users ve --days en az 1 olmalı.')
+        prefix = options['prefix']
+        existing = User.objects.filter(username__startswith=prefix)
+        if options['flush']:
+            deleted = existing.count()
+            existing.delete()
+            self.stdout.write(f'{deleted} kullanıcı silindi.')
+        elif existing.exists():
+            raise CommandError(f"'{prefix}' ön ekli kullanıcılar zaten var; --flush ile silebilirsiniz.")
+
+        counts = benchmark.seed(
+            users=options['users'],
+            days=options['days'],
+            prefix=prefix,
+            seed_value=options['seed'],
+            password=options['password'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['users']} kullanıcı, {counts['sessions']} çalışma kaydı, "
+            f"{counts['todos']} görev ve {counts['events']} etkinlik oluşturuldu."
+        ))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_daily_totals(apps, schema_editor):
+    """Mevcut çalışma kayıtlarından günlük özet satırlarını oluşturur."""
+    StudySession = apps.get_model('tracker', 'StudySession')
+    DailyStudyTotal = apps.get_model('tracker', 'DailyStudyTotal')
+    rows = (
+        StudySession.objects.order_by()
+        .values('user_id', 'date')
+        .annotate(minutes=Sum('duration'), session_count=Count('id'))
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(DailyStudyTotal(**row))
+        if len(batch) >= 1000:
+            DailyStudyTotal.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        DailyStudyTotal.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_add_user_study_goal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStudyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Tarih')),
+                ('minutes', models.PositiveIntegerField(default=0, verbose_name='Toplam süre (dakika)')),
+                ('session_count', models.PositiveIntegerField(default=0, verbose_name='Oturum sayısı')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_study_totals', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Günlük Çalışma Toplamı',
+                'verbose_name_plural': 'Günlük Çalışma Toplamları',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='unique_daily_study_total')],
+            },
+        ),
+        migrations.RunPython(populate_daily_totals, migrations.RunPython.noop),
+    ]
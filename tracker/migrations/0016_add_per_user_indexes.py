@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0015_dailystudytotal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['user', 'date'], name='event_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', 'date'], name='session_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', '-duration'], name='session_user_duration_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['user', '-is_important', '-important_marked_at', 'completed', '-created_at'], name='todo_user_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(condition=models.Q(('completed', False)), fields=['user', '-is_important', '-important_marked_at', '-created_at'], name='todo_user_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['user', '-is_important', '-important_marked_at', '-created_at'], name='todo_user_completed_idx'),
+        ),
+    ]
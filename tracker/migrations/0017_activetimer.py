@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_add_per_user_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveTimer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('stopwatch', 'Süre Tutucu'), ('countdown', 'Geri Sayım')], max_length=10, verbose_name='Mod')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Başlatılma zamanı')),
+                ('accumulated_seconds', models.PositiveIntegerField(default=0, verbose_name='Geçen süre (saniye)')),
+                ('target_seconds', models.PositiveIntegerField(blank=True, null=True, verbose_name='Hedef süre (saniye)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='active_timers', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Aktif Sayaç',
+                'verbose_name_plural': 'Aktif Sayaçlar',
+                'constraints': [models.UniqueConstraint(fields=('user', 'mode'), name='unique_active_timer_mode')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Migration sırasındaki streak eşiği (tracker.streaks.DAILY_STREAK_MINUTES)
+DAILY_STREAK_MINUTES = 60
+
+
+def populate_streak_states(apps, schema_editor):
+    """Mevcut günlük özet satırlarından kullanıcıların streak durumlarını oluşturur."""
+    DailyStudyTotal = apps.get_model('tracker', 'DailyStudyTotal')
+    StreakState = apps.get_model('tracker', 'StreakState')
+    today = timezone.localdate()
+    today_minutes = dict(DailyStudyTotal.objects.filter(date=today).values_list('user_id', 'minutes'))
+
+    states = {}
+    rows = (
+        DailyStudyTotal.objects.filter(minutes__gte=DAILY_STREAK_MINUTES)
+        .order_by('user_id', 'date')
+        .values_list('user_id', 'date')
+    )
+    for user_id, day in rows.iterator(chunk_size=2000):
+        state = states.get(user_id)
+        if state is None:
+            state = states[user_id] = StreakState(user_id=user_id, current_length=0, longest_length=0)
+        if state.last_qualifying_date is not None and (day - state.last_qualifying_date).days == 1:
+            state.current_length += 1
+        else:
+            state.current_length = 1
+        state.last_qualifying_date = day
+        state.longest_length = max(state.longest_length, state.current_length)
+
+    for user_id, minutes in today_minutes.items():
+        state = states.get(user_id)
+        if state is None:
+            state = states[user_id] = StreakState(user_id=user_id, current_length=0, longest_length=0)
+        state.today_date = today
+        state.today_minutes = minutes
+    StreakState.objects.bulk_create(states.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0018_calendarevent_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StreakState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_qualifying_date', models.DateField(blank=True, null=True, verbose_name='Hedefin tutturulduğu son gün')),
+                ('current_length', models.PositiveIntegerField(default=0, verbose_name='Son serinin uzunluğu (gün)')),
+                ('longest_length', models.PositiveIntegerField(default=0, verbose_name='En uzun seri (gün)')),
+                ('today_date', models.DateField(blank=True, null=True, verbose_name='Gün')),
+                ('today_minutes', models.PositiveIntegerField(default=0, verbose_name='Günün toplam süresi (dakika)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='streak_state', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Streak Durumu',
+                'verbose_name_plural': 'Streak Durumları',
+            },
+        ),
+        migrations.RunPython(populate_streak_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0019_streakstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='streakstate',
+            name='threshold_minutes',
+            field=models.PositiveIntegerField(default=60, verbose_name='Günlük hedef (dakika)'),
+        ),
+        migrations.AddField(
+            model_name='userstudygoal',
+            name='daily_goal_minutes',
+            field=models.PositiveIntegerField(default=60, help_text="Bir günün streak'e sayılması için gereken çalışma süresi (dakika)", validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(1440)], verbose_name='Günlük hedef (dakika)'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, F, Value, When
+
+
+# Her turda işlenecek (kullanıcı, ders adı) çifti sayısı
+BATCH_SIZE = 1000
+
+
+def normalize_subject(name):
+    # Migration sırasındaki tracker.subjects.normalize_subject
+    name = ' '.join((name or '').split())
+    return name.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def _link_batch(Subject, StudySession, spellings):
+    """Bir grup yazımın derslerini oluşturur ve kayıtlarını derslere bağlar."""
+    subjects = {}
+    for user_id, spelling, key in spellings:
+        # Yazımlar kullanım sıklığına göre geldiği için en sık yazım dersin adı olur
+        subjects.setdefault((user_id, key), Subject(user_id=user_id, key=key, name=' '.join(spelling.split())))
+    Subject.objects.bulk_create(subjects.values(), batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+    user_ids = {user_id for user_id, _ in subjects}
+    ids = {
+        (user_id, key): pk
+        for pk, user_id, key in Subject.objects.filter(
+            user_id__in=user_ids, key__in={key for _, key in subjects}
+        ).values_list('pk', 'user_id', 'key')
+    }
+
+    # Grubun tüm kayıtları tek UPDATE ile bağlanır; (kullanıcı, ders adı)
+    # indeksi olmadığından yazım başına bir UPDATE kullanıcının tüm
+    # geçmişini her seferinde tarardı. Yazımlar sıklık sırasında olduğu için
+    # çoğu kayıt ilk koşullarda eşleşir. Gruptaki başka bir kullanıcıya ait
+    # yazım eşleşirse kayıt bu turda değişmez (default).
+    StudySession.objects.filter(
+        user_id__in=user_ids,
+        subject__in={spelling for _, spelling, _ in spellings},
+        subject_ref__isnull=True,
+    ).update(subject_ref_id=Case(
+        *[
+            When(user_id=user_id, subject=spelling, then=Value(ids[(user_id, key)]))
+            for user_id, spelling, key in spellings
+        ],
+        default=F('subject_ref_id'),
+        output_field=models.BigIntegerField(),
+    ))
+
+
+def populate_subjects(apps, schema_editor):
+    """
+    Mevcut ders adlarını normalleştirip kullanıcı başına tekilleştirir ve
+    her çalışma kaydını dersine bağlar. (Kullanıcı, ders adı) çiftleri
+    gruplar halinde işlenir; kayıtlar tek tek yüklenmez.
+    """
+    Subject = apps.get_model('tracker', 'Subject')
+    StudySession = apps.get_model('tracker', 'StudySession')
+    rows = (
+        StudySession.objects.values('user_id', 'subject')
+        .annotate(count=Count('id'))
+        .order_by('user_id', '-count', 'subject')
+        .values_list('user_id', 'subject')
+    )
+    batch = []
+    for user_id, spelling in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append((user_id, spelling, normalize_subject(spelling)))
+        if len(batch) >= BATCH_SIZE:
+            _link_batch(Subject, StudySession, batch)
+            batch = []
+    if batch:
+        _link_batch(Subject, StudySession, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0020_daily_goal_minutes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Subject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=125, verbose_name='Ders Adı')),
+                ('key', models.CharField(max_length=125, verbose_name='Anahtar')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subjects', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Ders',
+                'verbose_name_plural': 'Dersler',
+                'ordering': ['name'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'key'), name='subject_user_key_uniq')],
+            },
+        ),
+        migrations.AddField(
+            model_name='studysession',
+            name='subject_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='sessions', to='tracker.subject', verbose_name='Ders'),
+        ),
+        migrations.RunPython(populate_subjects, migrations.RunPython.noop),
+    ]
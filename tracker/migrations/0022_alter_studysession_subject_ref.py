@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Tüm kayıtlar 0021'de derslerine bağlandıktan sonra alan zorunlu yapılır.
+    Ayrı migration'dadır: PostgreSQL aynı transaction'da veri güncellenen
+    tabloyu ALTER TABLE ile değiştirmeye izin vermez.
+    """
+
+    dependencies = [
+        ('tracker', '0021_subject'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studysession',
+            name='subject_ref',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.RESTRICT, related_name='sessions', to='tracker.subject', verbose_name='Ders'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Ders önekinin LIKE 'önek%' ile aranabilmesi için PostgreSQL'de pattern_ops
+# indeksi gerekir (varsayılan sıralama kuralı C değilse normal B-tree indeksi
+# LIKE sorgularında kullanılamaz). Diğer veritabanlarında önek, benzersizlik
+# kısıtının (user, key) indeksi üzerinde aralık sorgusu olarak aranır.
+PREFIX_INDEX = 'subject_user_key_prefix_idx'
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {PREFIX_INDEX} ON tracker_subject (user_id, key varchar_pattern_ops)'
+    )
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {PREFIX_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0022_alter_studysession_subject_ref'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', 'subject_ref'], name='session_user_subject_idx'),
+        ),
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
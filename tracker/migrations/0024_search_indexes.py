@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.db import DatabaseError, migrations
+
+
+# Tam metin araması için PostgreSQL'de GIN ifade indeksleri. İfadeler
+# tracker/search.py içindeki sorgularla birebir aynı olmalıdır; aksi halde
+# indeks kullanılmaz. btree_gin eklentisi kurulabiliyorsa kullanıcı sütunu da
+# indekse eklenir ve kullanıcı filtresi indeksten yapılır. SQLite'ta FTS5
+# tablosu migrate sonrasında kurulur (bkz. signals.install_search_index).
+SEARCH_INDEXES = {
+    'session_search_idx': (
+        'tracker_studysession',
+        "to_tsvector('simple', coalesce(subject, '') || ' ' || coalesce(note, ''))",
+    ),
+    'todo_search_idx': ('tracker_todoitem', "to_tsvector('simple', coalesce(title, ''))"),
+    'event_search_idx': ('tracker_calendarevent', "to_tsvector('simple', coalesce(title, ''))"),
+}
+
+
+def _btree_gin_available(schema_editor):
+    # Eklenti kurma yetkisi yoksa migration'ın transaction'ı bozulmasın
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SAVEPOINT tracker_btree_gin')
+        try:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+        except DatabaseError:
+            cursor.execute('ROLLBACK TO SAVEPOINT tracker_btree_gin')
+            return False
+        cursor.execute('RELEASE SAVEPOINT tracker_btree_gin')
+        return True
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with_user = _btree_gin_available(schema_editor)
+    for name, (table, document) in SEARCH_INDEXES.items():
+        columns = f'user_id, {document}' if with_user else document
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({columns})')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0023_subject_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
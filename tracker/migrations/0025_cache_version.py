@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:34
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    """Mevcut kullanıcılara önbellek sürümü satırı ekler (yeni kullanıcılarınki sinyal ile oluşur)."""
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    CacheVersion = apps.get_model('tracker', 'CacheVersion')
+    user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    CacheVersion.objects.bulk_create(
+        (CacheVersion(user_id=user_id, version=uuid.uuid4().hex) for user_id in user_ids.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tracker', '0024_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cache_version', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+                ('version', models.CharField(max_length=32, verbose_name='Sürüm')),
+            ],
+            options={
+                'verbose_name': 'Önbellek Sürümü',
+                'verbose_name_plural': 'Önbellek Sürümleri',
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:44
+
+from django.db import migrations
+
+
+def create_missing_states(apps, schema_editor):
+    """
+    Kaydı olup streak durumu olmayan kullanıcılara boş durum ekler. 0019 sadece
+    hedefi tutturan veya o gün çalışan kullanıcılara durum oluşturuyordu; artık
+    durumu olmayan kullanıcının hiç kaydı olmadığı varsayılır (bkz.
+    streaks.streak_summary). Bu kullanıcıların eşiklerinde hedef günü yoktur
+    (eşik değişince durum yeniden hesaplanır), bu yüzden seriler sıfırdır;
+    bugünün toplamı ilk okumada özet tablodan alınır.
+    """
+    DailyStudyTotal = apps.get_model('tracker', 'DailyStudyTotal')
+    StreakState = apps.get_model('tracker', 'StreakState')
+    UserStudyGoal = apps.get_model('tracker', 'UserStudyGoal')
+    thresholds = dict(UserStudyGoal.objects.values_list('user_id', 'daily_goal_minutes'))
+    user_ids = (
+        DailyStudyTotal.objects.exclude(user_id__in=StreakState.objects.values('user_id'))
+        .order_by('user_id')
+        .values_list('user_id', flat=True)
+        .distinct()
+    )
+    StreakState.objects.bulk_create(
+        (
+            StreakState(user_id=user_id, threshold_minutes=thresholds.get(user_id, 60), current_length=0, longest_length=0)
+            for user_id in user_ids.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0025_cache_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_states, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,37 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.auth.models import User
 
 
+class Subject(models.Model):
+    """
+    Kullanıcının dersi. Aynı dersin farklı yazımları normalleştirilmiş
+    anahtar (`key`) üzerinden tek kayda eşlenir (bkz. tracker/subjects.py).
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='subjects',
+        verbose_name='Kullanıcı'
+    )
+    # Dersin gösterilen adı (ilk görülen yazım)
+    name = models.CharField(max_length=125, verbose_name='Ders Adı')
+    # Karşılaştırma anahtarı: Türkçe kurallarıyla küçük harf, tek boşluk
+    key = models.CharField(max_length=125, verbose_name='Anahtar')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Ders'
+        verbose_name_plural = 'Dersler'
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='subject_user_key_uniq'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 class StudySession(models.Model):
     """
     Çalışma oturumu modeli.
@@ -27,6 +57,16 @@ class StudySession(models.Model):
         help_text='Çalışma yapılan dersin adı'
     )
     
+    # Ders - aynı dersin farklı yazımları tek derse bağlanır; ders bazlı
+    # raporlar bu tamsayı anahtar üzerinde gruplanır. Kayıt sırasında
+    # ders adından otomatik atanır (bkz. tracker/signals.py)
+    subject_ref = models.ForeignKey(
+        Subject,
+        on_delete=models.RESTRICT,
+        related_name='sessions',
+        verbose_name='Ders',
+    )
+    
     # Süre - çalışma süresini dakika cinsinden tutar
     duration = models.IntegerField(
         verbose_name='Süre (Dakika)',
@@ -68,6 +108,14 @@ class StudySession(models.Model):
         verbose_name = 'Çalışma Oturumu'  # Tekil isim
         verbose_name_plural = 'Çalışma Oturumları'  # Çoğul isim
         ordering = ['-date', '-created_at']  # Tarihe göre azalan sıralama (en yeni önce)
+        indexes = [
+            # Bir günün kayıtları ve tarih aralığı sorguları (ana sayfa, çalışma takibi)
+            models.Index(fields=['user', 'date'], name='session_user_date_idx'),
+            # En uzun çalışma seansı (istatistikler)
+            models.Index(fields=['user', '-duration'], name='session_user_duration_idx'),
+            # Derslerin kullanım sayıları (ders önerileri); sadece indeks okunarak gruplanır
+            models.Index(fields=['user', 'subject_ref'], name='session_user_subject_idx'),
+        ]
     
     def get_duration_hours(self):
         """
@@ -161,6 +209,26 @@ class TodoItem(models.Model):
         verbose_name = 'Yapılacaklar Öğesi'  # Tekil isim
         verbose_name_plural = 'Yapılacaklar Öğeleri'  # Çoğul isim
         ordering = ['-created_at']  # Oluşturulma zamanına göre azalan sıralama (en yeni önce)
+        indexes = [
+            # Yapılacaklar listesi: tüm görevler (önemli görevler önce, sonra tarihe göre)
+            models.Index(
+                fields=['user', '-is_important', '-important_marked_at', 'completed', '-created_at'],
+                name='todo_user_order_idx',
+            ),
+            # Yapılacaklar listesi: bekleyen / tamamlanan filtreleri ve sayımları.
+            # Kısmi (partial) indeks: boolean filtre `NOT completed` olarak derlendiği için
+            # (user, completed, ...) bileşik indeksi her veritabanında kullanılamıyor.
+            models.Index(
+                fields=['user', '-is_important', '-important_marked_at', '-created_at'],
+                condition=models.Q(completed=False),
+                name='todo_user_pending_idx',
+            ),
+            models.Index(
+                fields=['user', '-is_important', '-important_marked_at', '-created_at'],
+                condition=models.Q(completed=True),
+                name='todo_user_completed_idx',
+            ),
+        ]
     
     def __str__(self):
         """
@@ -202,24 +270,39 @@ class CalendarEvent(models.Model):
         verbose_name='Renk'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = 'Takvim Etkinliği'
         verbose_name_plural = 'Takvim Etkinlikleri'
         ordering = ['date', 'created_at']
+        indexes = [
+            # Takvimde ay / tarih aralığı sorguları
+            models.Index(fields=['user', 'date'], name='event_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.date}"
 
 
 class UserStudyGoal(models.Model):
-    """Kullanıcının haftalık ve aylık çalışma hedefleri (dakika)."""
+    """
+    Kullanıcının günlük, haftalık ve aylık çalışma hedefleri (dakika).
+    Günlük hedef aynı zamanda streak eşiğidir; bir günün streak'e sayılması
+    için o gün en az bu kadar çalışılmalıdır.
+    """
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
         related_name='study_goal',
         verbose_name='Kullanıcı'
     )
+    daily_goal_minutes = models.PositiveIntegerField(
+        default=60,
+        validators=[MinValueValidator(1), MaxValueValidator(1440)],
+        verbose_name='Günlük hedef (dakika)',
+        help_text='Bir günün streak\'e sayılması için gereken çalışma süresi (dakika)'
+    )
     weekly_goal_minutes = models.PositiveIntegerField(
         default=420,
         verbose_name='Haftalık hedef (dakika)',
@@ -237,4 +320,158 @@ class UserStudyGoal(models.Model):
         verbose_name_plural = 'Çalışma Hedefleri'
 
     def __str__(self):
-        return f"{self.user.username}: {self.weekly_goal_minutes} dk/hafta, {self.monthly_goal_minutes} dk/ay"
+        return (
+            f"{self.user.username}: {self.daily_goal_minutes} dk/gün, "
+            f"{self.weekly_goal_minutes} dk/hafta, {self.monthly_goal_minutes} dk/ay"
+        )
+
+
+class DailyStudyTotal(models.Model):
+    """
+    Kullanıcının günlük toplam çalışma süresi özeti.
+
+    StudySession kayıtlarından türetilir ve sinyallerle senkron tutulur
+    (bkz. tracker/signals.py). Streak, 7/30 günlük toplamlar ve hedef
+    ilerlemesi ham oturumları taramak yerine bu küçük tablodan okunur.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Kullanıcı',
+        related_name='daily_study_totals'
+    )
+    date = models.DateField(verbose_name='Tarih')
+    minutes = models.PositiveIntegerField(default=0, verbose_name='Toplam süre (dakika)')
+    session_count = models.PositiveIntegerField(default=0, verbose_name='Oturum sayısı')
+
+    class Meta:
+        verbose_name = 'Günlük Çalışma Toplamı'
+        verbose_name_plural = 'Günlük Çalışma Toplamları'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_daily_study_total'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.date} ({self.minutes} dakika)"
+
+
+class ActiveTimer(models.Model):
+    """
+    Ders Çalış sayfasındaki süre tutucu / geri sayımın sunucu tarafı durumu.
+
+    Süre, çalıştığı sürece `started_at` ile şimdiki zaman arasındaki farktan,
+    duraklatıldığında `accumulated_seconds` değerinden hesaplanır; böylece
+    sayaç cihaz veya sekme değişse de kaldığı yerden devam eder. Kullanıcının
+    her mod için en fazla bir sayacı olur. Durdurulduğunda StudySession
+    kaydına dönüştürülüp silinir (bkz. tracker/timers.py).
+    """
+    MODE_STOPWATCH = 'stopwatch'
+    MODE_COUNTDOWN = 'countdown'
+    MODE_CHOICES = [
+        (MODE_STOPWATCH, 'Süre Tutucu'),
+        (MODE_COUNTDOWN, 'Geri Sayım'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Kullanıcı',
+        related_name='active_timers'
+    )
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, verbose_name='Mod')
+    # Çalışıyorsa son başlatma / devam ettirme zamanı, duraklatılmışsa boş
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Başlatılma zamanı')
+    # Son başlatmadan önce geçen toplam süre (saniye)
+    accumulated_seconds = models.PositiveIntegerField(default=0, verbose_name='Geçen süre (saniye)')
+    # Geri sayımın toplam süresi (saniye); süre tutucuda boş
+    target_seconds = models.PositiveIntegerField(null=True, blank=True, verbose_name='Hedef süre (saniye)')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Aktif Sayaç'
+        verbose_name_plural = 'Aktif Sayaçlar'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'mode'], name='unique_active_timer_mode'),
+        ]
+
+    @property
+    def is_running(self):
+        return self.started_at is not None
+
+    def elapsed_seconds(self, now):
+        """Şimdiye kadar geçen toplam süre (saniye); geri sayımda hedefle sınırlıdır."""
+        elapsed = self.accumulated_seconds
+        if self.started_at is not None:
+            elapsed += max(0, int((now - self.started_at).total_seconds()))
+        if self.target_seconds is not None:
+            elapsed = min(elapsed, self.target_seconds)
+        return elapsed
+
+    def is_finished(self, now):
+        """Geri sayım hedef süreye ulaştı mı."""
+        return self.target_seconds is not None and self.elapsed_seconds(now) >= self.target_seconds
+
+    def __str__(self):
+        return f"{self.user_id} - {self.get_mode_display()} ({self.accumulated_seconds} sn)"
+
+
+class StreakState(models.Model):
+    """
+    Kullanıcının streak durumu; streak okumak tek satırlık bir sorgudur.
+
+    DailyStudyTotal'dan türetilir ve bir çalışma kaydı eklendiğinde,
+    düzenlendiğinde, başka güne taşındığında veya silindiğinde aynı
+    transaction içinde güncellenir (bkz. tracker/streaks.py). Ham kayıtlardan
+    yeniden hesaplamak için `repair_streaks` komutu kullanılır.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='streak_state',
+        verbose_name='Kullanıcı'
+    )
+    # Durumun hesaplandığı günlük hedef (UserStudyGoal.daily_goal_minutes)
+    threshold_minutes = models.PositiveIntegerField(default=60, verbose_name='Günlük hedef (dakika)')
+    # Hedefin tutturulduğu en son gün ve o güne kadar kesintisiz devam eden seri
+    last_qualifying_date = models.DateField(null=True, blank=True, verbose_name='Hedefin tutturulduğu son gün')
+    current_length = models.PositiveIntegerField(default=0, verbose_name='Son serinin uzunluğu (gün)')
+    longest_length = models.PositiveIntegerField(default=0, verbose_name='En uzun seri (gün)')
+    # Son yazma anındaki günün toplam çalışma süresi
+    today_date = models.DateField(null=True, blank=True, verbose_name='Gün')
+    today_minutes = models.PositiveIntegerField(default=0, verbose_name='Günün toplam süresi (dakika)')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Streak Durumu'
+        verbose_name_plural = 'Streak Durumları'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.current_length} gün (en uzun {self.longest_length})"
+
+
+class CacheVersion(models.Model):
+    """
+    Kullanıcının önbellek sürümü (bkz. tracker/cache.py).
+
+    Önbelleğe alınmış aggregate değerlerinin anahtarları bu sürümü içerir.
+    Sürüm, veriyi değiştiren yazmayla aynı transaction içinde yenilenir;
+    veritabanında tutulduğu için süreç içi önbellek kullanan birden fazla
+    worker da değişikliği commit anında görür.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='cache_version',
+        verbose_name='Kullanıcı'
+    )
+    version = models.CharField(max_length=32, verbose_name='Sürüm')
+
+    class Meta:
+        verbose_name = 'Önbellek Sürümü'
+        verbose_name_plural = 'Önbellek Sürümleri'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
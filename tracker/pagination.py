@@ -0,0 +1,185 @@
+"""
+Keyset (cursor) sayfalama.
+
+Django'nun Paginator'ı her sayfa için bir `COUNT(*)` ve `OFFSET` sorgusu
+çalıştırır; derin sayfalarda OFFSET kadar satır okunup atıldığı için süre
+sayfa numarasıyla doğrusal artar. Keyset sayfalamada ise bir önceki sayfanın
+son satırının sıralama değerleri cursor olarak taşınır ve sonraki sayfa
+`WHERE (sıralama alanları) > cursor` koşuluyla indeks üzerinden doğrudan
+okunur. Sayfa sayısından bağımsız olarak her sayfa tek bir sorgudur.
+
+Sıralama, verilen queryset'in `order_by` ifadesinden okunur; eşitlikleri
+kırmak için sona birincil anahtar eklenir. NULL değerlerin sıralamadaki yeri
+veritabanına göre değiştiği için (PostgreSQL'de en büyük, SQLite'ta en küçük)
+koşullar `connection.features.nulls_order_largest` değerine göre kurulur;
+böylece ORDER BY ifadesi ve kullanılan indeks sayfa numaralı modla aynı kalır.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from django.db import connections
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Çözümlenemeyen veya sıralamayla uyuşmayan cursor."""
+
+
+class KeysetPage:
+    """Keyset sayfalamada tek bir sayfa."""
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def _ordering(queryset):
+    """Queryset'in sıralamasını [(alan, azalan_mı), ...] listesi olarak döndürür; sona pk eklenir."""
+    order_by = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    ordering = []
+    for item in order_by:
+        if not isinstance(item, str):
+            raise ValueError('Keyset sayfalama sadece alan adı ile sıralamayı destekler.')
+        descending = item.startswith('-')
+        ordering.append((item.lstrip('-'), descending))
+    pk_name = queryset.model._meta.pk.name
+    if all(name not in (pk_name, 'pk') for name, _ in ordering):
+        # Eşit sıralama değerlerinde sayfalar arasında kayıt kaybolmaması için pk ile kır
+        last_descending = ordering[-1][1] if ordering else False
+        ordering.append((pk_name, last_descending))
+    return ordering
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        # Mikro saniyeler korunmalı; aksi halde aynı saniyedeki kayıtlar atlanabilir
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(obj, ordering):
+    """Bir kaydın sıralama değerlerini URL'de taşınabilir bir cursor'a çevirir."""
+    values = [_encode_value(getattr(obj, name)) for name, _ in ordering]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering):
+    """Cursor'ı sıralama alanlarının Python değerlerine çevirir."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error) as exc:
+        raise InvalidCursor(str(exc)) from exc
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('Cursor sıralama ile uyuşmuyor.')
+    decoded = []
+    for (name, _), value in zip(ordering, values):
+        field = model._meta.get_field(name)
+        try:
+            decoded.append(None if value is None else field.to_python(value))
+        except Exception as exc:
+            raise InvalidCursor(str(exc)) from exc
+    return decoded
+
+
+def _after_condition(model, name, value, descending, nulls_largest):
+    """
+    Tek bir alan için "sıralamada `value` değerinden sonra gelir" koşulu.
+    Hiçbir kayıt gelemiyorsa None döner.
+    """
+    nullable = model._meta.get_field(name).null
+    # NULL değerler sıralamada sonda mı (azalan sırada NULL en küçükse sonda kalır)
+    nulls_at_end = nulls_largest != descending
+    if value is None:
+        return None if nulls_at_end else Q(**{f'{name}__isnull': False})
+    condition = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+    if nullable and nulls_at_end:
+        condition |= Q(**{f'{name}__isnull': True})
+    return condition
+
+
+def _keyset_filter(model, ordering, values, nulls_largest):
+    """(a, b, c) > (va, vb, vc) biçimindeki satır karşılaştırmasını Q ifadesine çevirir."""
+    condition = Q(pk__in=[])
+    equal_prefix = Q()
+    for (name, descending), value in zip(ordering, values):
+        after = _after_condition(model, name, value, descending, nulls_largest)
+        if after is not None:
+            condition |= equal_prefix & after
+        equal = Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        equal_prefix &= equal
+    return condition
+
+
+def keyset_page(queryset, per_page, after=None, before=None, last=False):
+    """
+    Queryset'in bir sayfasını keyset yöntemiyle döndürür.
+
+    `after` verilirse cursor'dan sonraki sayfa, `before` verilirse cursor'dan
+    önceki sayfa, `last=True` ise son sayfa, hiçbiri verilmezse ilk sayfa
+    getirilir. Her durumda tek sorgu çalışır (`per_page + 1` satır okunur).
+    Geçersiz cursor için InvalidCursor fırlatılır.
+    """
+    model = queryset.model
+    ordering = _ordering(queryset)
+    nulls_largest = connections[queryset.db].features.nulls_order_largest
+    order_by = [f"{'-' if descending else ''}{name}" for name, descending in ordering]
+    backwards = before is not None or last
+
+    if backwards:
+        # Ters sıralamada ilerleyip sonucu tekrar çevir
+        ordering_used = [(name, not descending) for name, descending in ordering]
+        order_used = [f"{'' if descending else '-'}{name}" for name, descending in ordering]
+    else:
+        ordering_used = ordering
+        order_used = order_by
+
+    qs = queryset.order_by(*order_used)
+    cursor = after if after is not None else before
+    if cursor is not None:
+        values = decode_cursor(cursor, model, ordering)
+        qs = qs.filter(_keyset_filter(model, ordering_used, values, nulls_largest))
+
+    rows = list(qs[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if backwards:
+        rows.reverse()
+        has_next = before is not None
+        has_previous = has_more
+    else:
+        has_next = has_more
+        has_previous = after is not None
+
+    return KeysetPage(
+        rows,
+        has_next=has_next,
+        has_previous=has_previous,
+        next_cursor=encode_cursor(rows[-1], ordering) if rows and has_next else None,
+        previous_cursor=encode_cursor(rows[0], ordering) if rows and has_previous else None,
+    )
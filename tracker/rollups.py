@@ -0,0 +1,79 @@
+"""
+Günlük çalışma özet tablosu (DailyStudyTotal) yardımcıları.
+
+Özet satırları StudySession kayıtlarından türetilir; tek bir günün satırı
+`refresh_daily_total` ile, tüm tablo ise `rebuild_daily_totals` ile yeniden
+hesaplanır. Tablo yeniden oluşturulduğunda ondan türetilen streak durumları
+da yeniden hesaplanır.
+"""
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from . import streaks
+from .models import DailyStudyTotal, StudySession
+
+
+def refresh_daily_total(user_id, day):
+    """Tek bir (kullanıcı, gün) özet satırını ham kayıtlardan yeniden hesaplar."""
+    with transaction.atomic():
+        agg = StudySession.objects.filter(user_id=user_id, date=day).aggregate(
+            minutes=Sum('duration'),
+            session_count=Count('id'),
+        )
+        if not agg['session_count']:
+            DailyStudyTotal.objects.filter(user_id=user_id, date=day).delete()
+            return None
+        total, _ = DailyStudyTotal.objects.update_or_create(
+            user_id=user_id,
+            date=day,
+            defaults={'minutes': agg['minutes'] or 0, 'session_count': agg['session_count']},
+        )
+        return total
+
+
+def rebuild_daily_totals(user_ids=None, batch_size=1000):
+    """
+    Özet tabloyu ve streak durumlarını sıfırdan oluşturur. `user_ids`
+    verilirse sadece o kullanıcıların satırları yeniden hesaplanır.
+    Oluşturulan özet satırı sayısını döndürür.
+    """
+    sessions = StudySession.objects.all()
+    totals = DailyStudyTotal.objects.all()
+    if user_ids is not None:
+        sessions = sessions.filter(user_id__in=user_ids)
+        totals = totals.filter(user_id__in=user_ids)
+
+    rows = (
+        sessions.order_by()
+        .values('user_id', 'date')
+        .annotate(minutes=Sum('duration'), session_count=Count('id'))
+    )
+    with transaction.atomic():
+        totals.delete()
+        created = 0
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(DailyStudyTotal(**row))
+            if len(batch) >= batch_size:
+                DailyStudyTotal.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            DailyStudyTotal.objects.bulk_create(batch)
+            created += len(batch)
+        streaks.rebuild_streak_states(user_ids=user_ids, batch_size=batch_size)
+    return created
+
+
+def minutes_by_date(user, start, end):
+    """Tarih aralığındaki (ikisi dahil) çalışılan günler için `{tarih: dakika}` sözlüğü (tek sorgu)."""
+    return dict(
+        DailyStudyTotal.objects.filter(user=user, date__gte=start, date__lte=end)
+        .order_by()
+        .values_list('date', 'minutes')
+    )
+
+
+def minutes_on(user, day):
+    """Kullanıcının verilen gündeki toplam çalışma süresini (dakika) döndürür."""
+    return DailyStudyTotal.objects.filter(user=user, date=day).values_list('minutes', flat=True).first() or 0
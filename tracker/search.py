@@ -0,0 +1,435 @@
+"""
+Çalışma kayıtları (ders adı ve not), görev başlıkları ve takvim etkinlikleri
+üzerinde birleşik tam metin araması.
+
+Veritabanına göre üç arka uç vardır:
+
+- PostgreSQL: her tablo için `to_tsvector('simple', ...)` ifadesi üzerinde
+  GIN indeksi (bkz. migration 0024). Sonuçlar `ts_rank` ile sıralanır,
+  vurgulu parçalar (`ts_headline`) sadece istenen sayfanın satırları için
+  hesaplanır.
+- SQLite: tek bir FTS5 sanal tablosu (`tracker_search`) ve onu üç tabloyla
+  senkron tutan tetikleyiciler. Tablo ve tetikleyiciler her `migrate`
+  sonrasında kontrol edilir ve eksikse yeniden oluşturulur (bkz.
+  `install_sqlite_index`); SQLite bazı şema değişikliklerinde tabloyu yeniden
+  oluşturduğu için tetikleyiciler migration'larla kaybolabilir. Sonuçlar
+  `bm25` ile sıralanır; çok sık geçen kelimelerde sıralama maliyeti eşleşme
+  sayısıyla büyüdüğü için sadece en yeni SEARCH_RANK_WINDOW eşleşme
+  sıralanır, daha eski eşleşmeler onların ardından en yeni önce gelir.
+  Buradaki "en yeni" tarih değil, kayıt kimliği sırasıdır (FTS5 satır
+  kimliği `id * 4 + kod`); farklı türlerin kimlikleri birbirine göre
+  yaklaşık sıralanır.
+- Diğer veritabanları (veya FTS5 olmayan SQLite): `icontains` ile basit
+  arama; sonuçlar en yeni önce sıralanır.
+
+Sorgudaki kelimeler önek olarak aranır ve hepsi eşleşmelidir ("mat tek",
+"Matematik tekrarı" ile eşleşir). Büyük/küçük harf dönüşümü veritabanının
+kendi kurallarıyla ve belge ile sorguya aynı şekilde uygulanır. Vurgular
+HTML olarak döner: metin kaçışlanır ve eşleşen kısımlar `<mark>` ile
+işaretlenir. Vurgu işaretleri olarak kullanılan kontrol karakterleri
+metinden, veritabanı işaretlemeden önce silinir.
+"""
+import re
+from dataclasses import dataclass, field
+
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .models import CalendarEvent, StudySession, TodoItem
+
+
+# Sayfa başına varsayılan ve en fazla sonuç
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+
+# Derin sayfalar OFFSET ile atlandığı için gidilebilecek en son sayfa
+SEARCH_MAX_PAGE = 50
+
+# SQLite'ta bm25 ile sıralanan en fazla eşleşme (en yeni kayıtlar); daha
+# eski eşleşmeler sıralanmadan, en yeni önce listelenir
+SEARCH_RANK_WINDOW = 2000
+
+# Sorgudan alınacak en fazla kelime
+SEARCH_MAX_TERMS = 8
+
+# Vurgu işaretleri: veritabanı bunlarla işaretler, HTML'e çevirirken <mark> olur.
+# Metinde geçen işaret karakterleri aranan içerikten önceden silinir.
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+# Sonuç türleri; FTS5 satır kimliği `id * 4 + kod` olarak saklanır
+KINDS = {
+    'session': (1, StudySession),
+    'todo': (2, TodoItem),
+    'event': (3, CalendarEvent),
+}
+_KIND_BY_CODE = {code: kind for kind, (code, _) in KINDS.items()}
+
+
+class SearchError(ValueError):
+    """Geçersiz arama parametresi."""
+
+
+@dataclass
+class SearchPage:
+    """Bir sayfa arama sonucu."""
+    results: list = field(default_factory=list)
+    page: int = 1
+    has_next: bool = False
+
+
+def search_terms(query):
+    """Sorgudaki aranacak kelimeler (harf ve rakam dizileri, en fazla SEARCH_MAX_TERMS)."""
+    return re.findall(r'[^\W_]+', query or '')[:SEARCH_MAX_TERMS]
+
+
+def highlight(text):
+    """Veritabanının işaretlediği metni HTML'e çevirir (kaçışlanmış, <mark> ile)."""
+    return escape(text or '').replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def search(user, query, page=1, per_page=SEARCH_PAGE_SIZE):
+    """
+    Kullanıcının kayıtlarında arama yapar ve `page` numaralı sayfayı döndürür.
+    Sonuçlar `{'kind', 'id', 'title', 'snippet', 'date', 'url'}` sözlükleridir;
+    `title` ve `snippet` vurgulu HTML'dir.
+    """
+    if not 1 <= page <= SEARCH_MAX_PAGE:
+        raise SearchError(f'Sayfa 1 ile {SEARCH_MAX_PAGE} arasında olmalı')
+    per_page = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+    terms = search_terms(query)
+    if not terms:
+        return SearchPage(page=page)
+
+    offset = (page - 1) * per_page
+    backend = search_backend()
+    if backend == 'postgresql':
+        rows = _search_postgresql(user, terms, per_page + 1, offset)
+    elif backend == 'fts5':
+        rows = _search_fts5(user, terms, per_page + 1, offset)
+    else:
+        rows = _search_fallback(user, terms, per_page + 1, offset)
+
+    return SearchPage(
+        results=_decorate(rows[:per_page]),
+        page=page,
+        has_next=len(rows) > per_page,
+    )
+
+
+def _decorate(rows):
+    """(tür, id, başlık, parça) satırlarına tarih ve bağlantı ekler (tür başına en fazla bir sorgu)."""
+    ids = {}
+    for kind, pk, _, _ in rows:
+        ids.setdefault(kind, []).append(pk)
+
+    dates = {}
+    if ids.get('session'):
+        dates.update(
+            (('session', pk), day)
+            for pk, day in StudySession.objects.filter(pk__in=ids['session']).values_list('pk', 'date')
+        )
+    if ids.get('todo'):
+        dates.update(
+            (('todo', pk), timezone.localtime(created_at).date())
+            for pk, created_at in TodoItem.objects.filter(pk__in=ids['todo']).values_list('pk', 'created_at')
+        )
+    if ids.get('event'):
+        dates.update(
+            (('event', pk), day)
+            for pk, day in CalendarEvent.objects.filter(pk__in=ids['event']).values_list('pk', 'date')
+        )
+
+    today = timezone.localdate()
+    results = []
+    for kind, pk, title, snippet in rows:
+        day = dates.get((kind, pk))
+        if day is None:
+            # Arama ile okuma arasında silinmiş kayıt
+            continue
+        results.append({
+            'kind': kind,
+            'id': pk,
+            'title': highlight(title),
+            'snippet': highlight(snippet),
+            'date': day,
+            'url': _result_url(kind, pk, day, today),
+        })
+    return results
+
+
+def _result_url(kind, pk, day, today):
+    if kind == 'session':
+        return f"{reverse('tracker:study_tracking')}?date={day.isoformat()}"
+    if kind == 'todo':
+        return reverse('tracker:edit_todo', args=[pk])
+    # Takvim sayfası bugünün ayına göre kaydırma (offset) ile gezilir
+    offset = (day.year - today.year) * 12 + day.month - today.month
+    return f"{reverse('tracker:calendar')}?offset={offset}"
+
+
+# ==========================
+# ARKA UÇ SEÇİMİ
+# ==========================
+
+# Bağlantı başına FTS5 tablosunun var olup olmadığı (süreç içinde bir kez kontrol edilir)
+_fts5_available = {}
+
+
+def search_backend():
+    """Kullanılacak arama arka ucu: 'postgresql', 'fts5' veya 'like'."""
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        if connection.alias not in _fts5_available:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tracker_search'")
+                _fts5_available[connection.alias] = cursor.fetchone() is not None
+        if _fts5_available[connection.alias]:
+            return 'fts5'
+    return 'like'
+
+
+# ==========================
+# POSTGRESQL
+# ==========================
+
+# GIN indekslerinin ifadeleriyle birebir aynı olmalı (bkz. migration 0024)
+SESSION_DOCUMENT = "to_tsvector('simple', coalesce(subject, '') || ' ' || coalesce(note, ''))"
+TITLE_DOCUMENT = "to_tsvector('simple', coalesce(title, ''))"
+
+_HEADLINE_OPTIONS = f'StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=25, MinWords=10, MaxFragments=2'
+
+_POSTGRESQL_SQL = f"""
+WITH q AS (SELECT to_tsquery('simple', %(query)s) AS query)
+SELECT page.kind, page.id,
+       ts_headline('simple', translate(page.title, chr(2) || chr(3), ''), q.query,
+                   'HighlightAll=true, {_HEADLINE_OPTIONS}'),
+       CASE WHEN page.body = '' THEN ''
+            ELSE ts_headline('simple', translate(page.body, chr(2) || chr(3), ''), q.query, '{_HEADLINE_OPTIONS}')
+       END
+FROM (
+    SELECT 'session' AS kind, id, subject AS title, coalesce(note, '') AS body,
+           ts_rank({SESSION_DOCUMENT}, q.query) AS rank, date AS day
+    FROM tracker_studysession, q
+    WHERE user_id = %(user_id)s AND {SESSION_DOCUMENT} @@ q.query
+    UNION ALL
+    SELECT 'todo', id, title, '', ts_rank({TITLE_DOCUMENT}, q.query), created_at::date
+    FROM tracker_todoitem, q
+    WHERE user_id = %(user_id)s AND {TITLE_DOCUMENT} @@ q.query
+    UNION ALL
+    SELECT 'event', id, title, '', ts_rank({TITLE_DOCUMENT}, q.query), date
+    FROM tracker_calendarevent, q
+    WHERE user_id = %(user_id)s AND {TITLE_DOCUMENT} @@ q.query
+    ORDER BY rank DESC, day DESC, kind, id
+    LIMIT %(limit)s OFFSET %(offset)s
+) AS page, q
+ORDER BY page.rank DESC, page.day DESC, page.kind, page.id
+"""
+
+
+def _search_postgresql(user, terms, limit, offset):
+    # Kelimeler sadece harf ve rakamlardan oluşur; tsquery sözdizimine güvenle eklenir
+    query = ' & '.join(f'{term}:*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(_POSTGRESQL_SQL, {'query': query, 'user_id': user.id, 'limit': limit, 'offset': offset})
+        return cursor.fetchall()
+
+
+# ==========================
+# SQLITE FTS5
+# ==========================
+
+_FTS5_COLUMNS = f"""
+SELECT rowid,
+       highlight(tracker_search, 1, '{_MARK_START}', '{_MARK_END}'),
+       snippet(tracker_search, 2, '{_MARK_START}', '{_MARK_END}', '…', 16)
+FROM tracker_search
+"""
+
+# Sıralama penceresi (en yeni SEARCH_RANK_WINDOW eşleşme) alaka düzeyine göre
+_FTS5_RANKED_SQL = _FTS5_COLUMNS + """
+WHERE tracker_search MATCH %s AND rowid >= %s
+ORDER BY bm25(tracker_search, 0.0, 2.0, 1.0), rowid DESC
+LIMIT %s OFFSET %s
+"""
+
+# Pencereden eski eşleşmeler en yeni önce
+_FTS5_RECENT_SQL = _FTS5_COLUMNS + """
+WHERE tracker_search MATCH %s AND rowid < %s
+ORDER BY rowid DESC
+LIMIT %s OFFSET %s
+"""
+
+# Sıralama penceresinin alt sınırı: en yeni SEARCH_RANK_WINDOW eşleşmenin en eskisi
+_FTS5_WINDOW_SQL = """
+SELECT rowid FROM tracker_search WHERE tracker_search MATCH %s
+ORDER BY rowid DESC LIMIT 1 OFFSET %s
+"""
+
+
+def _search_fts5(user, terms, limit, offset):
+    # Kullanıcı filtresi de FTS indeksinden (owner sütunu) yapılır
+    words = ' AND '.join(f'"{term}"*' for term in terms)
+    match = f'owner : "u{user.id}" AND {{title body}} : ({words})'
+    with connection.cursor() as cursor:
+        # Satır kimlikleri kayıt kimliğiyle arttığı için pencere bir rowid aralığıdır
+        cursor.execute(_FTS5_WINDOW_SQL, [match, SEARCH_RANK_WINDOW - 1])
+        row = cursor.fetchone()
+        floor = row[0] if row else 0
+
+        rows = []
+        if row is None or offset < SEARCH_RANK_WINDOW:
+            cursor.execute(_FTS5_RANKED_SQL, [match, floor, limit, offset])
+            rows = cursor.fetchall()
+        if row is not None and len(rows) < limit:
+            # Sayfa pencerenin sonuna taştıysa eski eşleşmelerle tamamlanır
+            cursor.execute(_FTS5_RECENT_SQL, [match, floor, limit - len(rows), max(0, offset - SEARCH_RANK_WINDOW)])
+            rows += cursor.fetchall()
+    return [
+        (_KIND_BY_CODE[rowid % 4], rowid // 4, title, snippet)
+        for rowid, title, snippet in rows
+    ]
+
+
+# Tablo -> (tür, başlık ifadesi, metin ifadesi, güncellemede izlenen sütunlar)
+_FTS5_SOURCES = {
+    'tracker_studysession': ('session', '{row}.subject', "coalesce({row}.note, '')", 'user_id, subject, note'),
+    'tracker_todoitem': ('todo', '{row}.title', "''", 'user_id, title'),
+    'tracker_calendarevent': ('event', '{row}.title', "''", 'user_id, title'),
+}
+
+# Tetikleyici tanımları değiştiğinde artırılır; eski tetikleyiciler silinip
+# indeks yeniden doldurulur (bkz. install_sqlite_index)
+_FTS5_TRIGGER_VERSION = 2
+
+
+def _trigger_name(table, event):
+    return f'{table}_search_v{_FTS5_TRIGGER_VERSION}_{event}'
+
+
+def _fts5_text(expression, row):
+    """İndekslenecek metin: vurgu işareti olarak kullanılan kontrol karakterleri silinir."""
+    return f"replace(replace({expression.format(row=row)}, char(2), ''), char(3), '')"
+
+
+def _fts5_statements():
+    """FTS5 tablosu ve üç tablo için ekleme / güncelleme / silme tetikleyicileri."""
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tracker_search USING fts5("
+        "owner, title, body, prefix = '1 2 3', tokenize = 'unicode61 remove_diacritics 2')",
+    ]
+    for table, (kind, title, body, columns) in _FTS5_SOURCES.items():
+        code = KINDS[kind][0]
+        new_title, new_body = _fts5_text(title, 'new'), _fts5_text(body, 'new')
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'ai')} AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO tracker_search(rowid, owner, title, body) "
+            f"VALUES (new.id * 4 + {code}, 'u' || new.user_id, {new_title}, {new_body}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'au')} AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"UPDATE tracker_search SET owner = 'u' || new.user_id, title = {new_title}, body = {new_body} "
+            f"WHERE rowid = old.id * 4 + {code}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {_trigger_name(table, 'ad')} AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM tracker_search WHERE rowid = old.id * 4 + {code}; END",
+        ]
+    return statements
+
+
+def _fts5_rebuild_statements():
+    statements = ['DELETE FROM tracker_search']
+    for table, (kind, title, body, _) in _FTS5_SOURCES.items():
+        statements.append(
+            f"INSERT INTO tracker_search(rowid, owner, title, body) "
+            f"SELECT id * 4 + {KINDS[kind][0]}, 'u' || user_id, {_fts5_text(title, table)}, "
+            f"{_fts5_text(body, table)} FROM {table}"
+        )
+    return statements
+
+
+def install_sqlite_index(using):
+    """
+    SQLite'ta FTS5 tablosunu ve tetikleyicileri oluşturur. Tablo yeni
+    oluşturulduysa, bir tetikleyici eksikse (tablo yeniden oluşturulurken
+    silinmiş olabilir) veya tetikleyiciler eski bir sürümdense eski
+    tetikleyiciler silinir ve indeks baştan doldurulur. FTS5
+    desteklenmiyorsa hiçbir şey yapmaz; arama `icontains` ile çalışır. Her
+    şey yerindeyse tek sorgu çalışır.
+    """
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return False
+    expected = {'tracker_search'} | {
+        _trigger_name(table, event) for table in _FTS5_SOURCES for event in ('ai', 'au', 'ad')
+    }
+    with conn.cursor() as cursor:
+        # Kaynak tablolardaki tüm tetikleyiciler arama indeksine aittir
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'tracker_search' OR (type = 'trigger' AND tbl_name IN (%s))"
+            % ', '.join(['%s'] * len(_FTS5_SOURCES)),
+            list(_FTS5_SOURCES),
+        )
+        found = {name for name, in cursor.fetchall()}
+        if found == expected:
+            return True
+        try:
+            with transaction.atomic(using=using):
+                for name in sorted(found - {'tracker_search'}):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+                for statement in _fts5_statements() + _fts5_rebuild_statements():
+                    cursor.execute(statement)
+        except DatabaseError:
+            # SQLite FTS5 olmadan derlenmiş
+            return False
+    _fts5_available.pop(using, None)
+    return True
+
+
+# ==========================
+# YEDEK: icontains
+# ==========================
+
+def _marked(text, terms):
+    """Metindeki kelime başı eşleşmelerini vurgu işaretleriyle sarar."""
+    if not text:
+        return ''
+    text = text.replace(_MARK_START, '').replace(_MARK_END, '')
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')', re.IGNORECASE)
+    return pattern.sub(lambda match: f'{_MARK_START}{match.group(0)}{_MARK_END}', text)
+
+
+def _search_fallback(user, terms, limit, offset):
+    """Sıralamasız basit arama: her kelime başlıkta veya metinde geçmeli; en yeni önce."""
+    def matching(fields):
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for name in fields:
+                term_condition |= Q(**{f'{name}__icontains': term})
+            condition &= term_condition
+        return condition
+
+    count = limit + offset
+    candidates = [
+        ('session', pk, day, subject, note)
+        for pk, day, subject, note in StudySession.objects.filter(user=user)
+        .filter(matching(['subject', 'note'])).order_by('-date', '-id')
+        .values_list('pk', 'date', 'subject', 'note')[:count]
+    ] + [
+        ('todo', pk, timezone.localtime(created_at).date(), title, '')
+        for pk, created_at, title in TodoItem.objects.filter(user=user)
+        .filter(matching(['title'])).order_by('-created_at', '-id')
+        .values_list('pk', 'created_at', 'title')[:count]
+    ] + [
+        ('event', pk, day, title, '')
+        for pk, day, title in CalendarEvent.objects.filter(user=user)
+        .filter(matching(['title'])).order_by('-date', '-id')
+        .values_list('pk', 'date', 'title')[:count]
+    ]
+    candidates.sort(key=lambda row: (row[2], row[1]), reverse=True)
+    return [
+        (kind, pk, _marked(title, terms), _marked(body, terms))
+        for kind, pk, _, title, body in candidates[offset:offset + limit]
+    ]
@@ -0,0 +1,145 @@
+"""
+Tracker uygulaması sinyalleri.
+
+StudySession kayıtlarını ders adından derslerine (Subject) bağlar; kayıtlar
+oluşturulduğunda, düzenlendiğinde veya silindiğinde günlük özet tablosunu (DailyStudyTotal) ve streak durumunu (StreakState)
+aynı transaction içinde güncel tutar ve kullanıcının önbelleğe alınmış
+dashboard değerlerini geçersiz kılar. Kullanıcının günlük hedefi (streak
+eşiği) değiştiğinde streak durumu tek seferde yeniden hesaplanır. Yeni
+kullanıcılar için önbellek sürümü satırı (CacheVersion) oluşturulur.
+SQLite'ta her migrate sonrasında arama indeksinin (FTS5 tablosu ve
+tetikleyicileri) yerinde olduğu kontrol edilir.
+"""
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, search, streaks, subjects
+from .models import CacheVersion, StudySession, TodoItem, UserStudyGoal
+from .rollups import refresh_daily_total
+
+
+def _rollup_key(instance):
+    # __dict__ üzerinden okunur; ertelenmiş (deferred) alanlar için ek sorgu atılmaz
+    return instance.__dict__.get('user_id'), instance.__dict__.get('date')
+
+
+def _refresh_day(user_id, day):
+    """Günün özet satırını ve kullanıcının streak durumunu birlikte günceller."""
+    with transaction.atomic():
+        total = refresh_daily_total(user_id, day)
+        streaks.apply_day_total(user_id, day, total.minutes if total else 0)
+
+
+def _deleted_with_user(origin):
+    """Silme kullanıcının silinmesinden mi kaynaklanıyor (türetilmiş veriler de silinir)."""
+    model = origin._meta.model if hasattr(origin, '_meta') else getattr(origin, 'model', None)
+    return model is User
+
+
+@receiver(post_save, sender=User)
+def create_cache_version(sender, instance, created=False, raw=False, **kwargs):
+    """Yeni kullanıcının önbellek sürümü satırını oluşturur (bkz. cache.get_user_version)."""
+    if created and not raw:
+        CacheVersion.objects.create(user=instance, version=uuid.uuid4().hex)
+
+
+@receiver(post_init, sender=StudySession)
+def remember_session_day(sender, instance, **kwargs):
+    """Kaydın yüklendiği andaki (kullanıcı, gün) bilgisini saklar; tarih değişimini yakalamak için."""
+    instance._loaded_rollup_key = _rollup_key(instance)
+    instance._loaded_subject = instance.__dict__.get('subject')
+
+
+@receiver(pre_save, sender=StudySession)
+def assign_subject(sender, instance, raw=False, **kwargs):
+    """Kaydı ders adının normalleştirilmiş anahtarına göre dersine bağlar (gerekirse dersi oluşturur)."""
+    subject = instance.__dict__.get('subject')
+    if raw or subject is None:
+        return
+    if instance.subject_ref_id is not None and (
+        subject == instance._loaded_subject
+        or subjects.normalize_subject(subject) == subjects.normalize_subject(instance._loaded_subject)
+    ):
+        return
+    instance.subject_ref = subjects.get_or_create_subject(instance.user_id, subject)
+
+
+@receiver(post_save, sender=StudySession)
+def update_daily_total_on_save(sender, instance, raw=False, **kwargs):
+    """Kaydın eski ve yeni gününün özet satırlarını ve streak durumunu yeniden hesaplar."""
+    if raw:
+        return
+    keys = {_rollup_key(instance), instance._loaded_rollup_key}
+    for user_id, day in keys:
+        if user_id and day:
+            _refresh_day(user_id, day)
+    for user_id in {user_id for user_id, _ in keys}:
+        cache.invalidate_user(user_id)
+    instance._loaded_rollup_key = _rollup_key(instance)
+    instance._loaded_subject = instance.__dict__.get('subject')
+
+
+@receiver(post_delete, sender=StudySession)
+def update_daily_total_on_delete(sender, instance, origin=None, **kwargs):
+    """Silinen kaydın gününe ait özet satırını ve streak durumunu yeniden hesaplar."""
+    if _deleted_with_user(origin):
+        return
+    user_id, day = instance._loaded_rollup_key
+    if user_id and day:
+        _refresh_day(user_id, day)
+    cache.invalidate_user(user_id)
+
+
+def _daily_goal(instance):
+    # Yeni kayıtlarda önceki eşik varsayılandır (hedef kaydı olmayan kullanıcı)
+    if instance.pk is None:
+        return streaks.DAILY_STREAK_MINUTES
+    return instance.__dict__.get('daily_goal_minutes')
+
+
+@receiver(post_init, sender=UserStudyGoal)
+def remember_daily_goal(sender, instance, **kwargs):
+    """Kaydın yüklendiği andaki günlük hedefi saklar; eşik değişimini yakalamak için."""
+    instance._loaded_daily_goal = _daily_goal(instance)
+
+
+@receiver(post_save, sender=UserStudyGoal)
+def update_streak_on_goal_change(sender, instance, raw=False, **kwargs):
+    """Günlük hedef değiştiyse streak durumunu yeni eşikle yeniden hesaplar."""
+    if raw:
+        return
+    if instance.__dict__.get('daily_goal_minutes') != instance._loaded_daily_goal:
+        streaks.rebuild_streak_states(user_ids=[instance.user_id])
+    instance._loaded_daily_goal = _daily_goal(instance)
+    cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_delete, sender=UserStudyGoal)
+def update_streak_on_goal_delete(sender, instance, origin=None, **kwargs):
+    """Hedef silinince eşik varsayılana döner; gerekirse streak durumu yeniden hesaplanır."""
+    if _deleted_with_user(origin):
+        return
+    if instance._loaded_daily_goal != streaks.DAILY_STREAK_MINUTES:
+        streaks.rebuild_streak_states(user_ids=[instance.user_id])
+    cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=TodoItem)
+@receiver(post_delete, sender=TodoItem)
+def invalidate_cache_on_change(sender, instance, raw=False, **kwargs):
+    """Görev değiştiğinde kullanıcının önbelleğini geçersiz kılar."""
+    if raw:
+        return
+    cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_migrate)
+def install_search_index(sender, using='default', **kwargs):
+    """SQLite'ta arama indeksini oluşturur veya eksik tetikleyicileri onarır (bkz. search)."""
+    if sender.name != 'tracker':
+        return
+    search.install_sqlite_index(using)
@@ -0,0 +1,185 @@
+"""
+İstatistik sayfası için toplu (aggregate) sorgu yardımcıları.
+
+Her yardımcı, kullanıcının kayıt sayısından bağımsız olarak sabit sayıda
+sorgu çalıştırır; sayımlar koşullu aggregate (`Count(..., filter=Q(...))`)
+ile tek sorguda toplanır.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay, Floor
+from django.utils import timezone
+
+from .models import StudySession, Subject, TodoItem
+
+
+# İstatistik sayfasındaki 4 saatlik dilimlerin etiketleri (dilim sırasına göre)
+HOUR_BUCKET_LABELS = [
+    'Gece (00-03)',
+    'Sabah (04-07)',
+    'Sabah (08-11)',
+    'Öğlen (12-15)',
+    'Akşam (16-19)',
+    'Gece (20-23)',
+]
+
+
+def _todo_count_aggregates():
+    # Takma adlar model alan adlarıyla çakışmamalı (ör. 'completed')
+    return {
+        'total_count': Count('id'),
+        'completed_count': Count('id', filter=Q(completed=True)),
+        'important_count': Count('id', filter=Q(is_important=True)),
+    }
+
+
+def _todo_counts_from_row(row):
+    return {
+        'total': row['total_count'],
+        'completed': row['completed_count'],
+        'pending': row['total_count'] - row['completed_count'],
+        'important': row['important_count'],
+    }
+
+
+def todo_counts(user):
+    """
+    Kullanıcının tüm görevleri için toplam/tamamlanan/bekleyen/önemli
+    sayılarını tek bir koşullu aggregate sorgusuyla döndürür.
+    """
+    row = TodoItem.objects.filter(user=user).aggregate(**_todo_count_aggregates())
+    return _todo_counts_from_row(row)
+
+
+def todo_summary(user, today, days=7):
+    """
+    Kullanıcının görev istatistiklerini tek sorguda hesaplar.
+
+    Toplam/tamamlanan/bekleyen/önemli görev sayılarının yanında son `days`
+    günün (bugün dahil) günlük oluşturulan ve tamamlanan görev sayılarını döndürür.
+    """
+    day_list = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+
+    aggregates = _todo_count_aggregates()
+    for i, day in enumerate(day_list):
+        aggregates[f'created_{i}'] = Count('id', filter=Q(created_at__date=day))
+        aggregates[f'completed_{i}'] = Count('id', filter=Q(completed=True, updated_at__date=day))
+
+    row = TodoItem.objects.filter(user=user).aggregate(**aggregates)
+
+    daily = [
+        {'date': day, 'created': row[f'created_{i}'], 'completed': row[f'completed_{i}']}
+        for i, day in enumerate(day_list)
+    ]
+    summary = _todo_counts_from_row(row)
+    summary.update({
+        'created_today': daily[-1]['created'],
+        'completed_today': daily[-1]['completed'],
+        'daily': daily,
+    })
+    return summary
+
+
+def study_time_distribution(user, bucket_hours=4, by_weekday=False):
+    """
+    Çalışma dakikalarını oturumun oluşturulduğu saate göre veritabanında gruplar.
+
+    Saat, aktif saat diliminde (varsayılan: settings.TIME_ZONE) hesaplanır ve
+    `bucket_hours` saatlik dilimlere bölünür; 4 saatlik dilimlerde en fazla
+    6 satır döner. `by_weekday=True` ise ISO hafta günü (1=Pazartesi) ile
+    birlikte gruplanır. Sonuç `{dilim: dakika}` veya `{(gün, dilim): dakika}`
+    sözlüğüdür.
+    """
+    tzinfo = timezone.get_current_timezone()
+    bucket = ExtractHour('created_at', tzinfo=tzinfo)
+    if bucket_hours > 1:
+        bucket = Floor(bucket / bucket_hours)
+
+    qs = StudySession.objects.filter(user=user).annotate(bucket=bucket)
+    group_by = ['bucket']
+    if by_weekday:
+        qs = qs.annotate(weekday=ExtractIsoWeekDay('created_at', tzinfo=tzinfo))
+        group_by.insert(0, 'weekday')
+
+    rows = qs.order_by().values(*group_by).annotate(minutes=Sum('duration'))
+    if by_weekday:
+        return {(int(row['weekday']), int(row['bucket'])): row['minutes'] for row in rows}
+    return {int(row['bucket']): row['minutes'] for row in rows}
+
+
+def hour_buckets(user):
+    """İstatistik sayfası için 4 saatlik dilimlerde çalışma dağılımı (tek sorgu)."""
+    minutes_by_bucket = study_time_distribution(user, bucket_hours=4)
+    buckets = [
+        {'label': label, 'start': i * 4, 'end': i * 4 + 3, 'minutes': minutes_by_bucket.get(i, 0)}
+        for i, label in enumerate(HOUR_BUCKET_LABELS)
+    ]
+    max_minutes = max((b['minutes'] for b in buckets), default=0)
+    for bucket in buckets:
+        if max_minutes > 0 and bucket['minutes'] > 0:
+            bucket['percent'] = round((bucket['minutes'] / max_minutes) * 100, 1)
+        else:
+            bucket['percent'] = 0
+    return buckets, max_minutes
+
+
+def hourly_distribution(user):
+    """Günün 24 saati için çalışma dakikaları listesi (indeks = saat)."""
+    minutes_by_hour = study_time_distribution(user, bucket_hours=1)
+    return [minutes_by_hour.get(hour, 0) for hour in range(24)]
+
+
+def weekday_hour_matrix(user):
+    """7x24 matris: satırlar Pazartesi..Pazar, sütunlar 00..23 saatleri (dakika)."""
+    cells = study_time_distribution(user, bucket_hours=1, by_weekday=True)
+    return [[cells.get((weekday, hour), 0) for hour in range(24)] for weekday in range(1, 8)]
+
+
+def subject_breakdown(user, today, start=None):
+    """
+    Ders bazlı çalışma dağılımı (tek sorgu): `start`..`today` aralığında her
+    dersin toplam süresi, oturum sayısı, toplam içindeki payı ve bir önceki
+    eşit uzunluktaki aralığa göre değişimi (trend). Kayıtlar tamsayı ders
+    anahtarı (subject_ref) üzerinden gruplanır. `start` None ise tüm zamanlar
+    için hesaplanır ve trend gösterilmez. En çok çalışılan ders önce gelir.
+    """
+    current = Q(sessions__date__lte=today)
+    previous = None
+    if start is not None:
+        current &= Q(sessions__date__gte=start)
+        previous_start = start - (today - start) - timedelta(days=1)
+        previous = Q(sessions__date__gte=previous_start, sessions__date__lt=start)
+
+    annotations = {
+        'minutes': Sum('sessions__duration', filter=current),
+        'session_count': Count('sessions', filter=current),
+    }
+    qs = Subject.objects.filter(user=user)
+    if previous is not None:
+        annotations['previous_minutes'] = Sum('sessions__duration', filter=previous)
+        qs = qs.filter(current | previous)
+    else:
+        qs = qs.filter(current)
+    rows = list(
+        qs.values('id', 'name')
+        .annotate(**annotations)
+        .filter(minutes__gt=0)
+        .order_by('-minutes', 'name')
+    )
+
+    total = sum(row['minutes'] for row in rows)
+    for row in rows:
+        row['hours'] = row['minutes'] // 60
+        row['remaining_minutes'] = row['minutes'] % 60
+        row['percent'] = round(row['minutes'] * 100 / total, 1)
+        previous_minutes = row.pop('previous_minutes', None)
+        if start is None:
+            row['trend'] = None
+        elif not previous_minutes:
+            row['trend'] = 'new'
+        else:
+            change = round((row['minutes'] - previous_minutes) * 100 / previous_minutes)
+            row['change_percent'] = change
+            row['trend'] = 'up' if change > 0 else 'down' if change < 0 else 'flat'
+    return rows
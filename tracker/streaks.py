@@ -0,0 +1,325 @@
+"""
+Streak hesaplama yardımcıları.
+
+Streak, üst üste en az günlük hedef kadar çalışılan gün sayısıdır. Günlük
+hedef kullanıcıya özeldir (UserStudyGoal.daily_goal_minutes, varsayılan 60
+dakika). Hesaplamalar gün gün sorgu atmak yerine günlük özet tablosu
+(DailyStudyTotal) üzerinde tek bir sorgu ile yapılır, böylece sorgu sayısı
+streak uzunluğundan bağımsızdır.
+
+Kullanıcının streak durumu (StreakState) ayrıca saklanır ve her çalışma
+kaydı değişiminde güncellenir (bkz. `apply_day_total`); mevcut ve en uzun
+streak'i ve günün toplam süresini okumak tek satırlık bir sorgudur (bkz.
+`streak_summary`). Durum hesaplandığı günlük hedefi de saklar; kullanıcı hedefini değiştirdiğinde durum tek seferde yeniden
+hesaplanır (bkz. tracker/signals.py).
+"""
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .models import DailyStudyTotal, StreakState, StudySession, UserStudyGoal
+
+
+# Hedef kaydı olmayan kullanıcılar için bir günün streak'e sayılması
+# gereken minimum çalışma süresi (dakika)
+DAILY_STREAK_MINUTES = 60
+
+
+def daily_threshold(user_id):
+    """Kullanıcının günlük hedefi (streak eşiği), tek sorguda."""
+    threshold = UserStudyGoal.objects.filter(user_id=user_id).values_list('daily_goal_minutes', flat=True).first()
+    return threshold or DAILY_STREAK_MINUTES
+
+
+def qualifying_dates(user, until=None, threshold=DAILY_STREAK_MINUTES):
+    """
+    Hedefi tutturan günleri günlük özet tablosundan tek sorguda döndürür.
+    Sonuç en yeni günden en eskiye doğru sıralıdır.
+    """
+    qs = DailyStudyTotal.objects.filter(user=user, minutes__gte=threshold)
+    if until is not None:
+        qs = qs.filter(date__lte=until)
+    return qs.order_by('-date').values_list('date', flat=True)
+
+
+def count_streak(dates_desc, today):
+    """
+    En yeniden eskiye sıralı gün listesinde bugünden geriye doğru
+    kesintisiz devam eden gün sayısını sayar.
+    """
+    streak = 0
+    expected = today
+    for day in dates_desc:
+        if day != expected:
+            break
+        streak += 1
+        expected = expected - timedelta(days=1)
+    return streak
+
+
+def current_streak(user, today, threshold=None):
+    """
+    Kullanıcının bugün itibarıyla mevcut streak'ini döndürür. Eşik verilmezse
+    kullanıcının günlük hedefi kullanılır ve değer tek sorguda streak
+    durumundan okunur; durum bugünden sonraki bir güne aitse (gelecek tarihli
+    kayıtlar) özet tablodan hesaplanır. Eşik verilirse özet tablodan tek
+    sorguda hesaplanır.
+    """
+    if threshold is None:
+        state = (
+            StreakState.objects.filter(user=user)
+            .only('threshold_minutes', 'last_qualifying_date', 'current_length')
+            .first()
+        )
+        current = current_from_state(state, today)
+        if current is not None:
+            return current
+        threshold = state.threshold_minutes
+    return count_streak(qualifying_dates(user, until=today, threshold=threshold).iterator(), today)
+
+
+def streak_summary(user, today):
+    """
+    Kullanıcının streak durumundan `today` itibarıyla mevcut ve en uzun
+    streak ile bugünkü toplam süre: `{'current', 'longest', 'today_minutes'}`.
+    Çoğu durumda tek sorgu çalışır. Durum bugünden sonraki bir güne aitse
+    (gelecek tarihli kayıtlar) mevcut streak özet tablodan hesaplanır. Durum
+    bugün yazılmadıysa bugünün toplamı özet tablodan okunur; önceden girilmiş
+    gelecek tarihli kayıtların günü gelmiş olabilir. Durumu olmayan
+    kullanıcının hiç kaydı yoktur.
+    """
+    state = (
+        StreakState.objects.filter(user=user)
+        .only('threshold_minutes', 'last_qualifying_date', 'current_length', 'longest_length',
+              'today_date', 'today_minutes')
+        .first()
+    )
+    current = current_from_state(state, today)
+    if current is None:
+        current = count_streak(
+            qualifying_dates(user, until=today, threshold=state.threshold_minutes).iterator(), today
+        )
+    if state is None or state.today_date == today:
+        today_minutes = state.today_minutes if state else 0
+    else:
+        today_minutes = (
+            DailyStudyTotal.objects.filter(user=user, date=today).values_list('minutes', flat=True).first() or 0
+        )
+    return {
+        'current': current,
+        'longest': state.longest_length if state else 0,
+        'today_minutes': today_minutes,
+    }
+
+
+def current_streak_from_totals(date_totals, today, threshold=DAILY_STREAK_MINUTES):
+    """
+    Önceden hesaplanmış günlük toplamlardan (date -> dakika) mevcut streak'i hesaplar.
+    Ek sorgu çalıştırmaz.
+    """
+    streak = 0
+    day = today
+    while date_totals.get(day, 0) >= threshold:
+        streak += 1
+        day = day - timedelta(days=1)
+    return streak
+
+
+def longest_streak_from_totals(date_totals, threshold=DAILY_STREAK_MINUTES):
+    """
+    Günlük toplamlardan (date -> dakika) tüm zamanların en uzun streak'ini hesaplar.
+    Ek sorgu çalıştırmaz.
+    """
+    longest = 0
+    current_run = 0
+    prev_date = None
+    for day in sorted(date_totals):
+        if (date_totals[day] or 0) >= threshold:
+            if prev_date and day == prev_date + timedelta(days=1):
+                current_run += 1
+            else:
+                current_run = 1
+            prev_date = day
+        else:
+            current_run = 0
+            prev_date = None
+        if current_run > longest:
+            longest = current_run
+    return longest
+
+
+# ==========================
+# SAKLANAN STREAK DURUMU
+# ==========================
+
+def current_from_state(state, today):
+    """
+    Streak durumundan `today` itibarıyla mevcut streak. Hedefin tutturulduğu
+    son gün bugünden sonraysa durum bugünü tek başına anlatamaz; None döner.
+    """
+    last = state.last_qualifying_date if state else None
+    if last is None or last < today:
+        return 0
+    if last == today:
+        return state.current_length
+    return None
+
+
+def summarize_dates(dates_asc):
+    """Artan sıralı hedef günlerinden (son gün, son serinin uzunluğu, en uzun seri) hesaplar."""
+    last = None
+    current = 0
+    longest = 0
+    for day in dates_asc:
+        current = current + 1 if last is not None and day == last + timedelta(days=1) else 1
+        last = day
+        longest = max(longest, current)
+    return last, current, longest
+
+
+def state_values(date_minutes, today, threshold=DAILY_STREAK_MINUTES):
+    """`{gün: dakika}` sözlüğünden StreakState alan değerleri."""
+    last, current, longest = summarize_dates(sorted(day for day, minutes in date_minutes.items() if minutes >= threshold))
+    return {
+        'threshold_minutes': threshold,
+        'last_qualifying_date': last,
+        'current_length': current,
+        'longest_length': longest,
+        'today_date': today,
+        'today_minutes': date_minutes.get(today, 0),
+    }
+
+
+def _values_from_totals(user_id, today, threshold):
+    """Kullanıcının durumunu özet tablodan tek sorguda hesaplar (hedef günleri ve bugün)."""
+    date_minutes = dict(
+        DailyStudyTotal.objects.filter(user_id=user_id)
+        .filter(Q(minutes__gte=threshold) | Q(date=today))
+        .values_list('date', 'minutes')
+    )
+    return state_values(date_minutes, today, threshold)
+
+
+def _apply_incremental(state, day, minutes):
+    """
+    Bir günün yeni toplamını duruma uygular. Sonucu gün gün geçmişe bakmadan
+    belirlenebilen durumlarda True, yeniden hesaplama gerekiyorsa False döner.
+    """
+    last = state.last_qualifying_date
+    if minutes >= state.threshold_minutes:
+        if last is None or day > last:
+            # Son seriyi bir gün uzatır veya yeni bir seri başlatır
+            extends = last is not None and day == last + timedelta(days=1)
+            state.current_length = state.current_length + 1 if extends else 1
+            state.last_qualifying_date = day
+            state.longest_length = max(state.longest_length, state.current_length)
+            return True
+        # Son hedef günü zaten sayılıydı; daha eski bir gün iki seriyi birleştirebilir
+        return day == last
+    # Hedef altındaki gün son hedef gününden sonraysa hiçbir seriyi etkilemez;
+    # öncesindeyse bir seriyi ortadan bölmüş olabilir
+    return last is None or day > last
+
+
+def apply_day_total(user_id, day, minutes, today=None):
+    """
+    Bir günün toplam süresi değiştikten sonra kullanıcının streak durumunu
+    günceller. Satır `select_for_update` ile kilitlenir ve çağıranın
+    transaction'ına katılır; böylece kayıt, günlük özet ve streak birlikte
+    commit edilir.
+
+    Sık durumlar (seriyi uzatan veya yeni seri başlatan gün, son hedef
+    gününden sonraki hedef altı gün) sabit sürelidir. Geçmişteki bir günün
+    düzenlenmesi veya silinmesi gibi bir seriyi ortadan bölebilecek ya da iki
+    seriyi birleştirebilecek değişikliklerde durum özet tablodan yeniden
+    hesaplanır.
+    """
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        state = StreakState.objects.select_for_update().filter(user_id=user_id).first()
+        if state is None:
+            # Durum kullanıcının ilk kaydıyla oluşur; durumu olmayan kullanıcının kaydı yoktur
+            values = _values_from_totals(user_id, today, daily_threshold(user_id))
+            StreakState.objects.update_or_create(user_id=user_id, defaults=values)
+            return
+
+        if day == today:
+            state.today_minutes = minutes
+        elif state.today_date != today:
+            # Günün ilk yazımı başka bir güne ait; bugün için önceden girilmiş
+            # kayıtlar olabileceğinden bugünün toplamı özet tablodan okunur
+            state.today_minutes = (
+                DailyStudyTotal.objects.filter(user_id=user_id, date=today).values_list('minutes', flat=True).first()
+                or 0
+            )
+        state.today_date = today
+
+        if not _apply_incremental(state, day, minutes):
+            for name, value in _values_from_totals(user_id, today, state.threshold_minutes).items():
+                setattr(state, name, value)
+        state.save()
+
+
+def _state_differs(state, values, today):
+    """Kayıtlı durum hesaplanan değerlerden farklı mı? Önceki güne ait günlük toplam 0 sayılır."""
+    today_minutes = state.today_minutes if state.today_date == today else 0
+    return (
+        today_minutes != values['today_minutes']
+        or any(
+            getattr(state, name) != values[name]
+            for name in ('threshold_minutes', 'last_qualifying_date', 'current_length', 'longest_length')
+        )
+    )
+
+
+def rebuild_streak_states(user_ids=None, from_sessions=False, dry_run=False, batch_size=1000):
+    """
+    Streak durumlarını kullanıcıların günlük hedefiyle sıfırdan hesaplar ve
+    kayıtlı durumdan farklı olanları düzeltir. `from_sessions=True` ise özet tablo yerine ham çalışma
+    kayıtlarından hesaplanır. `dry_run=True` ise hiçbir şey yazılmaz.
+    Durumu değişen (veya değişmesi gereken) kullanıcı id'lerini döndürür.
+    """
+    today = timezone.localdate()
+    if from_sessions:
+        rows = StudySession.objects.order_by('user_id', 'date').values('user_id', 'date').annotate(minutes=Sum('duration'))
+    else:
+        rows = DailyStudyTotal.objects.order_by('user_id', 'date').values('user_id', 'date', 'minutes')
+    states = StreakState.objects.all()
+    goals = UserStudyGoal.objects.all()
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+        states = states.filter(user_id__in=user_ids)
+        goals = goals.filter(user_id__in=user_ids)
+    thresholds = dict(goals.values_list('user_id', 'daily_goal_minutes'))
+
+    fields = ['threshold_minutes', 'last_qualifying_date', 'current_length', 'longest_length', 'today_date', 'today_minutes']
+    changed = []
+    with transaction.atomic():
+        existing = {state.user_id: state for state in states.select_for_update()}
+        expected = {}
+        for user_id, user_rows in groupby(rows.iterator(chunk_size=batch_size), key=lambda row: row['user_id']):
+            threshold = thresholds.get(user_id, DAILY_STREAK_MINUTES)
+            expected[user_id] = state_values({row['date']: row['minutes'] for row in user_rows}, today, threshold)
+        # Hiç kaydı kalmayan kullanıcıların durumu sıfırlanır
+        for user_id in existing.keys() - expected.keys():
+            expected[user_id] = state_values({}, today, thresholds.get(user_id, DAILY_STREAK_MINUTES))
+
+        to_create, to_update = [], []
+        for user_id, values in expected.items():
+            state = existing.get(user_id)
+            if state is None:
+                to_create.append(StreakState(user_id=user_id, **values))
+                changed.append(user_id)
+            elif _state_differs(state, values, today):
+                for name, value in values.items():
+                    setattr(state, name, value)
+                to_update.append(state)
+                changed.append(user_id)
+
+        if not dry_run:
+            StreakState.objects.bulk_create(to_create, batch_size=batch_size)
+            StreakState.objects.bulk_update(to_update, fields, batch_size=batch_size)
+    return sorted(changed)
@@ -0,0 +1,135 @@
+"""
+Ders (Subject) kayıtları ve ders adlarının normalleştirilmesi.
+
+Her kullanıcının dersleri ayrı bir tabloda tutulur ve StudySession kayıtları
+derse `subject_ref` yabancı anahtarıyla bağlanır. Aynı dersin farklı
+yazımları ("Matematik", "matematik ", "MATEMATİK") normalleştirilmiş anahtar
+(`key`) üzerinden tek bir derse eşlenir; ders bazlı raporlar uzun metin
+yerine tamsayı anahtar üzerinde gruplanır.
+
+Normalleştirme Türkçe büyük/küçük harf kurallarını uygular (I -> ı, İ -> i),
+baştaki / sondaki boşlukları atar ve aradaki boşlukları teke indirir.
+Kısaltmalar ("Mat") ayrı ders olarak kalır.
+
+Çalışma formundaki ders önerileri (`suggest`) kullanıcının en çok
+kullandığı derslerin önbellekteki listesinden süzülür; liste kullanıcının
+tüm derslerini kapsamıyorsa eksik kalan öneriler normalleştirilmiş anahtar
+üzerinde indeksli önek sorgusuyla tamamlanır.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Q
+
+from .models import StudySession, Subject
+
+
+# Kullanıcı başına önbellekte tutulan en çok kullanılan ders sayısı
+TOP_SUBJECTS_SIZE = 50
+
+# Ders önerisi uç noktasının döndürdüğü en fazla öneri
+SUGGESTION_LIMIT = 10
+
+
+def normalize_subject(name):
+    """Ders adının karşılaştırma anahtarı: Türkçe kurallarıyla küçük harf, tek boşluk."""
+    name = ' '.join((name or '').split())
+    return name.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def display_name(name):
+    """Ders adının gösterilecek hali (baştaki / sondaki ve fazla boşluklar atılmış)."""
+    return ' '.join((name or '').split())
+
+
+def get_or_create_subject(user_id, name):
+    """
+    Kullanıcının `name` adlı dersini döndürür; yoksa oluşturur. Aynı anda
+    iki istek aynı dersi oluşturmaya çalışırsa benzersizlik kısıtı
+    sayesinde tek kayıt oluşur.
+    """
+    key = normalize_subject(name)
+    try:
+        return Subject.objects.get(user_id=user_id, key=key)
+    except Subject.DoesNotExist:
+        pass
+    try:
+        with transaction.atomic():
+            return Subject.objects.create(user_id=user_id, key=key, name=display_name(name))
+    except IntegrityError:
+        return Subject.objects.get(user_id=user_id, key=key)
+
+
+def resolve_subjects(user_id, names, batch_size=1000):
+    """
+    Toplu ekleme için ders adlarını derslere eşler: `{ad: Subject}`. Ad
+    sayısından bağımsız olarak en fazla iki okuma ve bir toplu ekleme
+    sorgusu çalışır.
+    """
+    by_key = {}
+    for name in names:
+        by_key.setdefault(normalize_subject(name), display_name(name))
+
+    existing = {s.key: s for s in Subject.objects.filter(user_id=user_id, key__in=by_key)}
+    missing = [Subject(user_id=user_id, key=key, name=name) for key, name in by_key.items() if key not in existing]
+    if missing:
+        Subject.objects.bulk_create(missing, batch_size=batch_size, ignore_conflicts=True)
+        existing.update(
+            (s.key, s) for s in Subject.objects.filter(user_id=user_id, key__in=[s.key for s in missing])
+        )
+    return {name: existing[normalize_subject(name)] for name in names}
+
+
+def top_subjects(user_id, limit=TOP_SUBJECTS_SIZE):
+    """
+    Kullanıcının en çok kullanılan dersleri (en çok önce):
+    `[{'id', 'name', 'key', 'uses'}, ...]`. Kullanım sayıları (user,
+    subject_ref) indeksi üzerinden gruplanır; iki sorgu çalışır.
+    """
+    counts = list(
+        StudySession.objects.filter(user_id=user_id)
+        .values('subject_ref_id')
+        .annotate(uses=Count('id'))
+        .order_by('-uses', 'subject_ref_id')[:limit]
+    )
+    names = {
+        pk: (name, key)
+        for pk, name, key in Subject.objects.filter(pk__in=[row['subject_ref_id'] for row in counts])
+        .values_list('pk', 'name', 'key')
+    }
+    return [
+        {'id': row['subject_ref_id'], 'name': names[row['subject_ref_id']][0],
+         'key': names[row['subject_ref_id']][1], 'uses': row['uses']}
+        for row in counts
+    ]
+
+
+def _prefix_filter(prefix):
+    if connection.vendor == 'postgresql':
+        # LIKE 'önek%' -> subject_user_key_prefix_idx (varchar_pattern_ops, bkz. migration 0023)
+        return Q(key__startswith=prefix)
+    # Anahtarlar ikili (BINARY) sıralandığı için önek, (user, key) indeksinde bir aralıktır
+    return Q(key__gte=prefix, key__lt=prefix + '\U0010ffff')
+
+
+def suggest(user_id, query, top, limit=SUGGESTION_LIMIT):
+    """
+    `query` ile başlayan dersler, en çok kullanılan önce. `top` kullanıcının
+    önbellekteki en çok kullanılan dersleridir (bkz. `top_subjects`). Liste
+    kullanıcının tüm derslerini kapsıyorsa veya yeterli öneri içeriyorsa
+    sorgu çalışmaz; aksi halde eksik öneriler indeksli önek sorgusuyla
+    tamamlanır.
+    """
+    prefix = normalize_subject(query)
+    matches = [subject for subject in top if subject['key'].startswith(prefix)][:limit]
+    if len(matches) >= limit or len(top) < TOP_SUBJECTS_SIZE:
+        return matches
+
+    extra = (
+        Subject.objects.filter(user_id=user_id)
+        .filter(_prefix_filter(prefix))
+        .exclude(pk__in=[subject['id'] for subject in top])
+        .annotate(uses=Count('sessions'))
+        .filter(uses__gt=0)
+        .order_by('-uses', 'name')
+        .values('id', 'name', 'key', 'uses')[:limit - len(matches)]
+    )
+    return matches + list(extra)
@@ -1,3 +1,1653 @@
-from django.test import TestCase
+import csv
+import json
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+from datetime import date, datetime, timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from studytracker import instrumentation
+
+from . import benchmark, cache, export, importer, search, signals, stats, streaks, subjects, timers
+from .models import (
+    ActiveTimer, CacheVersion, CalendarEvent, DailyStudyTotal, StreakState, StudySession, Subject, TodoItem, UserStudyGoal,
+)
+from .pagination import InvalidCursor, keyset_page
+from .rollups import rebuild_daily_totals
+from .views import (
+    CALENDAR_COLOR_TABLE,
+    CALENDAR_DISPLAY_COLOR_MAP,
+    _calendar_text_color,
+    _month_layout,
+    calculate_streak,
+)
+
+
+def add_sessions(user, days, duration=60, start=None):
+    """Test yardımcısı: bugünden geriye doğru verilen gün sayısı kadar kayıt ekler."""
+    start = start or timezone.localdate()
+    subject = subjects.get_or_create_subject(user.id, 'Matematik')
+    StudySession.objects.bulk_create([
+        StudySession(user=user, subject='Matematik', subject_ref=subject, duration=duration, date=start - timedelta(days=i))
+        for i in range(days)
+    ])
+    # bulk_create sinyal göndermediği için özet tabloyu elle yeniden oluştur
+    rebuild_daily_totals(user_ids=[user.id])
+
+
+class TrackerTestCase(TestCase):
+    """Her testte önbellekleri temizleyen temel test sınıfı."""
+
+    def setUp(self):
+        super().setUp()
+        django_cache.clear()
+        cache.local_cache.clear()
+
+
+class StreakTests(TrackerTestCase):
+    """Streak hesaplamalarının doğruluğu ve sorgu sayısı testleri."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.today = timezone.localdate()
+
+    def test_no_sessions(self):
+        self.assertEqual(calculate_streak(self.user), 0)
+
+    def test_today_below_threshold_breaks_streak(self):
+        add_sessions(self.user, 5, start=self.today - timedelta(days=1))
+        StudySession.objects.create(user=self.user, subject='Fizik', duration=59, date=self.today)
+        self.assertEqual(calculate_streak(self.user), 0)
+
+    def test_sessions_on_same_day_are_summed(self):
+        add_sessions(self.user, 3, duration=30)
+        add_sessions(self.user, 2, duration=30)
+        self.assertEqual(calculate_streak(self.user), 2)
+
+    def test_gap_stops_streak(self):
+        add_sessions(self.user, 3)
+        add_sessions(self.user, 10, start=self.today - timedelta(days=4))
+        self.assertEqual(calculate_streak(self.user), 3)
+
+    def test_future_sessions_are_ignored(self):
+        add_sessions(self.user, 2)
+        add_sessions(self.user, 1, start=self.today + timedelta(days=1))
+        self.assertEqual(calculate_streak(self.user), 2)
+
+    def test_query_count_does_not_grow_with_streak_length(self):
+        add_sessions(self.user, 3)
+        with self.assertNumQueries(1):
+            self.assertEqual(calculate_streak(self.user), 3)
+
+        other = User.objects.create_user('veli', password='parola12345')
+        add_sessions(other, 400)
+        with self.assertNumQueries(1):
+            self.assertEqual(calculate_streak(other), 400)
+
+    def test_longest_streak_from_totals(self):
+        d = self.today
+        totals = {
+            d - timedelta(days=10): 60,
+            d - timedelta(days=9): 90,
+            d - timedelta(days=8): 120,
+            d - timedelta(days=7): 10,
+            d - timedelta(days=6): 60,
+            d - timedelta(days=4): 60,
+            d - timedelta(days=3): 60,
+        }
+        self.assertEqual(streaks.longest_streak_from_totals(totals), 3)
+        self.assertEqual(streaks.current_streak_from_totals(totals, d), 0)
+        self.assertEqual(streaks.current_streak_from_totals(totals, d - timedelta(days=3)), 2)
+
+
+class DailyStudyTotalTests(TrackerTestCase):
+    """Günlük özet tablosunun StudySession değişiklikleriyle senkron kalması."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def totals(self):
+        return {
+            t.date: (t.minutes, t.session_count)
+            for t in DailyStudyTotal.objects.filter(user=self.user)
+        }
+
+    def test_create_edit_move_and_delete(self):
+        first = StudySession.objects.create(user=self.user, subject='Fizik', duration=40, date=self.today)
+        StudySession.objects.create(user=self.user, subject='Kimya', duration=25, date=self.today)
+        self.assertEqual(self.totals(), {self.today: (65, 2)})
+
+        first.duration = 50
+        first.save()
+        self.assertEqual(self.totals(), {self.today: (75, 2)})
+
+        # Kaydı başka bir güne taşı: her iki günün satırı da güncellenmeli
+        moved = StudySession.objects.get(pk=first.pk)
+        moved.date = self.yesterday
+        moved.save()
+        self.assertEqual(self.totals(), {self.today: (25, 1), self.yesterday: (50, 1)})
+
+        moved.delete()
+        self.assertEqual(self.totals(), {self.today: (25, 1)})
+
+    def test_rebuild_command(self):
+        add_sessions(self.user, 3, duration=30)
+        DailyStudyTotal.objects.all().delete()
+        call_command('rebuild_daily_totals', '--user', 'ali', stdout=StringIO())
+        self.assertEqual(len(self.totals()), 3)
+        self.assertEqual(self.totals()[self.today], (30, 1))
+
+
+class StreakStateTests(TrackerTestCase):
+    """Saklanan streak durumunun kayıt ekleme / düzenleme / silme ile güncel kalması."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.today = timezone.localdate()
+
+    def day(self, offset):
+        return self.today - timedelta(days=offset)
+
+    def add(self, offset, duration=60):
+        self.client.post(reverse('tracker:study_tracking'), {
+            'subject': 'Matematik',
+            'date': self.day(offset).isoformat(),
+            'duration': duration,
+            'note': '',
+        })
+        return StudySession.objects.filter(user=self.user).latest('id')
+
+    def edit(self, session, offset, duration):
+        self.client.post(reverse('tracker:edit_session', args=[session.id]), {
+            'subject': session.subject,
+            'date': self.day(offset).isoformat(),
+            'duration': duration,
+            'note': '',
+        })
+
+    def state(self):
+        state = StreakState.objects.get(user=self.user)
+        return state.current_length, state.longest_length, state.last_qualifying_date
+
+    def assertMatchesRecompute(self):
+        self.assertEqual(streaks.rebuild_streak_states(user_ids=[self.user.id], dry_run=True), [])
+
+    def test_streak_built_through_views(self):
+        for offset in (2, 1, 0):
+            self.add(offset)
+        self.assertEqual(self.state(), (3, 3, self.today))
+        self.assertEqual(StreakState.objects.get(user=self.user).today_minutes, 60)
+        with self.assertNumQueries(1):
+            self.assertEqual(calculate_streak(self.user), 3)
+        self.assertMatchesRecompute()
+
+    def test_summary_is_read_from_state(self):
+        for offset in (5, 4, 3, 1, 0):
+            self.add(offset)
+        self.add(0, duration=25)
+        with self.assertNumQueries(1):
+            summary = streaks.streak_summary(self.user, self.today)
+        self.assertEqual(summary, {'current': 2, 'longest': 3, 'today_minutes': 85})
+
+        self.assertEqual(streaks.streak_summary(User.objects.create_user('veli'), self.today),
+                         {'current': 0, 'longest': 0, 'today_minutes': 0})
+
+    def test_summary_when_future_sessions_arrive(self):
+        # Yarın ve öbür gün için önceden girilmiş kayıtlar; durum bugün yazıldı
+        self.add(-1)
+        self.add(-2, duration=30)
+        tomorrow, day_after = self.day(-1), self.day(-2)
+        self.assertEqual(streaks.streak_summary(self.user, self.today)['today_minutes'], 0)
+
+        # Günü gelen kaydın süresi ve streak'i durum yerine özet tablodan okunur
+        self.assertEqual(streaks.streak_summary(self.user, tomorrow), {'current': 1, 'longest': 1, 'today_minutes': 60})
+        self.assertEqual(streaks.streak_summary(self.user, day_after), {'current': 0, 'longest': 1, 'today_minutes': 30})
+
+    def test_first_write_of_the_day_for_another_day_keeps_today_total(self):
+        # Dün bugün için 90 dakikalık kayıt girilmiş: durum dün yazıldı
+        self.add(0, duration=90)
+        StreakState.objects.filter(user=self.user).update(today_date=self.day(1), today_minutes=0)
+
+        # Bugünün ilk yazımı yarına ait; bugünün toplamı kaybolmamalı
+        self.add(-1)
+        self.assertEqual(StreakState.objects.get(user=self.user).today_minutes, 90)
+        self.assertEqual(streaks.streak_summary(self.user, self.today)['today_minutes'], 90)
+        self.assertMatchesRecompute()
+
+    def test_edit_in_the_middle_breaks_streak(self):
+        sessions = {offset: self.add(offset) for offset in range(5)}
+        self.assertEqual(self.state(), (5, 5, self.today))
+
+        # Ortadaki günün süresi hedefin altına düşerse seri ikiye bölünür
+        self.edit(sessions[2], 2, 30)
+        self.assertEqual(self.state(), (2, 2, self.today))
+        self.assertEqual(calculate_streak(self.user), 2)
+        self.assertMatchesRecompute()
+
+    def test_moving_session_breaks_and_heals_streak(self):
+        sessions = {offset: self.add(offset) for offset in range(5)}
+
+        # Kaydı başka bir güne taşımak ortada bir boşluk bırakır
+        self.edit(sessions[3], 10, 60)
+        self.assertEqual(self.state(), (3, 3, self.today))
+        self.assertMatchesRecompute()
+
+        # Boşluk geri doldurulunca iki seri birleşir
+        self.edit(sessions[3], 3, 60)
+        self.assertEqual(self.state(), (5, 5, self.today))
+        self.assertMatchesRecompute()
+
+    def test_filling_gap_merges_runs(self):
+        for offset in (4, 3, 1, 0):
+            self.add(offset)
+        self.assertEqual(self.state(), (2, 2, self.today))
+
+        self.add(2, duration=30)
+        self.assertEqual(self.state(), (2, 2, self.today))
+        self.add(2, duration=30)
+        self.assertEqual(self.state(), (5, 5, self.today))
+        self.assertMatchesRecompute()
+
+    def test_delete_breaks_streak_and_keeps_longest(self):
+        sessions = {offset: self.add(offset) for offset in range(6)}
+        self.client.post(reverse('tracker:delete_session', args=[sessions[0].id]))
+        self.assertEqual(self.state(), (5, 5, self.day(1)))
+        self.assertEqual(calculate_streak(self.user), 0)
+
+        self.client.post(reverse('tracker:delete_session', args=[sessions[4].id]))
+        self.assertEqual(self.state(), (3, 3, self.day(1)))
+        self.assertMatchesRecompute()
+
+    def test_future_sessions_fall_back_to_rollup(self):
+        self.add(1)
+        self.add(0)
+        self.add(-1)
+        self.assertEqual(self.state(), (3, 3, self.day(-1)))
+        self.assertEqual(calculate_streak(self.user), 2)
+
+    def test_repair_command(self):
+        for offset in range(3):
+            self.add(offset)
+        StreakState.objects.filter(user=self.user).update(current_length=1, longest_length=9)
+
+        with self.assertRaises(CommandError):
+            call_command('repair_streaks', '--check', stdout=StringIO())
+        self.assertEqual(self.state(), (1, 9, self.today))
+
+        out = StringIO()
+        call_command('repair_streaks', '--user', 'ali', stdout=out)
+        self.assertIn('1 kullanıcının', out.getvalue())
+        self.assertEqual(self.state(), (3, 3, self.today))
+        call_command('repair_streaks', '--check', stdout=StringIO())
+
+    def test_deleting_user_removes_state(self):
+        self.add(0)
+        self.user.delete()
+        self.assertFalse(StreakState.objects.exists())
+
+
+class DailyGoalThresholdTests(TrackerTestCase):
+    """Kullanıcının günlük hedefinin streak eşiği olarak kullanılması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.today = timezone.localdate()
+
+    def set_goals(self, daily, weekly=420):
+        return self.client.post(reverse('tracker:statistics'), {
+            'set_goals': '1',
+            'range': '7',
+            'daily_goal_minutes': daily,
+            'weekly_goal_minutes': weekly,
+            'monthly_goal_minutes': 1800,
+        })
+
+    def state(self):
+        state = StreakState.objects.get(user=self.user)
+        return state.threshold_minutes, state.current_length, state.longest_length
+
+    def test_threshold_change_recomputes_state(self):
+        add_sessions(self.user, 4, duration=45)
+        self.assertEqual(self.state(), (60, 0, 0))
+
+        self.set_goals(30)
+        self.assertEqual(self.state(), (30, 4, 4))
+        self.assertEqual(calculate_streak(self.user), 4)
+        response = self.client.get(reverse('tracker:statistics'))
+        self.assertEqual(response.context['current_streak'], 4)
+        self.assertEqual(response.context['longest_streak'], 4)
+        self.assertEqual(response.context['daily_goal_minutes'], 30)
+
+        # Yeni kayıtlar da yeni eşikle değerlendirilir
+        StudySession.objects.create(user=self.user, subject='Fizik', duration=35, date=self.today + timedelta(days=1))
+        self.assertEqual(self.state(), (30, 5, 5))
+
+        self.set_goals(90)
+        self.assertEqual(self.state(), (90, 0, 0))
+        self.assertEqual(streaks.rebuild_streak_states(user_ids=[self.user.id], dry_run=True), [])
+
+    def test_other_goal_changes_do_not_recompute(self):
+        add_sessions(self.user, 2)
+        self.set_goals(60)
+        StreakState.objects.filter(user=self.user).update(longest_length=9)
+        self.set_goals(60, weekly=600)
+        self.assertEqual(self.state(), (60, 2, 9))
+
+    def test_deleting_goal_restores_default(self):
+        add_sessions(self.user, 3, duration=45)
+        self.set_goals(45)
+        self.assertEqual(self.state(), (45, 3, 3))
+        UserStudyGoal.objects.filter(user=self.user).delete()
+        self.assertEqual(self.state(), (60, 0, 0))
+
+    def test_calendar_and_api_use_threshold(self):
+        add_sessions(self.user, 1, duration=45)
+        self.set_goals(40)
+        response = self.client.get(reverse('tracker:calendar'))
+        self.assertEqual(response.context['streak_minutes'], 40)
+        stats = self.client.get(reverse('tracker:api_stats')).json()
+        self.assertEqual(stats['streak'], {'threshold_minutes': 40, 'current': 1, 'longest': 1})
+        goals = self.client.get(reverse('tracker:api_goals')).json()
+        self.assertEqual(goals['daily'], {'goal_minutes': 40, 'minutes': 45, 'progress_percent': 100})
+
+
+class SubjectTests(TrackerTestCase):
+    """Ders adlarının normalleştirilip derslere bağlanması ve ders dağılımı."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.today = timezone.localdate()
+
+    def add(self, subject, duration=30, days_ago=0):
+        self.client.post(reverse('tracker:study_tracking'), {
+            'subject': subject,
+            'date': (self.today - timedelta(days=days_ago)).isoformat(),
+            'duration': duration,
+            'note': '',
+        })
+        return StudySession.objects.filter(user=self.user).latest('id')
+
+    def test_normalize_subject(self):
+        self.assertEqual(subjects.normalize_subject('  MATEMATİK   Geometri '), 'matematik geometri')
+        self.assertEqual(subjects.normalize_subject('IŞIK'), 'ışık')
+        self.assertNotEqual(subjects.normalize_subject('Mat'), subjects.normalize_subject('Matematik'))
+
+    def test_spellings_share_subject(self):
+        first = self.add('Matematik')
+        second = self.add('matematik ')
+        third = self.add('MATEMATİK')
+        self.assertEqual({first.subject_ref_id, second.subject_ref_id, third.subject_ref_id}, {first.subject_ref_id})
+        self.assertEqual(Subject.objects.get(user=self.user).name, 'Matematik')
+        self.assertEqual(second.subject, 'matematik')
+
+        # Başka kullanıcının aynı adlı dersi ayrıdır
+        other = User.objects.create_user('veli', password='parola12345')
+        self.assertNotEqual(subjects.get_or_create_subject(other.id, 'Matematik').pk, first.subject_ref_id)
+
+    def test_edit_relinks_subject(self):
+        session = self.add('Fizik')
+        self.client.post(reverse('tracker:edit_session', args=[session.id]), {
+            'subject': 'Kimya',
+            'date': self.today.isoformat(),
+            'duration': 30,
+            'note': '',
+        })
+        session = StudySession.objects.select_related('subject_ref').get(pk=session.pk)
+        self.assertEqual(session.subject_ref.name, 'Kimya')
+
+        # Adın sadece yazımı değişirse ders sorgulanmaz
+        session.subject = 'kimya'
+        with self.assertNumQueries(0):
+            signals.assign_subject(StudySession, session)
+        self.assertEqual(session.subject_ref.name, 'Kimya')
+
+    def test_import_links_subjects(self):
+        lines = ['date,subject,duration', '2025-01-01,Fizik,30', '2025-01-02,fizik,45', '2025-01-03,Kimya,20']
+        importer.import_sessions(self.user, lines)
+        self.assertEqual(
+            sorted(Subject.objects.filter(user=self.user).values_list('name', flat=True)), ['Fizik', 'Kimya']
+        )
+        self.assertFalse(StudySession.objects.filter(user=self.user).exclude(subject_ref__user=self.user).exists())
+
+    def test_breakdown(self):
+        self.add('Fizik', 90)
+        self.add('fizik', 30, days_ago=3)
+        self.add('Kimya', 60)
+        self.add('Kimya', 120, days_ago=8)
+        self.add('Tarih', 45, days_ago=10)
+        start = self.today - timedelta(days=6)
+        with self.assertNumQueries(1):
+            rows = stats.subject_breakdown(self.user, self.today, start)
+        self.assertEqual(
+            [(row['name'], row['minutes'], row['session_count'], row['percent'], row['trend']) for row in rows],
+            [('Fizik', 120, 2, 66.7, 'new'), ('Kimya', 60, 1, 33.3, 'down')],
+        )
+        self.assertEqual(rows[1]['change_percent'], -50)
+
+        rows = stats.subject_breakdown(self.user, self.today)
+        self.assertEqual([(row['name'], row['minutes'], row['trend']) for row in rows], [
+            ('Kimya', 180, None), ('Fizik', 120, None), ('Tarih', 45, None),
+        ])
+
+        response = self.client.get(reverse('tracker:statistics'), {'range': '7'})
+        self.assertEqual([row['name'] for row in response.context['subject_breakdown']], ['Fizik', 'Kimya'])
+        self.assertContains(response, 'Derslere Göre Dağılım')
+
+    def test_deleting_user_removes_subjects(self):
+        self.add('Fizik')
+        self.user.delete()
+        self.assertFalse(Subject.objects.exists())
+        self.assertFalse(StudySession.objects.exists())
+
+    def test_admin_rename_rejects_clashing_key(self):
+        short = self.add('Mat').subject_ref
+        self.add('Matematik')
+        self.client.force_login(User.objects.create_superuser('yonetici', password='parola12345'))
+        url = reverse('admin:tracker_subject_change', args=[short.id])
+
+        # Kullanıcının başka bir dersiyle çakışan ad form hatası verir
+        response = self.client.post(url, {'user': self.user.id, 'name': 'MATEMATİK'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'aynı anahtarlı bir dersi zaten var')
+        short.refresh_from_db()
+        self.assertEqual((short.name, short.key), ('Mat', 'mat'))
+
+        # Çakışmayan yeni adın anahtarı addan türetilir
+        response = self.client.post(url, {'user': self.user.id, 'name': 'Matematik  Geometri'})
+        self.assertEqual(response.status_code, 302)
+        short.refresh_from_db()
+        self.assertEqual(short.key, 'matematik geometri')
+
+
+class SubjectSuggestionTests(TrackerTestCase):
+    """Ders önerisi uç noktası: önek eşleşmesi, kullanım sırası ve önbellek."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.url = reverse('tracker:subject_suggestions')
+
+    def add_sessions(self, counts):
+        today = timezone.localdate()
+        refs = subjects.resolve_subjects(self.user.id, list(counts))
+        StudySession.objects.bulk_create([
+            StudySession(user=self.user, subject=name, subject_ref=refs[name], duration=30, date=today)
+            for name, count in counts.items()
+            for _ in range(count)
+        ])
+
+    def suggest(self, query):
+        return [row['name'] for row in self.client.get(self.url, {'q': query}).json()['results']]
+
+    def test_prefix_and_usage_order(self):
+        self.add_sessions({'Matematik': 3, 'Makine': 5, 'İngilizce': 2, 'Fizik': 1})
+        self.assertEqual(self.suggest('ma'), ['Makine', 'Matematik'])
+        self.assertEqual(self.suggest('  MAT'), ['Matematik'])
+        self.assertEqual(self.suggest('ingi'), ['İngilizce'])
+        self.assertEqual(self.suggest(''), ['Makine', 'Matematik', 'İngilizce', 'Fizik'])
+        self.assertEqual(self.suggest('kimya'), [])
+
+    def test_cached_top_subjects_serve_requests(self):
+        self.add_sessions({'Matematik': 3, 'Fizik': 1})
+        # Oturum + kullanıcı + önbellek sürümü + kullanım sayıları + ders adları
+        with self.assertNumQueries(5):
+            self.suggest('m')
+        # Sonraki isteklerde öneriler önbellekten süzülür
+        with self.assertNumQueries(3):
+            self.assertEqual(self.suggest('f'), ['Fizik'])
+
+        # Yeni kayıt önbelleği geçersiz kılar
+        StudySession.objects.create(user=self.user, subject='Felsefe', duration=30, date=timezone.localdate())
+        self.assertEqual(self.suggest('f'), ['Fizik', 'Felsefe'])
+
+    def test_less_used_subjects_fall_back_to_prefix_query(self):
+        counts = {f'Ders {i:02d}': 2 for i in range(subjects.TOP_SUBJECTS_SIZE)}
+        counts['Zooloji'] = 1
+        self.add_sessions(counts)
+        self.assertEqual(self.suggest('zoo'), ['Zooloji'])
+        self.assertEqual(len(self.suggest('ders')), subjects.SUGGESTION_LIMIT)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class SearchTests(TrackerTestCase):
+    """Birleşik arama: sıralama, vurgulama, sayfalama ve indeksin senkron kalması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.url = reverse('tracker:search')
+        self.today = timezone.localdate()
+
+    def add_session(self, subject, note='', day=None):
+        return StudySession.objects.create(
+            user=self.user, subject=subject, note=note, duration=30, date=day or self.today,
+        )
+
+    def search(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_searches_sessions_todos_and_events(self):
+        session = self.add_session('Fizik', 'Türev ve integral tekrarı')
+        todo = TodoItem.objects.create(user=self.user, title='İntegral ödevini bitir')
+        event = CalendarEvent.objects.create(user=self.user, title='Integral sınavı', date=self.today)
+        self.add_session('Kimya', 'Mol hesapları')
+
+        data = self.search('integ')
+        self.assertTrue(data['ok'])
+        self.assertFalse(data['has_next'])
+        found = {(row['kind'], row['id']) for row in data['results']}
+        self.assertEqual(found, {('session', session.id), ('todo', todo.id), ('event', event.id)})
+
+        by_kind = {row['kind']: row for row in data['results']}
+        self.assertIn('<mark>integral</mark>', by_kind['session']['snippet'])
+        self.assertEqual(by_kind['event']['title'], '<mark>Integral</mark> sınavı')
+        self.assertEqual(by_kind['session']['url'], f"{reverse('tracker:study_tracking')}?date={self.today.isoformat()}")
+        self.assertEqual(by_kind['todo']['url'], reverse('tracker:edit_todo', args=[todo.id]))
+        self.assertEqual(by_kind['event']['url'], f"{reverse('tracker:calendar')}?offset=0")
+
+    def test_all_terms_must_match_and_title_ranks_higher(self):
+        in_note = self.add_session('Tarih', 'Osmanlı tarihi, matematik sorularından sonra')
+        in_title = self.add_session('Matematik', 'Türev')
+        also_in_title = self.add_session('Matematik', 'Limit')
+
+        results = self.search('matematik')['results']
+        self.assertEqual({row['id'] for row in results[:2]}, {in_title.id, also_in_title.id})
+        self.assertEqual(results[2]['id'], in_note.id)
+        self.assertEqual([row['id'] for row in self.search('mat tür')['results']], [in_title.id])
+        self.assertEqual(self.search('kimya')['results'], [])
+
+    def test_highlights_are_escaped(self):
+        self.add_session('Fizik', '<script>alert(1)</script> optik')
+        row = self.search('optik')['results'][0]
+        self.assertNotIn('<script>', row['snippet'])
+        self.assertIn('&lt;script&gt;', row['snippet'])
+        self.assertIn('<mark>optik</mark>', row['snippet'])
+
+    def test_pagination(self):
+        for i in range(5):
+            self.add_session('Biyoloji', f'Hücre {i}', day=self.today - timedelta(days=i))
+        first = self.search('hücre', per_page=2)
+        second = self.search('hücre', per_page=2, page=2)
+        last = self.search('hücre', per_page=2, page=3)
+        self.assertTrue(first['has_next'])
+        self.assertTrue(second['has_next'])
+        self.assertFalse(last['has_next'])
+        ids = [row['id'] for page in (first, second, last) for row in page['results']]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+
+        self.assertEqual(self.client.get(self.url, {'q': 'hücre', 'page': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'hücre', 'page': 'x'}).status_code, 400)
+
+    def test_index_follows_updates_and_deletes(self):
+        session = self.add_session('Fizik', 'Optik')
+        todo = TodoItem.objects.create(user=self.user, title='Optik testi')
+
+        session.note = 'Dalgalar'
+        session.save()
+        todo.delete()
+        self.assertEqual(self.search('optik')['results'], [])
+        self.assertEqual([row['id'] for row in self.search('dalga')['results']], [session.id])
+
+        session.delete()
+        self.assertEqual(self.search('dalga')['results'], [])
+
+    def test_other_users_records_are_not_returned(self):
+        other = User.objects.create_user('veli', password='parola12345')
+        StudySession.objects.create(user=other, subject='Fizik', note='Optik', duration=30, date=self.today)
+        CalendarEvent.objects.create(user=other, title='Optik sınavı', date=self.today)
+        self.assertEqual(self.search('optik')['results'], [])
+
+    def test_empty_query_runs_no_search(self):
+        self.add_session('Fizik', 'Optik')
+        data = self.search(' ?! ')
+        self.assertEqual((data['ok'], data['results'], data['has_next']), (True, [], False))
+
+    def test_missing_triggers_are_repaired(self):
+        if search.search_backend() != 'fts5':
+            self.skipTest('SQLite FTS5 yok')
+        session = self.add_session('Fizik', 'Optik')
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {search._trigger_name('tracker_studysession', 'au')}")
+        StudySession.objects.filter(pk=session.pk).update(note='Dalgalar')
+
+        self.assertTrue(search.install_sqlite_index(connection.alias))
+        self.assertEqual(self.search('optik')['results'], [])
+        self.assertEqual([row['id'] for row in self.search('dalga')['results']], [session.id])
+
+    def test_outdated_triggers_are_replaced(self):
+        if search.search_backend() != 'fts5':
+            self.skipTest('SQLite FTS5 yok')
+        session = self.add_session('Fizik', 'Optik')
+        with connection.cursor() as cursor:
+            # Önceki sürümün tetikleyicisi: indeksi ikinci kez günceller
+            cursor.execute(
+                "CREATE TRIGGER tracker_studysession_search_ai AFTER INSERT ON tracker_studysession "
+                "BEGIN SELECT 1; END"
+            )
+        self.assertTrue(search.install_sqlite_index(connection.alias))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'tracker_studysession_search_ai'")
+            self.assertIsNone(cursor.fetchone())
+        self.assertEqual([row['id'] for row in self.search('optik')['results']], [session.id])
+
+    def test_pages_continue_past_rank_window(self):
+        sessions = [self.add_session('Biyoloji', f'Hücre {i}') for i in range(5)]
+        window = search.SEARCH_RANK_WINDOW
+        search.SEARCH_RANK_WINDOW = 2
+        try:
+            pages = [self.search('hücre', per_page=2, page=page) for page in (1, 2, 3)]
+        finally:
+            search.SEARCH_RANK_WINDOW = window
+        self.assertEqual([page['has_next'] for page in pages], [True, True, False])
+        ids = [row['id'] for page in pages for row in page['results']]
+        self.assertEqual(sorted(ids), sorted(session.id for session in sessions))
+        if search.search_backend() == 'fts5':
+            # Pencere dışındaki eşleşmeler en yeni önce
+            self.assertEqual(ids[2:], [sessions[2].id, sessions[1].id, sessions[0].id])
+
+    def test_marker_characters_in_text_are_removed(self):
+        self.add_session('Fizik', '\x02kırık\x03 optik \x03')
+        TodoItem.objects.create(user=self.user, title='\x03Optik\x02 testi')
+        for row in self.search('optik')['results']:
+            for html in (row['title'], row['snippet']):
+                self.assertEqual(html.count('<mark>'), html.count('</mark>'))
+                self.assertNotIn('<mark>kırık', html)
+                self.assertNotIn('\x02', html)
+        rows = {row[0]: row for row in search._search_fallback(self.user, ['optik'], 10, 0)}
+        self.assertEqual(rows['session'][3], 'kırık \x02optik\x03 ')
+        self.assertEqual(rows['todo'][2], '\x02Optik\x03 testi')
+
+    def test_fallback_search(self):
+        self.add_session('Fizik', 'Optik ve dalgalar', day=self.today - timedelta(days=1))
+        TodoItem.objects.create(user=self.user, title='Optik testi')
+        rows = search._search_fallback(self.user, ['optik'], 10, 0)
+        self.assertEqual([row[0] for row in rows], ['todo', 'session'])
+        self.assertEqual(rows[1][3], '\x02Optik\x03 ve dalgalar')
+
+    def test_query_count(self):
+        self.add_session('Fizik', 'Optik')
+        TodoItem.objects.create(user=self.user, title='Optik testi')
+        CalendarEvent.objects.create(user=self.user, title='Optik sınavı', date=self.today)
+        self.search('optik')
+        # Oturum + kullanıcı + sıralama penceresi + arama + tür başına bir tarih sorgusu
+        with self.assertNumQueries(7):
+            self.assertEqual(len(self.search('optik')['results']), 3)
+
+
+class SubjectMigrationTests(TransactionTestCase):
+    """0021 veri migration'ı mevcut ders adlarını tekilleştirip kayıtları bağlamalı."""
+
+    def test_populate_subjects(self):
+        # Kullanıcılar güncel şemada oluşturulur (sinyaller yeni tabloları kullanır)
+        user = User.objects.create_user('ali', password='parola12345')
+        other = User.objects.create_user('veli', password='parola12345')
+        executor = MigrationExecutor(connection)
+        executor.migrate([('tracker', '0020_daily_goal_minutes')])
+        apps = executor.loader.project_state([('tracker', '0020_daily_goal_minutes')]).apps
+        OldSession = apps.get_model('tracker', 'StudySession')
+        for owner, name in [(user, 'matematik '), (user, 'Matematik'), (user, 'Matematik'), (user, 'Fizik'), (other, 'Matematik')]:
+            OldSession.objects.create(user_id=owner.id, subject=name, duration=30, date=date(2025, 1, 1))
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        with CaptureQueriesContext(connection) as ctx:
+            executor.migrate(executor.loader.graph.leaf_nodes())
+        # Kayıtlar yazım başına değil grup başına tek UPDATE ile bağlanır
+        self.assertEqual(
+            len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "tracker_studysession"')]), 1
+        )
+
+        self.assertEqual(
+            sorted(Subject.objects.values_list('user__username', 'name', 'key')),
+            [('ali', 'Fizik', 'fizik'), ('ali', 'Matematik', 'matematik'), ('veli', 'Matematik', 'matematik')],
+        )
+        for session in StudySession.objects.select_related('subject_ref'):
+            self.assertEqual(session.subject_ref.user_id, session.user_id)
+            self.assertEqual(session.subject_ref.key, subjects.normalize_subject(session.subject))
+        # 0025 mevcut kullanıcılara önbellek sürümü ekler
+        self.assertEqual(set(CacheVersion.objects.values_list('user_id', flat=True)), {user.id, other.id})
+
+
+class StatisticsViewTests(TrackerTestCase):
+    """İstatistik sayfasının sorgu sayısı kullanıcının veri hacminden bağımsız olmalı."""
+
+    # Oturum + kullanıcı + hedef + önbellek sürümü + günlük özet + en uzun oturum + streak durumu
+    # + ders dağılımı + görev özeti + saat dağılımı
+    MAX_QUERIES = 10
+
+    def get_statistics(self, user):
+        self.client.force_login(user)
+        url = reverse('tracker:statistics')
+        # İlk istek hedef kaydını oluşturur; ölçüm ikinci istekte yapılır
+        self.client.get(url)
+        # Önbelleği boşaltarak en kötü durumu (önbelleksiz istek) ölç
+        django_cache.clear()
+        cache.local_cache.clear()
+        with self.assertNumQueries(self.MAX_QUERIES):
+            return self.client.get(url, {'range': '30'})
+
+    def test_query_count_is_constant(self):
+        empty = User.objects.create_user('bos', password='parola12345')
+        response = self.get_statistics(empty)
+        self.assertEqual(response.context['total_sessions'], 0)
+        self.assertEqual(response.context['total_todos'], 0)
+
+        heavy = User.objects.create_user('yogun', password='parola12345')
+        add_sessions(heavy, 120, duration=70)
+        TodoItem.objects.bulk_create([
+            TodoItem(user=heavy, title=f'Görev {i}', completed=i % 3 == 0, is_important=i % 5 == 0)
+            for i in range(60)
+        ])
+        response = self.get_statistics(heavy)
+        self.assertEqual(response.context['total_sessions'], 120)
+        self.assertEqual(response.context['current_streak'], 120)
+        self.assertEqual(response.context['last_30_days_minutes'], 30 * 70)
+        self.assertEqual(response.context['total_todos'], 60)
+        self.assertEqual(response.context['completed_todos'], 20)
+        self.assertEqual(response.context['important_todos'], 12)
+        self.assertEqual(response.context['created_today_todos'], 60)
+        self.assertEqual(response.context['completed_today_todos'], 20)
+
+
+class StudyTimeDistributionTests(TrackerTestCase):
+    """Saat bazlı dağılımın veritabanında, yerel saate göre gruplanması."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ali', password='parola12345')
+
+    def add_session(self, local_dt, duration):
+        session = StudySession.objects.create(user=self.user, subject='Fizik', duration=duration, date=local_dt.date())
+        StudySession.objects.filter(pk=session.pk).update(created_at=local_dt)
+
+    def test_buckets_hours_and_matrix(self):
+        tz = timezone.get_current_timezone()
+        # 2024-01-01 Pazartesi
+        self.add_session(datetime(2024, 1, 1, 1, 30, tzinfo=tz), 30)
+        self.add_session(datetime(2024, 1, 1, 2, 10, tzinfo=tz), 20)
+        self.add_session(datetime(2024, 1, 3, 23, 5, tzinfo=tz), 45)
+
+        with self.assertNumQueries(1):
+            buckets, max_minutes = stats.hour_buckets(self.user)
+        self.assertEqual([b['minutes'] for b in buckets], [50, 0, 0, 0, 0, 45])
+        self.assertEqual(max_minutes, 50)
+        self.assertEqual(buckets[0]['percent'], 100)
+
+        hourly = stats.hourly_distribution(self.user)
+        self.assertEqual((hourly[1], hourly[2], hourly[23], sum(hourly)), (30, 20, 45, 95))
+
+        matrix = stats.weekday_hour_matrix(self.user)
+        self.assertEqual(matrix[0][1], 30)
+        self.assertEqual(matrix[2][23], 45)
+
+
+class IndexUsageTests(TrackerTestCase):
+    """Her view'ın ana sorgusunun ilgili bileşik indeksi kullandığını EXPLAIN ile doğrular."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.users = [User.objects.create_user(f'kullanici{i}', password='parola12345') for i in range(3)]
+        for user in cls.users:
+            subject = subjects.get_or_create_subject(user.id, 'Matematik')
+            StudySession.objects.bulk_create([
+                StudySession(
+                    user=user, subject='Matematik', subject_ref=subject, duration=15 + i % 90, date=today - timedelta(days=i % 200)
+                )
+                for i in range(400)
+            ])
+            TodoItem.objects.bulk_create([
+                TodoItem(user=user, title=f'Görev {i}', completed=i % 2 == 0, is_important=i % 7 == 0)
+                for i in range(200)
+            ])
+            CalendarEvent.objects.bulk_create([
+                CalendarEvent(user=user, title=f'Etkinlik {i}', date=today - timedelta(days=i % 365))
+                for i in range(300)
+            ])
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == 'postgresql':
+            # Küçük tablolarda sıralı taramayı kapatarak planlayıcının indeks seçimini gör
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_main_queries_use_indexes(self):
+        user = self.users[1]
+        today = timezone.localdate()
+
+        # index / study_tracking: bir günün kayıtları
+        self.assertUsesIndex(
+            StudySession.objects.filter(user=user, date=today).order_by('-created_at'),
+            'session_user_date_idx',
+        )
+        # statistics: en uzun çalışma seansı
+        self.assertUsesIndex(
+            StudySession.objects.filter(user=user).order_by('-duration'),
+            'session_user_duration_idx',
+        )
+        # todo_list: varsayılan sıralama
+        self.assertUsesIndex(
+            TodoItem.objects.filter(user=user).order_by('-is_important', '-important_marked_at', 'completed', '-created_at'),
+            'todo_user_order_idx',
+        )
+        # todo_list: bekleyenler filtresi
+        self.assertUsesIndex(
+            TodoItem.objects.filter(user=user, completed=False).order_by('-is_important', '-important_marked_at', '-created_at'),
+            'todo_user_pending_idx',
+        )
+        # todo_list: tamamlananlar filtresi
+        self.assertUsesIndex(
+            TodoItem.objects.filter(user=user, completed=True).order_by('-is_important', '-important_marked_at', '-created_at'),
+            'todo_user_completed_idx',
+        )
+        # calendar_view: bir ayın etkinlikleri
+        self.assertUsesIndex(
+            CalendarEvent.objects.filter(
+                user=user, date__gte=today.replace(day=1), date__lte=today
+            ).order_by('date', 'created_at'),
+            'event_user_date_idx',
+        )
+        # ders önerileri: kullanım sayıları ve önek araması
+        self.assertUsesIndex(
+            StudySession.objects.filter(user=user).values('subject_ref_id').annotate(uses=Count('id')).order_by('-uses'),
+            'session_user_subject_idx',
+        )
+        # (PostgreSQL'de pattern_ops indeksi, SQLite'ta (user, key) benzersizlik indeksinde aralık)
+        self.assertUsesIndex(
+            Subject.objects.filter(user=user).filter(subjects._prefix_filter('mat')).order_by(),
+            'subject_user_key_prefix_idx' if connection.vendor == 'postgresql' else 'sqlite_autoindex_tracker_subject',
+        )
+
+
+class DashboardCacheTests(TrackerTestCase):
+    """Dashboard aggregate önbelleğinin yazma anında geçersiz kılınması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.today = timezone.localdate()
+
+    def test_cached_summary_is_invalidated_on_writes(self):
+        self.assertEqual(cache.dashboard_summary(self.user, self.today)['today_total_duration'], 0)
+        # Sadece önbellek sürümü okunur
+        with CaptureQueriesContext(connection) as ctx:
+            cache.dashboard_summary(self.user, self.today)
+        self.assertTrue(all('tracker_cacheversion' in q['sql'] for q in ctx.captured_queries))
+
+        session = StudySession.objects.create(user=self.user, subject='Fizik', duration=75, date=self.today)
+        summary = cache.dashboard_summary(self.user, self.today)
+        self.assertEqual((summary['today_total_duration'], summary['streak']), (75, 1))
+
+        todo = TodoItem.objects.create(user=self.user, title='Ödev')
+        self.assertEqual(cache.dashboard_summary(self.user, self.today)['pending_todos_count'], 1)
+        todo.completed = True
+        todo.save()
+        self.assertEqual(cache.dashboard_summary(self.user, self.today)['pending_todos_count'], 0)
+
+        session.delete()
+        self.assertEqual(cache.dashboard_summary(self.user, self.today)['streak'], 0)
+
+    @contextmanager
+    def process(self, backend, local):
+        """Ayrı bir süreci taklit eder: kendi Django cache'i ve süreç içi LRU'su."""
+        saved = cache.cache, cache.local_cache
+        cache.cache, cache.local_cache = backend, local
+        try:
+            yield
+        finally:
+            cache.cache, cache.local_cache = saved
+
+    def test_invalidation_reaches_other_processes(self):
+        first = (LocMemCache('tracker-test-first', {}), cache.LocalLRUCache(16))
+        second = (LocMemCache('tracker-test-second', {}), cache.LocalLRUCache(16))
+        for backend, local in (first, second):
+            with self.process(backend, local):
+                self.assertEqual(cache.dashboard_summary(self.user, self.today)['today_total_duration'], 0)
+
+        with self.process(*first):
+            StudySession.objects.create(user=self.user, subject='Fizik', duration=75, date=self.today)
+        # İkinci süreç kendi önbelleğindeki eski değeri kullanmamalı
+        with self.process(*second):
+            summary = cache.dashboard_summary(self.user, self.today)
+        self.assertEqual((summary['today_total_duration'], summary['streak']), (75, 1))
+
+    def test_values_are_keyed_by_local_day(self):
+        StudySession.objects.create(user=self.user, subject='Fizik', duration=75, date=self.today)
+        self.assertEqual(cache.dashboard_summary(self.user, self.today)['streak'], 1)
+        # Gece yarısından sonra yeni gün için değerler yeniden hesaplanmalı
+        tomorrow = self.today + timedelta(days=1)
+        summary = cache.dashboard_summary(self.user, tomorrow)
+        self.assertEqual((summary['today_total_duration'], summary['streak']), (0, 0))
+
+    def test_index_uses_cached_summary(self):
+        self.client.force_login(self.user)
+        url = reverse('tracker:index')
+        self.client.get(url)
+        # Oturum + kullanıcı + önbellek sürümü + bugünün kayıtları; aggregate değerler önbellekten
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.context['streak'], 0)
+
+
+class KeysetPaginationTests(TrackerTestCase):
+    """Keyset sayfalamanın tüm sıralamalarda kayıt atlamadan/tekrarlamadan ilerlemesi."""
+
+    ORDERINGS = {
+        'date_desc': ('-is_important', '-important_marked_at', 'completed', '-created_at'),
+        'date_asc': ('-is_important', '-important_marked_at', 'completed', 'created_at'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ali', password='parola12345')
+        now = timezone.now()
+        todos = TodoItem.objects.bulk_create([
+            TodoItem(user=cls.user, title=f'Görev {i}', completed=i % 3 == 0) for i in range(47)
+        ])
+        for i, todo in enumerate(todos):
+            # Aynı created_at değerine sahip kayıtlar da olsun (eşitlikler pk ile kırılmalı)
+            fields = {'created_at': now - timedelta(minutes=i // 2)}
+            if i % 5 == 0:
+                fields.update(is_important=True, important_marked_at=now - timedelta(hours=i % 4))
+            TodoItem.objects.filter(pk=todo.pk).update(**fields)
+
+    def walk(self, queryset, per_page=10):
+        pages = []
+        page = keyset_page(queryset, per_page)
+        pages.append([t.pk for t in page])
+        while page.has_next():
+            with self.assertNumQueries(1):
+                page = keyset_page(queryset, per_page, after=page.next_cursor)
+            pages.append([t.pk for t in page])
+        return pages, page
+
+    def test_forward_and_backward_traversal(self):
+        for name, ordering in self.ORDERINGS.items():
+            with self.subTest(ordering=name):
+                queryset = TodoItem.objects.filter(user=self.user).order_by(*ordering)
+                last_field_desc = ordering[-1].startswith('-')
+                expected = list(queryset.order_by(*ordering, '-id' if last_field_desc else 'id').values_list('pk', flat=True))
+
+                pages, last_page = self.walk(queryset)
+                self.assertEqual([pk for p in pages for pk in p], expected)
+                self.assertEqual(len(pages), 5)
+
+                # Geriye doğru da aynı sayfalar elde edilmeli
+                page = last_page
+                backwards = [[t.pk for t in page]]
+                while page.has_previous():
+                    page = keyset_page(queryset, 10, before=page.previous_cursor)
+                    backwards.append([t.pk for t in page])
+                self.assertEqual(backwards[::-1], pages)
+
+    def test_filtered_and_last_page(self):
+        queryset = TodoItem.objects.filter(user=self.user, completed=False).order_by(
+            '-is_important', '-important_marked_at', '-created_at'
+        )
+        pages, _ = self.walk(queryset, per_page=7)
+        flat = [pk for p in pages for pk in p]
+        self.assertEqual(len(flat), queryset.count())
+        self.assertEqual([t.pk for t in keyset_page(queryset, 7, last=True)], flat[-7:])
+
+    def test_invalid_cursor(self):
+        queryset = TodoItem.objects.filter(user=self.user).order_by('-created_at')
+        with self.assertRaises(InvalidCursor):
+            keyset_page(queryset, 10, after='bozuk')
+
+    def test_todo_list_view_keyset_mode(self):
+        self.client.force_login(self.user)
+        url = reverse('tracker:todo_list')
+        response = self.client.get(url)
+        self.assertEqual(response.context['pagination_mode'], 'keyset')
+        self.assertTrue(response.context['todos'].has_next())
+        cursor = response.context['todos'].next_cursor
+        response = self.client.get(url, {'after': cursor})
+        self.assertEqual(len(response.context['todos']), 10)
+        # Görev işlemlerinden sonra aynı cursor'a geri dönülmeli
+        todo = response.context['todos'].object_list[0]
+        response = self.client.post(f'{url}?after={cursor}&filter=date_desc', {'toggle_todo': '1', 'todo_id': todo.pk})
+        self.assertRedirects(response, f'{url}?filter=date_desc&after={cursor}', fetch_redirect_response=False)
+        # Sayfa numaralı mod hâlâ kullanılabilir
+        response = self.client.get(url, {'page': 5})
+        self.assertEqual(response.context['pagination_mode'], 'page')
+        self.assertEqual(response.context['total_pages'], 5)
+
+
+class TodoCountsTests(TrackerTestCase):
+    """Görev sayaçlarının tek sorguda ve filtreden bağımsız hesaplanması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        TodoItem.objects.bulk_create([
+            TodoItem(user=self.user, title=f'Görev {i}', completed=i < 4, is_important=i == 9)
+            for i in range(10)
+        ])
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            counts = stats.todo_counts(self.user)
+        self.assertEqual(counts, {'total': 10, 'completed': 4, 'pending': 6, 'important': 1})
+
+    def test_todo_list_counts_do_not_depend_on_filter(self):
+        self.client.force_login(self.user)
+        for filter_type in ('date_desc', 'pending', 'completed'):
+            response = self.client.get(reverse('tracker:todo_list'), {'filter': filter_type})
+            self.assertEqual(
+                (response.context['total_todos'], response.context['completed_todos'], response.context['pending_todos']),
+                (10, 4, 6),
+            )
+
+
+class TodoBulkActionTests(TrackerTestCase):
+    """Toplu görev işlemlerinin tek sorguda ve sadece kullanıcının görevlerine uygulanması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.other = User.objects.create_user('veli', password='parola12345')
+        self.todos = [TodoItem.objects.create(user=self.user, title=f'Görev {i}') for i in range(5)]
+        self.foreign = TodoItem.objects.create(user=self.other, title='Başkasının görevi')
+        self.client.force_login(self.user)
+        self.url = reverse('tracker:todo_bulk_action')
+
+    def post(self, action, ids):
+        return self.client.post(self.url, {'action': action, 'ids': ','.join(str(i) for i in ids)})
+
+    def test_complete_star_and_delete(self):
+        ids = [t.pk for t in self.todos[:3]] + [self.foreign.pk]
+
+        response = self.post('star', ids)
+        self.assertEqual(response.json()['affected'], 3)
+        self.assertEqual(TodoItem.objects.filter(user=self.user, is_important=True).count(), 3)
+        self.assertIsNone(TodoItem.objects.get(pk=self.foreign.pk).important_marked_at)
+
+        response = self.post('complete', ids)
+        data = response.json()
+        self.assertEqual(data['affected'], 3)
+        self.assertEqual(data['counts'], {'total': 5, 'completed': 3, 'pending': 2, 'important': 0})
+        self.assertFalse(TodoItem.objects.get(pk=self.foreign.pk).completed)
+
+        response = self.post('delete', ids)
+        self.assertEqual(response.json()['counts']['total'], 2)
+        self.assertTrue(TodoItem.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_update_runs_single_write_query(self):
+        ids = [t.pk for t in self.todos]
+        # Oturum + kullanıcı + UPDATE + önbellek sürümünün yenilenmesi + sayaç sorgusu
+        with self.assertNumQueries(5):
+            self.post('complete', ids)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.post('complete', []).status_code, 400)
+        self.assertEqual(self.post('uçur', [self.todos[0].pk]).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'action': 'star', 'ids': 'abc'}).status_code, 400)
+
+
+class TodoToggleTests(TrackerTestCase):
+    """Tek görev için AJAX tamamla/önemli uç noktaları."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.other = User.objects.create_user('veli', password='parola12345')
+        self.todo = TodoItem.objects.create(user=self.user, title='Görev')
+        self.client.force_login(self.user)
+
+    def test_toggle_important_then_complete(self):
+        url = reverse('tracker:todo_toggle_important', args=[self.todo.pk])
+        data = self.client.post(url).json()
+        self.assertTrue(data['ok'])
+        self.assertTrue(data['is_important'])
+        self.assertIsNotNone(data['important_marked_at'])
+        self.assertEqual(data['counts']['important'], 1)
+
+        data = self.client.post(reverse('tracker:todo_toggle', args=[self.todo.pk])).json()
+        self.assertTrue(data['completed'])
+        # Tamamlanan görevin önemli işareti kaldırılır
+        self.assertFalse(data['is_important'])
+        self.assertEqual(data['counts'], {'total': 1, 'completed': 1, 'pending': 0, 'important': 0})
+        self.todo.refresh_from_db()
+        self.assertTrue(self.todo.completed)
+        self.assertIsNone(self.todo.important_marked_at)
+
+    def test_toggle_writes_only_changed_columns(self):
+        url = reverse('tracker:todo_toggle', args=[self.todo.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "tracker_todoitem"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"title"', updates[0])
+
+    def test_other_users_todo_and_get(self):
+        foreign = TodoItem.objects.create(user=self.other, title='Başkasının görevi')
+        self.assertEqual(self.client.post(reverse('tracker:todo_toggle', args=[foreign.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('tracker:todo_toggle', args=[self.todo.pk])).status_code, 400)
+        foreign.refresh_from_db()
+        self.assertFalse(foreign.completed)
+
+
+class CalendarEventsApiTests(TrackerTestCase):
+    """Takvim etkinliklerinin tarih aralığı / çoklu ay olarak tek sorguda getirilmesi."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        other = User.objects.create_user('veli', password='parola12345')
+        for day in ('2025-01-31', '2025-02-01', '2025-03-15', '2025-04-01'):
+            CalendarEvent.objects.create(user=self.user, title=f'Etkinlik {day}', date=day, color='#667eea')
+        CalendarEvent.objects.create(user=other, title='Başkası', date='2025-02-01')
+        self.client.force_login(self.user)
+        self.url = reverse('tracker:calendar_events')
+
+    def test_months_range(self):
+        # Oturum + kullanıcı + etkinlikler + günlük çalışma özetleri + önbellek sürümü + günlük hedef
+        with self.assertNumQueries(6):
+            data = self.client.get(self.url, {'year': 2025, 'month': 2, 'months': 2}).json()
+        self.assertEqual((data['start'], data['end']), ('2025-02-01', '2025-03-31'))
+        self.assertEqual(sorted(data['events']), ['2025-02-01', '2025-03-15'])
+        event = data['events']['2025-02-01'][0]
+        self.assertEqual(event['title'], 'Etkinlik 2025-02-01')
+        # Eski renkler pastel karşılığıyla gösterilir
+        self.assertEqual(event['color_display'], '#c9a0ff')
+
+    def test_date_range_and_year_wrap(self):
+        data = self.client.get(self.url, {'start': '2025-01-31', 'end': '2025-02-01'}).json()
+        self.assertEqual(sorted(data['events']), ['2025-01-31', '2025-02-01'])
+        data = self.client.get(self.url, {'year': 2024, 'month': 12, 'months': 3}).json()
+        self.assertEqual(data['end'], '2025-02-28')
+
+    def test_invalid_ranges(self):
+        for params in (
+            {'start': '2025-02-01'},
+            {'start': '2025-03-01', 'end': '2025-02-01'},
+            {'start': '2024-01-01', 'end': '2025-12-31'},
+            {'year': 2025, 'month': 13},
+            {'year': 2025, 'month': 1, 'months': 0},
+            {'year': 'abc', 'month': 1},
+        ):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+
+class CalendarLayoutTests(TestCase):
+    """Önbelleğe alınan ay ızgarası ve renk tablosu."""
+
+    def test_month_layout(self):
+        weeks = _month_layout(2025, 6)  # 1 Haziran 2025 Pazar
+        self.assertEqual(len(weeks), 6)
+        self.assertTrue(all(len(week) == 7 for week in weeks))
+        self.assertEqual(weeks[0][:6], (None,) * 6)
+        self.assertEqual(weeks[0][6], (date(2025, 6, 1), '2025-06-01'))
+        days = [cell[0] for week in weeks for cell in week if cell]
+        self.assertEqual(days, [date(2025, 6, d) for d in range(1, 31)])
+        self.assertIs(_month_layout(2025, 6), weeks)
+
+    def test_color_table_covers_choices_and_legacy_colors(self):
+        for color, _ in CalendarEvent.COLOR_CHOICES:
+            self.assertEqual(CALENDAR_COLOR_TABLE[color], (color, _calendar_text_color(color)))
+        for legacy, display in CALENDAR_DISPLAY_COLOR_MAP.items():
+            self.assertEqual(CALENDAR_COLOR_TABLE[legacy], (display, _calendar_text_color(display)))
+
+
+class CalendarStudyOverlayTests(TrackerTestCase):
+    """Takvimde günlük çalışma dakikalarının tek sorguyla gösterilmesi."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+        self.today = timezone.localdate()
+        add_sessions(self.user, 1, duration=90, start=self.today)
+        StudySession.objects.create(user=self.user, subject='Fizik', duration=20, date=self.today.replace(day=1) - timedelta(days=1))
+
+    def test_calendar_view_shows_study_minutes(self):
+        # Oturum + kullanıcı + etkinlikler + günlük özetler + önbellek sürümü + günlük hedef
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('tracker:calendar'))
+        cells = {
+            cell['date_iso']: cell
+            for week in response.context['months_data'][0]['weeks'] for cell in week if cell
+        }
+        today_cell = cells[self.today.isoformat()]
+        self.assertEqual(today_cell['study_minutes'], 90)
+        self.assertTrue(today_cell['streak_day'])
+        self.assertEqual(sum(cell['study_minutes'] for cell in cells.values()), 90)
+
+    def test_events_api_includes_study(self):
+        previous = self.today.replace(day=1) - timedelta(days=1)
+        data = self.client.get(reverse('tracker:calendar_events'), {
+            'year': previous.year, 'month': previous.month, 'months': 2,
+        }).json()
+        self.assertEqual(data['study'], {previous.isoformat(): 20, self.today.isoformat(): 90})
+        self.assertEqual(data['streak_minutes'], streaks.DAILY_STREAK_MINUTES)
+
+
+class ExportTests(TrackerTestCase):
+    """CSV / JSON dışa aktarımının akış halinde ve tarih filtreli çalışması."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        other = User.objects.create_user('veli', password='parola12345')
+        self.today = timezone.localdate()
+        add_sessions(self.user, 3, duration=45)
+        add_sessions(other, 2)
+        TodoItem.objects.create(user=self.user, title='Ödev, "zor" olan')
+        CalendarEvent.objects.create(user=self.user, title='Sınav', date=self.today)
+        self.client.force_login(self.user)
+        self.url = reverse('tracker:export_data')
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_with_date_filter(self):
+        response = self.client.get(self.url, {'start': (self.today - timedelta(days=1)).isoformat()})
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.reader(StringIO(self.read(response))))
+        self.assertEqual(rows[0], list(export.export_fields('sessions')))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row[1] for row in rows[1:]}, {self.today.isoformat(), (self.today - timedelta(days=1)).isoformat()})
+
+        rows = list(csv.reader(StringIO(self.read(self.client.get(self.url, {'type': 'todos'})))))
+        self.assertEqual(rows[1][1], 'Ödev, "zor" olan')
+
+    def test_json_export_all(self):
+        data = json.loads(self.read(self.client.get(self.url, {'type': 'all', 'format': 'json'})))
+        self.assertEqual(len(data['sessions']), 3)
+        self.assertEqual(data['sessions'][0]['duration'], 45)
+        self.assertEqual(data['todos'][0]['completed'], False)
+        self.assertEqual(data['events'][0]['title'], 'Sınav')
+
+    def test_invalid_parameters(self):
+        for params in ({'format': 'xml'}, {'type': 'all'}, {'type': 'users'}, {'start': '01.01.2025'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('export_data', '--user', 'ali', '--type', 'all', '--format', 'json', '--chunk-size', '2', stdout=out)
+        data = json.loads(out.getvalue())
+        self.assertEqual([len(data[key]) for key in ('sessions', 'todos', 'events')], [3, 1, 1])
+
+
+class ImportTests(TrackerTestCase):
+    """CSV'den toplu içe aktarma, satır hataları ve türetilmiş verilerin güncellenmesi."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+
+    def csv_lines(self, rows, header='date,subject,duration,note'):
+        return StringIO('\n'.join([header] + rows) + '\n')
+
+    def test_bulk_import_updates_rollups_once(self):
+        today = timezone.localdate()
+        rows = [f'{(today - timedelta(days=i % 10)).isoformat()},Matematik,30,' for i in range(250)]
+        cache.dashboard_summary(self.user, today)
+        with CaptureQueriesContext(connection) as ctx:
+            result = importer.import_sessions(self.user, self.csv_lines(rows), batch_size=100)
+        statements = [q['sql'].split()[0] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        # Dersin bir kez eşlenmesi (oku + ekle + oku) + 3 parça INSERT
+        # + özet tablonun bir kez yeniden oluşturulması (sil + oku + ekle)
+        # + streak durumunun yeniden hesaplanması (günlük hedefler + mevcut durum + özet satırları + ekle)
+        # + önbellek sürümünün yenilenmesi
+        self.assertEqual(
+            statements,
+            ['SELECT', 'INSERT', 'SELECT'] + ['INSERT'] * 3 + ['DELETE', 'SELECT', 'INSERT']
+            + ['SELECT', 'SELECT', 'SELECT', 'INSERT'] + ['UPDATE'],
+        )
+        self.assertEqual((result.created, result.error_count), (250, 0))
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 250)
+        self.assertEqual(DailyStudyTotal.objects.get(user=self.user, date=today).minutes, 750)
+        self.assertEqual(cache.dashboard_summary(self.user, today)['today_total_duration'], 750)
+
+    def test_invalid_rows_roll_back_or_are_skipped(self):
+        rows = ['2025-01-01,Fizik,45,not', '01.02.2025,Kimya,30,', '2025-13-01,Fizik,45,', '2025-01-02,,10,', '2025-01-03,Fizik,abc,']
+        result = importer.import_sessions(self.user, self.csv_lines(rows))
+        self.assertTrue(result.rolled_back)
+        self.assertEqual([line for line, _ in result.errors], [4, 5, 6])
+        self.assertFalse(StudySession.objects.exists())
+
+        result = importer.import_sessions(self.user, self.csv_lines(rows), skip_invalid=True)
+        self.assertEqual((result.created, result.error_count), (2, 3))
+        self.assertEqual(
+            sorted(StudySession.objects.values_list('date', flat=True)),
+            [date(2025, 1, 1), date(2025, 2, 1)],
+        )
+
+    def test_missing_columns(self):
+        with self.assertRaises(importer.InvalidImportFile):
+            importer.import_sessions(self.user, self.csv_lines([], header='subject,duration'))
+
+    def test_export_round_trip_via_upload(self):
+        add_sessions(self.user, 2, duration=40)
+        exported = b''.join(self.client.get(reverse('tracker:export_data')).streaming_content)
+        upload = SimpleUploadedFile('kayitlar.csv', exported, content_type='text/csv')
+        response = self.client.post(reverse('tracker:import_data'), {'file': upload})
+        self.assertRedirects(response, reverse('tracker:statistics'))
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 4)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write('date,subject,duration\n2025-03-01,Tarih,25\n')
+        out = StringIO()
+        call_command('import_sessions', f.name, '--user', 'ali', stdout=out)
+        self.assertIn('1 çalışma kaydı eklendi', out.getvalue())
+        self.assertEqual(DailyStudyTotal.objects.get(user=self.user).minutes, 25)
+
+
+class StudyTimerTests(TrackerTestCase):
+    """Sunucu tarafı süre tutucu / geri sayım uç noktaları."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='pw')
+        self.client.force_login(self.user)
+
+    def action(self, mode, action, **data):
+        return self.client.post(reverse('tracker:study_timer_action', args=[mode, action]), data)
+
+    def test_start_pause_resume_stop_creates_session(self):
+        self.assertTrue(self.action('stopwatch', 'start').json()['timers']['stopwatch']['running'])
+        # Sayacın 25 dakika önce başlatıldığını varsay
+        ActiveTimer.objects.filter(user=self.user).update(started_at=timezone.now() - timedelta(minutes=25, seconds=30))
+        state = self.action('stopwatch', 'pause').json()['timers']['stopwatch']
+        self.assertFalse(state['running'])
+        self.assertEqual(state['accumulated_seconds'] // 60, 25)
+        self.assertEqual(self.action('stopwatch', 'resume').status_code, 200)
+
+        data = self.action('stopwatch', 'stop', subject='Fizik', note='').json()
+        self.assertTrue(data['ok'])
+        self.assertIsNone(data['timers']['stopwatch'])
+        session = StudySession.objects.get(pk=data['session_id'])
+        self.assertEqual((session.subject, session.duration, session.date), ('Fizik', 25, timezone.localdate()))
+        self.assertFalse(ActiveTimer.objects.exists())
+        self.assertEqual(DailyStudyTotal.objects.get(user=self.user).minutes, 25)
+
+    def test_study_page_embeds_timer_state(self):
+        timers.start(self.user, 'countdown', target_seconds=600)
+        response = self.client.get(reverse('tracker:study'))
+        self.assertContains(response, 'id="timer-state"')
+        self.assertEqual(response.context['timer_state']['timers']['countdown']['target_seconds'], 600)
+
+    def test_invalid_transitions_conflict(self):
+        self.action('stopwatch', 'start')
+        response = self.action('stopwatch', 'start')
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.json()['timers']['stopwatch']['running'])
+        self.assertEqual(self.action('stopwatch', 'resume').status_code, 409)
+        self.assertEqual(self.action('countdown', 'pause').status_code, 409)
+        self.assertEqual(self.client.get(reverse('tracker:study_timer_action', args=['stopwatch', 'pause'])).status_code, 400)
+        self.assertEqual(self.action('other', 'start').status_code, 400)
+
+    def test_stop_requires_one_minute_and_valid_form(self):
+        self.action('stopwatch', 'start')
+        response = self.action('stopwatch', 'stop', subject='Fizik')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('duration', response.json()['errors'])
+
+        ActiveTimer.objects.update(started_at=None, accumulated_seconds=600)
+        response = self.action('stopwatch', 'stop', subject='')
+        self.assertIn('subject', response.json()['errors'])
+        # Geçersiz formda sayaç silinmez
+        self.assertTrue(ActiveTimer.objects.exists())
+        self.assertFalse(StudySession.objects.exists())
+
+    def test_countdown_target_and_finish(self):
+        self.assertEqual(self.action('countdown', 'start', target_seconds=30).status_code, 409)
+        self.assertEqual(self.action('countdown', 'start', target_seconds=timers.COUNTDOWN_MAX_SECONDS + 60).status_code, 409)
+        self.assertEqual(self.action('countdown', 'start', target_seconds='abc').status_code, 400)
+
+        self.action('countdown', 'start', target_seconds=1800)
+        ActiveTimer.objects.update(started_at=timezone.now() - timedelta(hours=2))
+        state = self.client.get(reverse('tracker:study_timer')).json()['timers']['countdown']
+        self.assertTrue(state['finished'])
+        self.assertEqual((state['elapsed_seconds'], state['remaining_seconds']), (1800, 0))
+        self.assertEqual(self.action('countdown', 'resume').status_code, 409)
+        # Süre hedefle sınırlı: 2 saat değil 30 dakika kaydedilir
+        self.assertEqual(self.action('countdown', 'stop', subject='Kimya').json()['duration'], 30)
+
+    def test_timers_are_per_user(self):
+        other = User.objects.create_user('ayse', password='pw')
+        timers.start(other, 'stopwatch')
+        self.assertIsNone(self.client.get(reverse('tracker:study_timer')).json()['timers']['stopwatch'])
+        self.assertEqual(self.action('stopwatch', 'start').status_code, 200)
+        self.assertEqual(self.action('stopwatch', 'reset').status_code, 200)
+        self.assertEqual(ActiveTimer.objects.get().user, other)
+
+
+class ApiTests(TrackerTestCase):
+    """Salt okunur JSON API ve ETag / Last-Modified ile koşullu GET."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.client.force_login(self.user)
+
+    def tracker_queries(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, headers=headers)
+        return response, [q['sql'] for q in ctx.captured_queries if 'tracker_' in q['sql']]
+
+    def test_sessions_pagination_and_filters(self):
+        add_sessions(self.user, 5, duration=30)
+        url = reverse('tracker:api_sessions')
+        data = self.client.get(url, {'limit': 2}).json()
+        self.assertEqual([row['date'] for row in data['results']],
+                         [(timezone.localdate() - timedelta(days=i)).isoformat() for i in range(2)])
+        self.assertEqual(data['results'][0]['duration'], 30)
+        dates = [row['date'] for row in data['results']]
+        while data['next_cursor']:
+            data = self.client.get(url, {'limit': 2, 'cursor': data['next_cursor']}).json()
+            dates += [row['date'] for row in data['results']]
+        self.assertEqual(len(set(dates)), 5)
+
+        start = (timezone.localdate() - timedelta(days=1)).isoformat()
+        self.assertEqual(len(self.client.get(url, {'start': start}).json()['results']), 2)
+        self.assertEqual(self.client.get(url, {'start': 'dün'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'cursor': 'bozuk'}).status_code, 400)
+
+    def test_list_conditional_get(self):
+        add_sessions(self.user, 3)
+        url = reverse('tracker:api_sessions')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # Değişmeyen veri: sadece doğrulayıcı sorgusu çalışır, liste okunmaz
+        response, queries = self.tracker_queries(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        response = self.client.get(url, headers={'if-modified-since': response['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+
+        # Silme updated_at'i ilerletmez ama ETag değişir
+        StudySession.objects.filter(user=self.user).first().delete()
+        response = self.client.get(url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_event_updates_change_etag(self):
+        event = CalendarEvent.objects.create(user=self.user, date=date(2025, 5, 1), title='Sınav')
+        url = reverse('tracker:api_events')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'if-none-match': etag}).status_code, 304)
+        self.client.post(reverse('tracker:calendar_edit_event', args=[event.id]), {'title': 'Final', 'color': event.color})
+        response = self.client.get(url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['title'], 'Final')
+
+    def test_computed_endpoints_only_read_version_when_unchanged(self):
+        add_sessions(self.user, 3, duration=90)
+        TodoItem.objects.create(user=self.user, title='Ödev')
+        url = reverse('tracker:api_stats')
+        response = self.client.get(url)
+        data = response.json()
+        self.assertEqual(data['study']['total_minutes'], 270)
+        self.assertEqual((data['streak']['current'], data['todos']['pending']), (3, 1))
+
+        response, queries = self.tracker_queries(url, if_none_match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('tracker_cacheversion', queries[0])
+
+        goals_url = reverse('tracker:api_goals')
+        etag = self.client.get(goals_url)['ETag']
+        self.assertEqual(self.client.get(goals_url).json()['weekly'], {'goal_minutes': 420, 'minutes': 270, 'progress_percent': 64})
+        UserStudyGoal.objects.create(user=self.user, weekly_goal_minutes=270)
+        response = self.client.get(goals_url, headers={'if-none-match': etag})
+        self.assertEqual(response.json()['weekly']['progress_percent'], 100)
+
+    def test_todo_status_filter(self):
+        TodoItem.objects.create(user=self.user, title='Bitti', completed=True)
+        TodoItem.objects.create(user=self.user, title='Bekliyor')
+        url = reverse('tracker:api_todos')
+        self.assertEqual([t['title'] for t in self.client.get(url, {'status': 'pending'}).json()['results']], ['Bekliyor'])
+        self.assertEqual(len(self.client.get(url).json()['results']), 2)
+        self.assertEqual(self.client.get(url, {'status': 'x'}).status_code, 400)
+
+    def test_auth_and_methods(self):
+        url = reverse('tracker:api_stats')
+        self.assertEqual(self.client.post(url).status_code, 405)
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+
+class RequestTimingTests(TrackerTestCase):
+    """İstek süresi / sorgu ölçüm middleware'i ve yönetici raporu."""
+
+    def setUp(self):
+        super().setUp()
+        instrumentation.registry.clear()
+        self.user = User.objects.create_user('ali', password='parola12345')
+        self.admin = User.objects.create_user('yonetici', password='parola12345', is_staff=True)
+
+    def test_disabled_by_default(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('tracker:statistics'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(instrumentation.registry.snapshot(), [])
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_records_views_and_sends_header_to_staff(self):
+        add_sessions(self.user, 3)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('tracker:statistics'))
+        self.assertNotIn('Server-Timing', response)
+        self.client.get(reverse('tracker:statistics'))
+
+        rows = {row['view']: row for row in instrumentation.registry.snapshot()}
+        stats_row = rows['tracker:statistics']
+        self.assertEqual(stats_row['count'], 2)
+        self.assertGreater(stats_row['avg_queries'], 0)
+        self.assertEqual(sum(bucket['count'] for bucket in stats_row['histogram']), 2)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('tracker:index'))
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", app;dur=')
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_report_is_staff_only(self):
+        url = reverse('request_timing')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.admin)
+        self.client.get(reverse('tracker:index'))
+        response = self.client.get(url)
+        self.assertContains(response, 'tracker:index')
+        self.client.post(url, {'clear': '1'})
+        self.assertNotIn('tracker:index', [row['view'] for row in instrumentation.registry.snapshot()])
+
+
+class BenchmarkTests(TrackerTestCase):
+    """Sentetik veri üretimi ve sayfa ölçüm komutları."""
+
+    def test_seed_is_deterministic_and_consistent(self):
+        counts = benchmark.seed(users=2, days=120, prefix='b_', seed_value=7)
+        self.assertEqual(counts['users'], 2)
+        self.assertEqual(StudySession.objects.count(), counts['sessions'])
+        self.assertEqual(TodoItem.objects.count(), counts['todos'])
+        self.assertEqual(UserStudyGoal.objects.count(), 2)
+        # Zaman damgaları geçmişe yayılır, özet tablo ham kayıtlarla tutarlıdır
+        self.assertLess(StudySession.objects.order_by('created_at').first().created_at, timezone.now() - timedelta(days=30))
+        for day, created_at in StudySession.objects.values_list('date', 'created_at'):
+            self.assertEqual(timezone.localtime(created_at).date(), day)
+        user = User.objects.get(username='b_0')
+        self.assertEqual(
+            sum(DailyStudyTotal.objects.filter(user=user).values_list('minutes', flat=True)),
+            sum(StudySession.objects.filter(user=user).values_list('duration', flat=True)),
+        )
+        self.assertEqual(StudySession._meta.get_field('created_at').auto_now_add, True)
+
+        sessions = list(StudySession.objects.order_by('user__username', 'date', 'created_at').values_list('date', 'duration'))
+        User.objects.filter(username__startswith='b_').delete()
+        benchmark.seed(users=2, days=120, prefix='b_', seed_value=7)
+        self.assertEqual(
+            list(StudySession.objects.order_by('user__username', 'date', 'created_at').values_list('date', 'duration')),
+            sessions,
+        )
+
+    def test_benchmark_command_writes_and_compares_results(self):
+        call_command('seed_benchmark_data', '--users', '1', '--days', '30', stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            path = f.name
+        call_command('benchmark_views', '--repeat', '2', '--output', path, stderr=StringIO())
+        with open(path, encoding='utf-8') as f:
+            result = json.load(f)
+        self.assertEqual(set(result['results']), {name for name, _, _ in benchmark.BENCHMARK_VIEWS})
+        self.assertEqual(result['results']['statistics']['runs'], 2)
+
+        err = StringIO()
+        call_command('benchmark_views', '--repeat', '1', '--view', 'index', '--compare', path, stdout=StringIO(), stderr=err)
+        self.assertIn('index            queries', err.getvalue())
+
+
+class ConnectionBenchmarkTests(TransactionTestCase):
+    """Bağlantı yeniden kullanım ölçümü (transaction dışında çalışmalı)."""
+
+    def test_measures_modes_and_restores_settings(self):
+        user = User.objects.create_user('bench_0', password='parola12345')
+        max_age = connection.settings_dict.get('CONN_MAX_AGE')
+        result = benchmark.measure_connection_reuse(user, requests=5)
+        self.assertEqual(set(result['results']), {'per_request', 'persistent'})
+        self.assertEqual(result['results']['per_request']['saved_ms_per_request'], 0)
+        self.assertEqual(connection.settings_dict.get('CONN_MAX_AGE'), max_age)
+        self.assertFalse(CalendarEvent.objects.exists())
+
+    def test_refuses_to_run_inside_transaction(self):
+        user = User.objects.create_user('bench_0', password='parola12345')
+        with transaction.atomic(), self.assertRaises(RuntimeError):
+            benchmark.measure_connection_reuse(user, requests=1)
@@ -0,0 +1,140 @@
+"""
+Ders Çalış sayfasının sunucu tarafı süre tutucu / geri sayım işlemleri.
+
+Her işlem kullanıcının ilgili mod için ActiveTimer satırını
+`select_for_update` ile kilitleyip tek transaction içinde günceller. Durdurma
+işlemi StudySession kaydını oluşturur ve sayacı siler; ikisi aynı
+transaction'dadır, yani bir sayaç ya kayda dönüşür ya da hiç değişmez.
+
+İstemci sadece sayacın durumunu (başlatılma zamanı, geçen süre) alır ve
+ekrandaki süreyi bu değerlerden hesaplar; saniyede bir güncellemek yeterlidir.
+"""
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .forms import StudySessionForm
+from .models import ActiveTimer
+
+
+TIMER_MODES = [mode for mode, _ in ActiveTimer.MODE_CHOICES]
+
+# Geri sayımın en uzun süresi (saniye) - sayfadaki saat alanı en fazla 23 saat
+COUNTDOWN_MAX_SECONDS = 24 * 60 * 60
+
+
+class TimerError(ValueError):
+    """Sayacın mevcut durumunda yapılamayan işlem."""
+
+
+def _epoch_ms(value):
+    return int(value.timestamp() * 1000)
+
+
+def serialize_timer(timer, now):
+    """Sayacın istemciye gönderilen durumu."""
+    if timer is None:
+        return None
+    elapsed = timer.elapsed_seconds(now)
+    return {
+        'mode': timer.mode,
+        'running': timer.is_running,
+        'started_at': _epoch_ms(timer.started_at) if timer.started_at else None,
+        'accumulated_seconds': timer.accumulated_seconds,
+        'elapsed_seconds': elapsed,
+        'target_seconds': timer.target_seconds,
+        'remaining_seconds': None if timer.target_seconds is None else timer.target_seconds - elapsed,
+        'finished': timer.is_finished(now),
+    }
+
+
+def timer_state(user, now=None):
+    """Kullanıcının tüm sayaçlarının durumu ve sunucu saati (istemci saat farkı için)."""
+    now = now or timezone.now()
+    timers = {timer.mode: timer for timer in ActiveTimer.objects.filter(user=user)}
+    return {
+        'server_time': _epoch_ms(now),
+        'timers': {mode: serialize_timer(timers.get(mode), now) for mode in TIMER_MODES},
+    }
+
+
+def _locked_timer(user, mode):
+    try:
+        return ActiveTimer.objects.select_for_update().get(user=user, mode=mode)
+    except ActiveTimer.DoesNotExist:
+        raise TimerError('Sayaç bulunamadı')
+
+
+def start(user, mode, target_seconds=None):
+    """Yeni bir sayaç başlatır. Aynı modda sayaç varsa TimerError fırlatılır."""
+    if mode == ActiveTimer.MODE_COUNTDOWN:
+        if not target_seconds or not 60 <= target_seconds <= COUNTDOWN_MAX_SECONDS:
+            raise TimerError('Geri sayım süresi en az 1 dakika, en fazla 24 saat olmalı')
+    else:
+        target_seconds = None
+    try:
+        with transaction.atomic():
+            return ActiveTimer.objects.create(
+                user=user,
+                mode=mode,
+                started_at=timezone.now(),
+                target_seconds=target_seconds,
+            )
+    except IntegrityError:
+        raise TimerError('Bu sayaç zaten başlatılmış')
+
+
+def pause(user, mode):
+    """Çalışan sayacı duraklatır; geçen süre `accumulated_seconds` alanına yazılır."""
+    with transaction.atomic():
+        timer = _locked_timer(user, mode)
+        if not timer.is_running:
+            raise TimerError('Sayaç zaten duraklatılmış')
+        timer.accumulated_seconds = timer.elapsed_seconds(timezone.now())
+        timer.started_at = None
+        timer.save(update_fields=['accumulated_seconds', 'started_at', 'updated_at'])
+        return timer
+
+
+def resume(user, mode):
+    """Duraklatılmış sayacı devam ettirir."""
+    with transaction.atomic():
+        timer = _locked_timer(user, mode)
+        if timer.is_running:
+            raise TimerError('Sayaç zaten çalışıyor')
+        if timer.is_finished(timezone.now()):
+            raise TimerError('Geri sayım tamamlandı')
+        timer.started_at = timezone.now()
+        timer.save(update_fields=['started_at', 'updated_at'])
+        return timer
+
+
+def reset(user, mode):
+    """Sayacı kayıt oluşturmadan siler."""
+    ActiveTimer.objects.filter(user=user, mode=mode).delete()
+
+
+def stop(user, mode, data):
+    """
+    Sayacı durdurur ve geçen süreyle (dakika, aşağı yuvarlanmış) bir çalışma
+    kaydı oluşturur. `data` ders adı, tarih ve notu içerir; süre sunucuda
+    hesaplanır. Kayıt ve sayacın silinmesi tek transaction'dadır.
+    Başarıda (kayıt, None), geçersiz veride (None, hatalar) döner.
+    """
+    with transaction.atomic():
+        timer = _locked_timer(user, mode)
+        minutes = timer.elapsed_seconds(timezone.now()) // 60
+        if minutes < 1:
+            return None, {'duration': ['En az 1 dakika çalışmalısınız.']}
+        form = StudySessionForm({
+            'subject': data.get('subject', ''),
+            'date': data.get('date') or timezone.localdate().isoformat(),
+            'note': data.get('note', ''),
+            'duration': minutes,
+        })
+        if not form.is_valid():
+            return None, form.errors
+        session = form.save(commit=False)
+        session.user = user
+        session.save()
+        timer.delete()
+        return session, None
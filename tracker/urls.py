@@ -3,7 +3,7 @@ Tracker uygulaması için URL yapılandırması.
 """
 from django.urls import path
 from django.views.generic import RedirectView
-from . import views
+from . import api, views
 
 # Uygulama adı (namespace için)
 app_name = 'tracker'
@@ -16,13 +16,29 @@ urlpatterns = [
     path('study-tracking/', views.study_tracking, name='study_tracking'),  # Çalışma Takibi sayfası
     path('study-tracking/edit/<int:session_id>/', views.edit_session, name='edit_session'),  # Kayıt düzenleme
     path('study-tracking/delete/<int:session_id>/', views.delete_session, name='delete_session'),  # Kayıt silme
+    path('study-tracking/subjects/', views.subject_suggestions, name='subject_suggestions'),  # Ders önerileri (JSON)
     path('study/', views.study, name='study'),  # Ders Çalış sayfası
+    path('study/timer/', views.study_timer, name='study_timer'),  # Sayaç durumu (AJAX)
+    path('study/timer/<slug:mode>/<slug:action>/', views.study_timer_action, name='study_timer_action'),  # Sayaç işlemleri (AJAX)
     path('todo/', views.todo_list, name='todo_list'),  # Yapılacaklar listesi sayfası
     path('todo/edit/<int:todo_id>/', views.edit_todo, name='edit_todo'),  # Görev düzenleme
+    path('todo/bulk/', views.todo_bulk_action, name='todo_bulk_action'),  # Toplu görev işlemleri (AJAX)
+    path('todo/<int:todo_id>/toggle/', views.todo_toggle, name='todo_toggle'),  # Tamamlanma durumu (AJAX)
+    path('todo/<int:todo_id>/toggle-important/', views.todo_toggle_important, name='todo_toggle_important'),  # Önemli durumu (AJAX)
     path('statistics/', views.statistics, name='statistics'),  # İstatistikler sayfası
+    path('search/', views.search_view, name='search'),  # Kayıt, görev ve etkinliklerde arama (JSON)
+    path('export/', views.export_data, name='export_data'),  # Verileri CSV / JSON olarak indir
+    path('import/', views.import_data, name='import_data'),  # CSV'den çalışma kayıtlarını içe aktar
     path('calendar/', views.calendar_view, name='calendar'),  # Takvim sayfası
+    path('calendar/events/', views.calendar_events, name='calendar_events'),  # Tarih aralığındaki etkinlikler (JSON)
     path('calendar/add-event/', views.calendar_add_event, name='calendar_add_event'),
     path('calendar/edit-event/<int:event_id>/', views.calendar_edit_event, name='calendar_edit_event'),
     path('calendar/delete-event/<int:event_id>/', views.calendar_delete_event, name='calendar_delete_event'),
+    # Salt okunur JSON API (ETag / koşullu GET destekli)
+    path('api/v1/sessions/', api.sessions, name='api_sessions'),
+    path('api/v1/todos/', api.todos, name='api_todos'),
+    path('api/v1/events/', api.events, name='api_events'),
+    path('api/v1/goals/', api.goals, name='api_goals'),
+    path('api/v1/stats/', api.stats, name='api_stats'),
 ]
 
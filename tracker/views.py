@@ -7,42 +7,27 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse
 from django.utils import timezone
-from django.db.models import Sum, Q
+from django.db import transaction
+from django.db.models import Q
 from django.core.paginator import Paginator
-from datetime import timedelta
+from urllib.parse import urlencode
+from calendar import monthrange
+from functools import lru_cache
+from datetime import date, timedelta
 from .models import StudySession, TodoItem, CalendarEvent, UserStudyGoal
 from .forms import StudySessionForm, TodoForm, StudyGoalForm
+from . import cache, export, importer, rollups, search, stats, streaks, subjects, timers
+from .pagination import InvalidCursor, keyset_page
 
 
 def calculate_streak(user):
     """
     Kullanıcının streak sayısını hesaplar.
-    Üst üste en az 1 saat (60 dakika) çalışılan gün sayısını döndürür.
+    Üst üste en az günlük hedef kadar (varsayılan 60 dakika) çalışılan gün
+    sayısını döndürür. Streak uzunluğundan bağımsız olarak tek sorgu çalıştırır.
     """
-    today = timezone.now().date()
-    streak = 0
-    current_date = today
-    
-    while True:
-        # Bu günün toplam çalışma süresini hesapla
-        day_sessions = StudySession.objects.filter(
-            user=user,
-            date=current_date
-        )
-        day_total_duration = day_sessions.aggregate(
-            total=Sum('duration')
-        )['total'] or 0
-        
-        # Eğer bu gün en az 1 saat (60 dakika) çalışılmışsa streak'e ekle
-        if day_total_duration >= 60:
-            streak += 1
-            # Bir önceki güne geç
-            current_date = current_date - timedelta(days=1)
-        else:
-            # Streak kırıldı, döngüden çık
-            break
-    
-    return streak
+    today = timezone.localdate()
+    return streaks.current_streak(user, today)
 
 def login_view(request):
     """
@@ -108,29 +93,23 @@ def index(request):
     son çalışma kayıtlarını gösterir.
     """
     user = request.user
-    today = timezone.now().date()
+    today = timezone.localdate()
+    
+    # Bugünkü toplam süre, streak ve bekleyen görev sayısı (kullanıcı bazlı önbellekten)
+    summary = cache.dashboard_summary(user, today)
     
     # Bugünkü toplam çalışma süresi (dakika cinsinden)
-    today_sessions = StudySession.objects.filter(
-        user=user,
-        date=today
-    )
-    today_total_duration = today_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    today_total_duration = summary['today_total_duration']
     
     # Tamamlanmamış görev sayısı
-    pending_todos_count = TodoItem.objects.filter(
-        user=user,
-        completed=False
-    ).count()
+    pending_todos_count = summary['pending_todos_count']
     
     # Bugünkü çalışma süresini saat ve dakika formatına çevir
     today_hours = today_total_duration // 60
     today_minutes = today_total_duration % 60
     
-    # Streak bilgisi hesapla
-    streak = calculate_streak(user)
+    # Streak bilgisi
+    streak = summary['streak']
     
     # Bugün çalıştıkların listesi (sadece bugünün kayıtları)
     recent_sessions = StudySession.objects.filter(
@@ -187,10 +166,10 @@ def study_tracking(request):
             selected_date = datetime.strptime(selected_date_str, '%Y-%m-%d').date()
         except (ValueError, TypeError):
             # Geçersiz tarih formatıysa bugünü kullan
-            selected_date = timezone.now().date()
+            selected_date = timezone.localdate()
     else:
         # Tarih parametresi yoksa bugünü kullan
-        selected_date = timezone.now().date()
+        selected_date = timezone.localdate()
     
     # Seçili tarihe ait kayıtları getir (en yeni önce)
     sessions = StudySession.objects.filter(
@@ -199,23 +178,20 @@ def study_tracking(request):
     ).order_by('-created_at')
     
     # Bugünün tarihi
-    today = timezone.now().date()
+    today = timezone.localdate()
+    
+    # Bugünkü toplam süre ve streak (kullanıcı bazlı önbellekten)
+    summary = cache.dashboard_summary(user, today)
     
     # Bugünkü toplam çalışma süresi (dakika cinsinden) - her zaman bugünün değeri gösterilecek
-    today_sessions = StudySession.objects.filter(
-        user=user,
-        date=today
-    )
-    today_total_duration = today_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    today_total_duration = summary['today_total_duration']
     
     # Bugünkü çalışma süresini saat ve dakika formatına çevir
     today_hours = today_total_duration // 60
     today_minutes = today_total_duration % 60
     
-    # Streak bilgisi hesapla (her zaman bugünün streak'i gösterilecek)
-    streak = calculate_streak(user)
+    # Streak bilgisi (her zaman bugünün streak'i gösterilecek)
+    streak = summary['streak']
     
     # Yeni kayıt ekleme formu
     form = None
@@ -225,7 +201,9 @@ def study_tracking(request):
             # Form geçerliyse kaydı oluştur
             session = form.save(commit=False)
             session.user = user  # Kullanıcıyı atama
-            session.save()
+            # Kayıt, günlük özet ve streak durumu birlikte commit edilir
+            with transaction.atomic():
+                session.save()
             messages.success(request, 'Çalışma kaydı başarıyla eklendi!')
             # Kayıt eklendikten sonra o tarihin sayfasına yönlendir
             return redirect(f"{request.path}?date={session.date.strftime('%Y-%m-%d')}")
@@ -277,7 +255,8 @@ def study(request):
             if form.is_valid():
                 session = form.save(commit=False)
                 session.user = user
-                session.save()
+                with transaction.atomic():
+                    session.save()
                 messages.success(request, 'Çalışma kaydı başarıyla eklendi!')
                 return redirect('tracker:study_tracking')
         else:
@@ -288,15 +267,122 @@ def study(request):
         form = StudySessionForm()
         # Varsayılan tarih olarak bugünü ayarla
         from django.utils import timezone
-        form.fields['date'].initial = timezone.now().date()
+        form.fields['date'].initial = timezone.localdate()
     
     context = {
         'form': form,
+        # Sunucudaki sayaç durumu (sayfa açılışında ayrı istek gerekmesin)
+        'timer_state': timers.timer_state(user),
     }
     
     return render(request, 'tracker/study.html', context)
 
 
+@login_required
+def study_timer(request):
+    """Kullanıcının süre tutucu / geri sayım durumunu döndürür. AJAX GET."""
+    from django.http import JsonResponse
+    return JsonResponse({'ok': True, **timers.timer_state(request.user)})
+
+
+@login_required
+def study_timer_action(request, mode, action):
+    """
+    Sayaç işlemleri: start, pause, resume, reset, stop. AJAX POST.
+    Her işlemden sonra sayaçların güncel durumu döner; stop çalışma kaydını oluşturur.
+    """
+    from django.http import JsonResponse
+
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST gerekli'}, status=400)
+    if mode not in timers.TIMER_MODES:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz mod'}, status=400)
+
+    user = request.user
+    extra = {}
+    try:
+        if action == 'start':
+            try:
+                target_seconds = int(request.POST.get('target_seconds') or 0)
+            except ValueError:
+                return JsonResponse({'ok': False, 'error': 'Geçersiz süre'}, status=400)
+            timers.start(user, mode, target_seconds=target_seconds)
+        elif action == 'pause':
+            timers.pause(user, mode)
+        elif action == 'resume':
+            timers.resume(user, mode)
+        elif action == 'reset':
+            timers.reset(user, mode)
+        elif action == 'stop':
+            session, errors = timers.stop(user, mode, request.POST)
+            if errors:
+                return JsonResponse({'ok': False, 'error': 'Lütfen formu doğru şekilde doldurun.', 'errors': errors}, status=400)
+            messages.success(request, 'Çalışma kaydı başarıyla eklendi!')
+            extra = {'session_id': session.id, 'duration': session.duration, 'redirect': reverse('tracker:study_tracking')}
+        else:
+            return JsonResponse({'ok': False, 'error': 'Geçersiz işlem'}, status=400)
+    except timers.TimerError as exc:
+        return JsonResponse({'ok': False, 'error': str(exc), **timers.timer_state(user)}, status=409)
+
+    return JsonResponse({'ok': True, **extra, **timers.timer_state(user)})
+
+
+# Yapılacaklar listesinde sayfa başına gösterilecek görev sayısı
+TODOS_PER_PAGE = 10
+
+
+def _toggle_todo_completed(todo):
+    """
+    Görevin tamamlanma durumunu değiştirir ve sadece değişen sütunları kaydeder.
+    Görev tamamlandıysa önemli işareti kaldırılır.
+    """
+    todo.completed = not todo.completed
+    update_fields = ['completed', 'updated_at']
+    # Eğer görev tamamlandıysa önemli işaretini kaldır
+    if todo.completed and todo.is_important:
+        todo.is_important = False
+        todo.important_marked_at = None
+        update_fields += ['is_important', 'important_marked_at']
+    todo.save(update_fields=update_fields)
+
+
+def _toggle_todo_important(todo):
+    """Görevin önemli durumunu değiştirir ve sadece değişen sütunları kaydeder."""
+    todo.is_important = not todo.is_important
+    if todo.is_important:
+        # Önemli yapıldıysa zamanı kaydet
+        todo.important_marked_at = timezone.now()
+    else:
+        # Önemli kaldırıldıysa zamanı temizle
+        todo.important_marked_at = None
+    todo.save(update_fields=['is_important', 'important_marked_at', 'updated_at'])
+
+
+def _todo_state(todo, user):
+    """AJAX görev işlemlerinin ortak JSON cevabı: görevin yeni durumu ve güncel sayaçlar."""
+    return {
+        'ok': True,
+        'id': todo.id,
+        'completed': todo.completed,
+        'is_important': todo.is_important,
+        'important_marked_at': todo.important_marked_at.isoformat() if todo.important_marked_at else None,
+        'counts': cache.todo_counts(user),
+    }
+
+
+def _todo_list_url(request, **overrides):
+    """
+    Yapılacaklar listesi URL'ini mevcut filtre ve sayfa bilgisiyle (sayfa numarası
+    veya keyset cursor'ı) oluşturur. `overrides` ile parametreler değiştirilebilir;
+    değeri None olan parametreler URL'den çıkarılır.
+    """
+    params = {key: request.GET.get(key) for key in ('filter', 'page', 'after', 'before')}
+    params.update(overrides)
+    params = {key: value for key, value in params.items() if value not in (None, '')}
+    url = reverse('tracker:todo_list')
+    return f"{url}?{urlencode(params)}" if params else url
+
+
 @login_required
 def todo_list(request):
     """
@@ -332,14 +418,6 @@ def todo_list(request):
         # Önemli görevler önce, sonra normal görevler
         all_todos = all_todos.filter(completed=True).order_by('-is_important', '-important_marked_at', '-created_at')
     
-    # Sayfalama - her sayfada 10 görev
-    paginator = Paginator(all_todos, 10)
-    page_number = request.GET.get('page', 1)
-    try:
-        todos = paginator.page(page_number)
-    except:
-        todos = paginator.page(1)
-    
     # Yeni görev ekleme formu
     form = None
     if request.method == 'POST':
@@ -359,72 +437,84 @@ def todo_list(request):
             todo_id = request.POST.get('todo_id')
             try:
                 todo = TodoItem.objects.get(id=todo_id, user=user)
-                todo.completed = not todo.completed
-                # Eğer görev tamamlandıysa önemli işaretini kaldır
-                if todo.completed and todo.is_important:
-                    todo.is_important = False
-                    todo.important_marked_at = None
-                todo.save()
+                _toggle_todo_completed(todo)
                 messages.success(request, 'Görev durumu güncellendi!')
             except TodoItem.DoesNotExist:
                 messages.error(request, 'Görev bulunamadı!')
-            # Mevcut sayfa numarasını ve filtreyi koruyarak yönlendir
-            filter_by = request.GET.get('filter', 'date_desc')
-            page = request.GET.get('page', 1)
-            return redirect(reverse('tracker:todo_list') + f"?page={page}&filter={filter_by}")
+            # Mevcut sayfayı (numara veya cursor) ve filtreyi koruyarak yönlendir
+            return redirect(_todo_list_url(request))
         elif 'delete_todo' in request.POST:
             # Görev silme
             todo_id = request.POST.get('todo_id')
-            filter_by = request.GET.get('filter', 'date_desc')
-            page = request.GET.get('page', 1)
+            page = request.GET.get('page')
             try:
                 todo = TodoItem.objects.get(id=todo_id, user=user)
                 todo.delete()
                 messages.success(request, 'Görev başarıyla silindi!')
-                # Silme sonrası sayfa numarasını kontrol et
+                # Sayfa numaralı modda silme sonrası sayfa numarasını kontrol et
                 # Eğer sayfa boş kalırsa bir önceki sayfaya git
-                remaining_todos = TodoItem.objects.filter(user=user)
-                if filter_type == 'pending':
-                    remaining_todos = remaining_todos.filter(completed=False)
-                elif filter_type == 'completed':
-                    remaining_todos = remaining_todos.filter(completed=True)
-                total_count = remaining_todos.count()
-                current_page = int(page)
-                if total_count > 0 and (current_page - 1) * 10 >= total_count and current_page > 1:
-                    page = current_page - 1
-            except TodoItem.DoesNotExist:
+                # (keyset modunda boş kalan sayfa GET isteğinde son sayfaya çevrilir)
+                if page is not None:
+                    remaining_todos = TodoItem.objects.filter(user=user)
+                    if filter_type == 'pending':
+                        remaining_todos = remaining_todos.filter(completed=False)
+                    elif filter_type == 'completed':
+                        remaining_todos = remaining_todos.filter(completed=True)
+                    total_count = remaining_todos.count()
+                    current_page = int(page)
+                    if total_count > 0 and (current_page - 1) * TODOS_PER_PAGE >= total_count and current_page > 1:
+                        page = current_page - 1
+            except (TodoItem.DoesNotExist, ValueError):
                 messages.error(request, 'Görev bulunamadı!')
-            # Mevcut sayfa numarasını ve filtreyi koruyarak yönlendir
-            return redirect(reverse('tracker:todo_list') + f"?page={page}&filter={filter_by}")
+            # Mevcut sayfayı (numara veya cursor) ve filtreyi koruyarak yönlendir
+            return redirect(_todo_list_url(request, page=page))
         elif 'toggle_important' in request.POST:
             # Görev önemli durumunu değiştir
             todo_id = request.POST.get('todo_id')
             try:
                 todo = TodoItem.objects.get(id=todo_id, user=user)
-                todo.is_important = not todo.is_important
-                if todo.is_important:
-                    # Önemli yapıldıysa zamanı kaydet
-                    todo.important_marked_at = timezone.now()
-                else:
-                    # Önemli kaldırıldıysa zamanı temizle
-                    todo.important_marked_at = None
-                todo.save()
+                _toggle_todo_important(todo)
                 messages.success(request, 'Görev önemli durumu güncellendi!')
             except TodoItem.DoesNotExist:
                 messages.error(request, 'Görev bulunamadı!')
-            # Mevcut sayfa numarasını ve filtreyi koruyarak yönlendir
-            filter_by = request.GET.get('filter', 'date_desc')
-            page = request.GET.get('page', 1)
-            return redirect(reverse('tracker:todo_list') + f"?page={page}&filter={filter_by}")
+            # Mevcut sayfayı (numara veya cursor) ve filtreyi koruyarak yönlendir
+            return redirect(_todo_list_url(request))
     
             # GET isteğinde veya form hatalıysa boş form göster
     if form is None:
         form = TodoForm()
     
-    # İstatistikler (tüm görevler için)
-    total_todos = all_todos.count()
-    completed_todos = all_todos.filter(completed=True).count()
-    pending_todos = all_todos.filter(completed=False).count()  # Tamamlanmamış görevler
+    # Sayfalama - her sayfada 10 görev (POST işlemleri yönlendirildiği için sadece sayfa gösteriminde)
+    # Varsayılan: keyset (cursor) sayfalama - COUNT/OFFSET sorgusu olmadan sabit süreli sayfa
+    # ?page=N verilirse sayfa numaralı (Paginator) mod kullanılır
+    paginator = None
+    pagination_mode = 'page' if 'page' in request.GET else 'keyset'
+    if pagination_mode == 'page':
+        paginator = Paginator(all_todos, TODOS_PER_PAGE)
+        page_number = request.GET.get('page', 1)
+        try:
+            todos = paginator.page(page_number)
+        except:
+            todos = paginator.page(1)
+    else:
+        try:
+            todos = keyset_page(
+                all_todos,
+                TODOS_PER_PAGE,
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except InvalidCursor:
+            todos = keyset_page(all_todos, TODOS_PER_PAGE)
+        if not todos and (request.GET.get('after') or request.GET.get('before')):
+            # Sayfa boş kaldıysa (ör. son sayfadaki tek görev silindi) son sayfayı göster
+            todos = keyset_page(all_todos, TODOS_PER_PAGE, last=True)
+    
+    # İstatistikler (filtreden bağımsız, kullanıcının tüm görevleri için - tek sorgu, önbellekli)
+    todo_counts = cache.todo_counts(user)
+    total_todos = todo_counts['total']
+    completed_todos = todo_counts['completed']
+    pending_todos = todo_counts['pending']  # Tamamlanmamış görevler
     
     context = {
         'todos': todos,
@@ -433,14 +523,99 @@ def todo_list(request):
         'completed_todos': completed_todos,
         'pending_todos': pending_todos,
         'paginator': paginator,
-        'current_page': todos.number,
-        'total_pages': paginator.num_pages,
+        'pagination_mode': pagination_mode,
+        'current_page': todos.number if paginator else None,
+        'total_pages': paginator.num_pages if paginator else None,
         'current_filter': filter_type,
     }
     
     return render(request, 'tracker/todo.html', context)
 
 
+@login_required
+def todo_toggle(request, todo_id):
+    """Görevin tamamlanma durumunu değiştirir. AJAX POST."""
+    from django.http import JsonResponse
+    todo = get_object_or_404(TodoItem, id=todo_id, user=request.user)
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST gerekli'}, status=400)
+    _toggle_todo_completed(todo)
+    return JsonResponse(_todo_state(todo, request.user))
+
+
+@login_required
+def todo_toggle_important(request, todo_id):
+    """Görevin önemli durumunu değiştirir. AJAX POST."""
+    from django.http import JsonResponse
+    todo = get_object_or_404(TodoItem, id=todo_id, user=request.user)
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST gerekli'}, status=400)
+    _toggle_todo_important(todo)
+    return JsonResponse(_todo_state(todo, request.user))
+
+
+# Toplu görev işleminde tek istekte kabul edilen en fazla görev sayısı
+TODO_BULK_LIMIT = 1000
+
+
+@login_required
+def todo_bulk_action(request):
+    """
+    Birden fazla görevi tek istekte tamamlar, geri alır, önemli işaretler,
+    işareti kaldırır veya siler. AJAX POST.
+
+    Parametreler: `action` (complete/uncomplete/star/unstar/delete) ve
+    `ids` (tekrarlanan alan veya virgülle ayrılmış liste). Güncellemeler tek
+    bir `UPDATE ... WHERE id IN (...) AND user_id = ...`, silme ise tek bir
+    `DELETE` sorgusuyla yapılır.
+    """
+    from django.http import JsonResponse
+
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST gerekli'}, status=400)
+
+    action = request.POST.get('action')
+    raw_ids = []
+    for value in request.POST.getlist('ids'):
+        raw_ids.extend(v for v in value.split(',') if v.strip())
+    try:
+        ids = sorted({int(v) for v in raw_ids})
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz görev listesi'}, status=400)
+    if not ids:
+        return JsonResponse({'ok': False, 'error': 'Görev seçilmedi'}, status=400)
+    if len(ids) > TODO_BULK_LIMIT:
+        return JsonResponse({'ok': False, 'error': f'En fazla {TODO_BULK_LIMIT} görev seçilebilir'}, status=400)
+
+    todos = TodoItem.objects.filter(user=request.user, id__in=ids)
+    now = timezone.now()
+    # auto_now alanı QuerySet.update ile güncellenmediği için updated_at elle yazılır
+    if action == 'complete':
+        # Tekli işlemdeki gibi tamamlanan görevin önemli işareti kaldırılır
+        affected = todos.filter(completed=False).update(
+            completed=True, is_important=False, important_marked_at=None, updated_at=now
+        )
+    elif action == 'uncomplete':
+        affected = todos.filter(completed=True).update(completed=False, updated_at=now)
+    elif action == 'star':
+        affected = todos.filter(is_important=False).update(is_important=True, important_marked_at=now, updated_at=now)
+    elif action == 'unstar':
+        affected = todos.filter(is_important=True).update(is_important=False, important_marked_at=None, updated_at=now)
+    elif action == 'delete':
+        affected, _ = todos.delete()
+    else:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz işlem'}, status=400)
+
+    # QuerySet.update sinyal göndermez; önbelleği elle geçersiz kıl
+    cache.invalidate_user(request.user.id)
+    return JsonResponse({
+        'ok': True,
+        'action': action,
+        'affected': affected,
+        'counts': cache.todo_counts(request.user),
+    })
+
+
 @login_required
 def edit_todo(request, todo_id):
     """
@@ -467,10 +642,8 @@ def edit_todo(request, todo_id):
             todo_item.created_at = original_created_at  # Oluşturulma tarihini koru
             todo_item.save()
             messages.success(request, 'Görev başarıyla güncellendi!')
-            # Mevcut sayfa numarasını ve filtreyi koruyarak yönlendir
-            filter_by = request.GET.get('filter', 'date_desc')
-            page = request.GET.get('page', 1)
-            return redirect(reverse('tracker:todo_list') + f"?page={page}&filter={filter_by}")
+            # Mevcut sayfayı (numara veya cursor) ve filtreyi koruyarak yönlendir
+            return redirect(_todo_list_url(request))
         else:
             messages.error(request, 'Lütfen formu doğru şekilde doldurun.')
     else:
@@ -515,7 +688,9 @@ def edit_session(request, session_id):
     if request.method == 'POST':
         form = StudySessionForm(request.POST, instance=session)
         if form.is_valid():
-            form.save()
+            # Tarih değiştiyse eski ve yeni günün özetleri ve streak durumu aynı transaction'da güncellenir
+            with transaction.atomic():
+                form.save()
             messages.success(request, 'Çalışma kaydı başarıyla güncellendi!')
             # Kaydedilen kaydın tarihine yönlendir (veya return_date'e)
             redirect_date = form.cleaned_data['date'].strftime('%Y-%m-%d')
@@ -566,7 +741,8 @@ def delete_session(request, session_id):
         # POST isteğinde kaydı sil
         # Silmeden önce kaydın tarihini al (redirect için)
         session_date = session.date
-        session.delete()
+        with transaction.atomic():
+            session.delete()
         messages.success(request, 'Çalışma kaydı başarıyla silindi!')
         # Silinen kaydın tarihine yönlendir (veya return_date'e)
         redirect_date = return_date or session_date.strftime('%Y-%m-%d')
@@ -581,6 +757,53 @@ def delete_session(request, session_id):
     return render(request, 'tracker/delete_session.html', context)
 
 
+@login_required
+def subject_suggestions(request):
+    """
+    Çalışma formundaki ders alanı için öneriler (JSON): `q` ile başlayan
+    dersler, en çok kullanılan önce. Çoğu istekte kullanıcının önbellekteki
+    en çok kullanılan dersleri yeterlidir ve veritabanına gidilmez.
+    """
+    from django.http import JsonResponse
+
+    query = request.GET.get('q', '')[:StudySession._meta.get_field('subject').max_length]
+    top = cache.top_subjects(request.user)
+    results = subjects.suggest(request.user.id, query, top)
+    return JsonResponse({
+        'ok': True,
+        'results': [{'name': subject['name'], 'uses': subject['uses']} for subject in results],
+    })
+
+
+@login_required
+def search_view(request):
+    """
+    Çalışma kayıtları, görevler ve takvim etkinliklerinde birleşik arama
+    (JSON). Parametreler: `q`, `page` (1'den başlar), `per_page`. Sonuçlar
+    alaka düzeyine göre sıralanır; `title` ve `snippet` eşleşen kelimeleri
+    <mark> ile işaretlenmiş HTML'dir.
+    """
+    from django.http import JsonResponse
+
+    query = request.GET.get('q', '').strip()[:200]
+    try:
+        page = int(request.GET.get('page', 1))
+        per_page = int(request.GET.get('per_page', search.SEARCH_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz sayfa'}, status=400)
+    try:
+        result = search.search(request.user, query, page=page, per_page=per_page)
+    except search.SearchError as exc:
+        return JsonResponse({'ok': False, 'error': str(exc)}, status=400)
+    return JsonResponse({
+        'ok': True,
+        'query': query,
+        'page': result.page,
+        'has_next': result.has_next,
+        'results': result.results,
+    })
+
+
 @login_required
 def statistics(request):
     """
@@ -590,23 +813,38 @@ def statistics(request):
     """
     user = request.user
     
-    today = timezone.now().date()
+    today = timezone.localdate()
     seven_days_ago = today - timedelta(days=6)
     thirty_days_ago = today - timedelta(days=29)
     
+    # Hedefler önce okunur: günlük hedef aşağıdaki streak hesaplarında eşik olarak kullanılır.
+    # Hedef değişirse streak durumu sinyal ile yeniden hesaplanır (bkz. signals.py).
+    goal_obj, _ = UserStudyGoal.objects.get_or_create(
+        user=user,
+        defaults={'weekly_goal_minutes': 420, 'monthly_goal_minutes': 1800}
+    )
+    if request.method == 'POST' and 'set_goals' in request.POST:
+        goal_form = StudyGoalForm(request.POST, instance=goal_obj)
+        if goal_form.is_valid():
+            goal_form.save()
+            messages.success(request, 'Hedefler kaydedildi.')
+            range_q = request.POST.get('range', '7')
+            return redirect(reverse('tracker:statistics') + f'?range={range_q}')
+    else:
+        goal_form = StudyGoalForm(instance=goal_obj)
+    streak_minutes = goal_obj.daily_goal_minutes
+    
     # ==========================
     # ÇALIŞMA İSTATİSTİKLERİ
     # ==========================
     all_sessions = StudySession.objects.filter(user=user)
     
-    # Günlük toplam süreleri (date -> dakika) çıkar
-    date_totals_qs = (
-        all_sessions
-        .values('date')
-        .annotate(total=Sum('duration'))
-        .order_by('date')
-    )
-    date_totals = {row['date']: row['total'] for row in date_totals_qs}
+    # Günlük toplam süreleri (date -> dakika) ve oturum sayıları günlük özet tablosundan (önbellekli)
+    date_totals = {}
+    date_session_counts = {}
+    for day, (minutes, session_count) in cache.daily_totals(user, today).items():
+        date_totals[day] = minutes
+        date_session_counts[day] = session_count
     
     # Toplam çalışma süresi (dakika) - şimdiye kadar
     total_study_minutes = sum(date_totals.values())
@@ -614,16 +852,14 @@ def statistics(request):
     total_study_remaining_minutes = total_study_minutes % 60
     
     # Toplam oturum sayısı
-    total_sessions = all_sessions.count()
+    total_sessions = sum(date_session_counts.values())
     
     # Çalışılan gün sayısı (en az bir kayıt olan gün)
     study_days_count = len(date_totals)
     
     # İlk ve son çalışma tarihi
-    first_session = all_sessions.order_by('date').first()
-    last_session = all_sessions.order_by('-date').first()
-    first_study_date = first_session.date if first_session else None
-    last_study_date = last_session.date if last_session else None
+    first_study_date = min(date_totals) if date_totals else None
+    last_study_date = max(date_totals) if date_totals else None
     
     # Çalışılan gün başına ortalama süre (şimdiye kadar)
     avg_minutes_per_study_day = 0
@@ -645,7 +881,7 @@ def statistics(request):
             total_days_avg_remaining_minutes = total_days_avg_minutes % 60
     
     # En uzun çalışma seansı
-    longest_session = all_sessions.order_by('-duration').first()
+    longest_session = all_sessions.order_by('-duration').only('duration', 'subject', 'date').first()
     longest_session_minutes = longest_session.duration if longest_session else 0
     longest_session_hours = longest_session_minutes // 60
     longest_session_remaining_minutes = longest_session_minutes % 60
@@ -653,27 +889,18 @@ def statistics(request):
     longest_session_date = longest_session.date if longest_session else None
     
     # Bugünkü çalışma
-    today_sessions = all_sessions.filter(date=today)
-    today_total_minutes = today_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    today_total_minutes = date_totals.get(today, 0)
     today_hours = today_total_minutes // 60
     today_minutes = today_total_minutes % 60
-    today_sessions_count = today_sessions.count()
+    today_sessions_count = date_session_counts.get(today, 0)
     
     # Son 7 gün çalışma (bugün dahil)
-    last_7_days_sessions = all_sessions.filter(date__gte=seven_days_ago, date__lte=today)
-    last_7_days_minutes = last_7_days_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    last_7_days_minutes = sum(m for d, m in date_totals.items() if seven_days_ago <= d <= today)
     last_7_days_hours = last_7_days_minutes // 60
     last_7_days_remaining_minutes = last_7_days_minutes % 60
     
     # Son 30 gün çalışma (bugün dahil)
-    last_30_days_sessions = all_sessions.filter(date__gte=thirty_days_ago, date__lte=today)
-    last_30_days_minutes = last_30_days_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    last_30_days_minutes = sum(m for d, m in date_totals.items() if thirty_days_ago <= d <= today)
     last_30_days_hours = last_30_days_minutes // 60
     last_30_days_remaining_minutes = last_30_days_minutes % 60
     
@@ -690,44 +917,29 @@ def statistics(request):
         })
     last_7_days_max_minutes = max((d['minutes'] for d in last_7_days_details), default=0)
 
-    # Mevcut streak (zaten kullanılan fonksiyon)
-    current_streak = calculate_streak(user)
-    
-    # En uzun streak (tüm zamanlar) - en az 60 dakika çalışılan ardışık günler
-    longest_streak = 0
-    current_run = 0
-    prev_date = None
-    for row in date_totals_qs:
-        day = row['date']
-        total = row['total'] or 0
-        if total >= 60:
-            if prev_date and day == prev_date + timedelta(days=1):
-                current_run += 1
-            else:
-                current_run = 1
-        else:
-            current_run = 0
-        if current_run > longest_streak:
-            longest_streak = current_run
-        prev_date = day
+    # Mevcut ve en uzun streak (tüm zamanlar) - günlük hedef kadar çalışılan ardışık günler;
+    # kullanıcının streak durumundan okunur (durum günlük hedefle hesaplanır, bkz. signals.py)
+    streak = cache.streak_summary(user, today)
+    current_streak = streak['current']
+    longest_streak = streak['longest']
     
     # Streak geçmişi (son 30 gün için takvim verisi)
     last_30_days_streak = []
     for i in range(29, -1, -1):
         day = today - timedelta(days=i)
         minutes = date_totals.get(day, 0)
-        has_streak = minutes >= 60
+        has_streak = minutes >= streak_minutes
         last_30_days_streak.append({
             'date': day,
             'minutes': minutes,
             'has_streak': has_streak,
         })
     
-    # Streak kaybetme uyarısı: Dün 60+ dk ise ve bugün henüz 60 dk altında ise
+    # Streak kaybetme uyarısı: Dün günlük hedef tutturulduysa ve bugün henüz tutturulmadıysa
     yesterday = today - timedelta(days=1)
     yesterday_minutes = date_totals.get(yesterday, 0)
-    streak_warning = yesterday_minutes >= 60 and today_total_minutes < 60
-    streak_warning_minutes_needed = max(0, 60 - today_total_minutes)
+    streak_warning = yesterday_minutes >= streak_minutes and today_total_minutes < streak_minutes
+    streak_warning_minutes_needed = max(0, streak_minutes - today_total_minutes)
     
     # ==========================
     # ZAMAN ARALIĞI (Dropdown için)
@@ -749,18 +961,16 @@ def statistics(request):
         range_start_date = today - timedelta(days=days - 1)
     
     if range_start_date:
-        range_sessions = all_sessions.filter(date__gte=range_start_date, date__lte=today)
+        range_days = [d for d in date_totals if range_start_date <= d <= today]
     else:
-        range_sessions = all_sessions
+        range_days = list(date_totals)
     
-    range_total_minutes = range_sessions.aggregate(
-        total=Sum('duration')
-    )['total'] or 0
+    range_total_minutes = sum(date_totals[d] for d in range_days)
     range_hours = range_total_minutes // 60
     range_remaining_minutes = range_total_minutes % 60
     
-    range_sessions_count = range_sessions.count()
-    range_days_count = range_sessions.values('date').distinct().count()
+    range_sessions_count = sum(date_session_counts[d] for d in range_days)
+    range_days_count = len(range_days)
     
     range_avg_minutes = 0
     if range_days_count > 0:
@@ -780,41 +990,32 @@ def statistics(request):
     genel_calisilan_hours = range_avg_hours
     genel_calisilan_minutes = range_avg_remaining_minutes
     
+    # Ders bazlı dağılım: seçilen aralıkta derslerin süresi, payı ve önceki aralığa göre trendi
+    # (tamsayı ders anahtarı üzerinde tek sorgu, önbellekli)
+    subject_breakdown = cache.subject_breakdown(user, today, range_start_date)
+    
     # ==========================
     # YAPILACAKLAR İSTATİSTİKLERİ
     # ==========================
-    all_todos = TodoItem.objects.filter(user=user)
+    # Tüm görev sayıları ve son 7 günün özeti tek bir koşullu aggregate sorgusuyla
+    todo_stats = cache.todo_summary(user, today)
     
-    total_todos = all_todos.count()
-    completed_todos = all_todos.filter(completed=True).count()
-    pending_todos = total_todos - completed_todos
-    important_todos = all_todos.filter(is_important=True).count()
+    total_todos = todo_stats['total']
+    completed_todos = todo_stats['completed']
+    pending_todos = todo_stats['pending']
+    important_todos = todo_stats['important']
     
     # Tamamlanma oranı
     completion_rate = 0
     if total_todos > 0:
         completion_rate = round((completed_todos / total_todos) * 100)
     
-    # Bugün oluşturulan görevler
-    created_today_todos = all_todos.filter(created_at__date=today).count()
-    
-    # Bugün tamamlanan görevler
-    completed_today_todos = all_todos.filter(
-        completed=True,
-        updated_at__date=today
-    ).count()
+    # Bugün oluşturulan ve bugün tamamlanan görevler
+    created_today_todos = todo_stats['created_today']
+    completed_today_todos = todo_stats['completed_today']
     
     # Son 7 gün görev özeti
-    last_7_days_todo_details = []
-    for i in range(6, -1, -1):
-        day = today - timedelta(days=i)
-        day_created = all_todos.filter(created_at__date=day).count()
-        day_completed = all_todos.filter(completed=True, updated_at__date=day).count()
-        last_7_days_todo_details.append({
-            'date': day,
-            'created': day_created,
-            'completed': day_completed,
-        })
+    last_7_days_todo_details = todo_stats['daily']
     
     # Görev trend grafiği için maksimum tamamlanan görev sayısı
     last_7_days_todo_max_completed = max((d['completed'] for d in last_7_days_todo_details), default=0)
@@ -827,48 +1028,17 @@ def statistics(request):
     # ==========================
     # SAAT BAZLI ÇALIŞMA DAĞILIMI
     # ==========================
-    # Oturumun yapıldığı saate yaklaşık olarak created_at saatine göre bakıyoruz
-    hour_buckets = [
-        {'label': 'Gece (00-03)', 'start': 0, 'end': 3, 'minutes': 0},
-        {'label': 'Sabah (04-07)', 'start': 4, 'end': 7, 'minutes': 0},
-        {'label': 'Sabah (08-11)', 'start': 8, 'end': 11, 'minutes': 0},
-        {'label': 'Öğlen (12-15)', 'start': 12, 'end': 15, 'minutes': 0},
-        {'label': 'Akşam (16-19)', 'start': 16, 'end': 19, 'minutes': 0},
-        {'label': 'Gece (20-23)', 'start': 20, 'end': 23, 'minutes': 0},
-    ]
-    for session in all_sessions:
-        if session.created_at:
-            hour = session.created_at.hour
-            for bucket in hour_buckets:
-                if bucket['start'] <= hour <= bucket['end']:
-                    bucket['minutes'] += session.duration
-                    break
-    hour_buckets_max = max((b['minutes'] for b in hour_buckets), default=0)
-    for bucket in hour_buckets:
-        if hour_buckets_max > 0 and bucket['minutes'] > 0:
-            bucket['percent'] = round((bucket['minutes'] / hour_buckets_max) * 100, 1)
-        else:
-            bucket['percent'] = 0
+    # Oturumun yapıldığı saate yaklaşık olarak created_at saatine (yerel saat) göre bakıyoruz.
+    # Gruplama veritabanında yapılır; kayıtlar tek tek yüklenmez.
+    hour_buckets, hour_buckets_max = stats.hour_buckets(user)
     
     # ==========================
     # HEDEF VE MOTİVASYON
     # ==========================
-    goal_obj, _ = UserStudyGoal.objects.get_or_create(
-        user=user,
-        defaults={'weekly_goal_minutes': 420, 'monthly_goal_minutes': 1800}
-    )
-    if request.method == 'POST' and 'set_goals' in request.POST:
-        goal_form = StudyGoalForm(request.POST, instance=goal_obj)
-        if goal_form.is_valid():
-            goal_form.save()
-            messages.success(request, 'Hedefler kaydedildi.')
-            range_q = request.POST.get('range', '7')
-            return redirect(reverse('tracker:statistics') + f'?range={range_q}')
-    else:
-        goal_form = StudyGoalForm(instance=goal_obj)
-    daily_goal_minutes = 60
+    daily_goal_minutes = goal_obj.daily_goal_minutes
     weekly_goal_minutes = goal_obj.weekly_goal_minutes
     monthly_goal_minutes = goal_obj.monthly_goal_minutes
+    daily_progress_percent = min(100, today_total_minutes * 100 // daily_goal_minutes) if daily_goal_minutes else 0
     weekly_progress_percent = 0
     monthly_progress_percent = 0
     if weekly_goal_minutes > 0:
@@ -903,7 +1073,7 @@ def statistics(request):
         {
             'code': 'week_streak',
             'title': '7 Günlük Seri',
-            'description': 'En az 7 gün üst üste 60+ dakika çalıştın.',
+            'description': f'En az 7 gün üst üste {streak_minutes}+ dakika çalıştın.',
             'earned': longest_streak >= 7,
             'progress': f'({longest_streak}/7)',
         },
@@ -980,7 +1150,9 @@ def statistics(request):
         'hour_buckets': hour_buckets,
         'hour_buckets_max': hour_buckets_max,
         # Hedefler ve motivasyon
+        'subject_breakdown': subject_breakdown,
         'daily_goal_minutes': daily_goal_minutes,
+        'daily_progress_percent': daily_progress_percent,
         'weekly_goal_minutes': weekly_goal_minutes,
         'monthly_goal_minutes': monthly_goal_minutes,
         'weekly_progress_percent': weekly_progress_percent,
@@ -992,6 +1164,95 @@ def statistics(request):
     return render(request, 'tracker/statistics.html', context)
 
 
+@login_required
+def export_data(request):
+    """
+    Kullanıcının verilerini CSV veya JSON olarak indirir (akış halinde).
+
+    Parametreler:
+        format: 'csv' (varsayılan) veya 'json'
+        type: 'sessions' (varsayılan), 'todos', 'events' veya sadece JSON için 'all'
+        start, end: isteğe bağlı tarih aralığı (yyyy-mm-dd, ikisi dahil)
+    """
+    from django.http import JsonResponse, StreamingHttpResponse
+    from datetime import datetime
+
+    export_format = request.GET.get('format', 'csv')
+    dataset = request.GET.get('type', 'sessions')
+    if export_format not in export.EXPORT_FORMATS:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz format'}, status=400)
+    if dataset == 'all' and export_format == 'json':
+        datasets = list(export.EXPORT_DATASETS)
+    elif dataset in export.EXPORT_DATASETS:
+        datasets = [dataset]
+    else:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz veri türü'}, status=400)
+
+    try:
+        start = datetime.strptime(request.GET['start'], '%Y-%m-%d').date() if request.GET.get('start') else None
+        end = datetime.strptime(request.GET['end'], '%Y-%m-%d').date() if request.GET.get('end') else None
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Geçersiz tarih'}, status=400)
+
+    filename = f"studytracker_{dataset}_{timezone.localdate().isoformat()}.{export_format}"
+    if export_format == 'csv':
+        response = StreamingHttpResponse(
+            export.iter_csv(request.user, dataset, start, end),
+            content_type='text/csv; charset=utf-8',
+        )
+    else:
+        response = StreamingHttpResponse(
+            export.iter_json(request.user, datasets, start, end),
+            content_type='application/json; charset=utf-8',
+        )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Web üzerinden içe aktarılabilecek en fazla satır sayısı
+IMPORT_MAX_ROWS = 200000
+
+# İçe aktarma sonrası mesaj olarak gösterilecek en fazla satır hatası
+IMPORT_SHOWN_ERRORS = 5
+
+
+@login_required
+def import_data(request):
+    """
+    CSV dosyasından çalışma kayıtlarını toplu olarak içe aktarır.
+    Sonuç mesaj olarak gösterilip istatistikler sayfasına yönlendirilir.
+    """
+    import io
+
+    if request.method != 'POST':
+        return redirect('tracker:statistics')
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        messages.error(request, 'Lütfen bir CSV dosyası seçin.')
+        return redirect('tracker:statistics')
+
+    skip_invalid = bool(request.POST.get('skip_invalid'))
+    # utf-8-sig: Excel'in eklediği BOM karakterini atla
+    lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        result = importer.import_sessions(request.user, lines, skip_invalid=skip_invalid, max_rows=IMPORT_MAX_ROWS)
+    except importer.InvalidImportFile as exc:
+        messages.error(request, f'Dosya içe aktarılamadı: {exc}')
+        return redirect('tracker:statistics')
+
+    for line, error in result.errors[:IMPORT_SHOWN_ERRORS]:
+        messages.error(request, f'Satır {line}: {error}')
+    if result.error_count > IMPORT_SHOWN_ERRORS:
+        messages.error(request, f'... ve {result.error_count - IMPORT_SHOWN_ERRORS} hata daha.')
+
+    if result.rolled_back:
+        messages.error(request, f'{result.error_count} hatalı satır nedeniyle hiçbir kayıt eklenmedi.')
+    else:
+        messages.success(request, f'{result.created} çalışma kaydı içe aktarıldı.')
+    return redirect('tracker:statistics')
+
+
 # Takvim: depolanan renk -> pastel gösterim rengi (eski renkler için)
 CALENDAR_DISPLAY_COLOR_MAP = {
     '#7f00ff': '#c9a0ff', '#667eea': '#c9a0ff',
@@ -1018,98 +1279,189 @@ def _calendar_text_color(hex_str):
     return '#fff' if lum < 180 else '#000'
 
 
+def _build_calendar_color_table():
+    """Seçilebilir ve eski renklerin hepsi için (gösterim rengi, metin rengi) tablosu."""
+    table = {}
+    for color in [value for value, _ in CalendarEvent.COLOR_CHOICES] + list(CALENDAR_DISPLAY_COLOR_MAP):
+        display_hex = CALENDAR_DISPLAY_COLOR_MAP.get(color, color)
+        table[color] = (display_hex, _calendar_text_color(display_hex))
+    return table
+
+
+# Depolanan renk -> (gösterim rengi, metin rengi); modül yüklenirken bir kez hesaplanır
+CALENDAR_COLOR_TABLE = _build_calendar_color_table()
+
+
+def _calendar_colors(color):
+    """Etkinlik rengi için (gösterim rengi, metin rengi). Tabloda olmayan renkler hesaplanır."""
+    colors = CALENDAR_COLOR_TABLE.get(color)
+    if colors is None:
+        display_hex = CALENDAR_DISPLAY_COLOR_MAP.get(color, color)
+        colors = (display_hex, _calendar_text_color(display_hex))
+    return colors
+
+
+@lru_cache(maxsize=256)
+def _month_layout(year, month):
+    """
+    Ayın 6 haftalık (42 hücre) takvim ızgarası; hafta pazartesi ile başlar.
+    Her hücre (tarih, yyyy-mm-dd) çifti veya ay dışı günler için None'dır.
+    Sonuç değiştirilemez (tuple) olduğu için (yıl, ay) başına bir kez hesaplanıp paylaşılır.
+    """
+    first = date(year, month, 1)
+    last_day = monthrange(year, month)[1]
+    start_weekday = first.weekday()  # Pazartesi=0
+    cells = [None] * start_weekday
+    for day in range(1, last_day + 1):
+        d = date(year, month, day)
+        cells.append((d, d.isoformat()))
+    cells += [None] * (42 - len(cells))
+    return tuple(tuple(cells[i:i + 7]) for i in range(0, 42, 7))
+
+
+# Takvim etkinlik API'sinde tek istekte istenebilecek en uzun aralık (gün)
+CALENDAR_RANGE_MAX_DAYS = 366
+
+# Tarayıcının ileri/geri gezinme için tek istekte önceden yükleyeceği ay sayısı (her yön)
+CALENDAR_PREFETCH_MONTHS = 3
+
+MONTH_NAMES = ['', 'Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+               'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+
+
+def _shift_month(year, month, offset):
+    """(yıl, ay) çiftini `offset` ay kaydırır."""
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+
+def _month_span(year, month, months=1):
+    """`year/month` ile başlayan `months` aylık aralığın ilk ve son gününü döndürür."""
+    last_year, last_month = _shift_month(year, month, months - 1)
+    return date(year, month, 1), date(last_year, last_month, monthrange(last_year, last_month)[1])
+
+
+def _calendar_study_by_date(user, start, end):
+    """Tarih aralığındaki çalışma dakikaları `{yyyy-mm-dd: dakika}` (günlük özet tablosundan, tek sorgu)."""
+    return {day.isoformat(): minutes for day, minutes in rollups.minutes_by_date(user, start, end).items()}
+
+
+def _calendar_events_by_date(user, start, end):
+    """
+    Tarih aralığındaki etkinlikleri tek sorguda getirir ve
+    `{yyyy-mm-dd: [etkinlik sözlüğü, ...]}` olarak gruplar.
+    """
+    events = CalendarEvent.objects.filter(
+        user=user,
+        date__gte=start,
+        date__lte=end
+    ).order_by('date', 'created_at').values_list('id', 'date', 'title', 'color')
+
+    events_by_date = {}
+    for event_id, event_date, title, color in events:
+        display_hex, text_color = _calendar_colors(color)
+        events_by_date.setdefault(event_date.isoformat(), []).append({
+            'id': event_id, 'title': title, 'color': color,
+            'color_display': display_hex, 'text_color': text_color,
+        })
+    return events_by_date
+
+
+@login_required
+def calendar_events(request):
+    """
+    Tarih aralığındaki takvim etkinliklerini JSON olarak döndürür (tek sorgu).
+
+    Aralık `start` ve `end` (yyyy-mm-dd, ikisi dahil) ile ya da `year`, `month`
+    ve isteğe bağlı `months` (varsayılan 1) ile verilir. Takvim sayfası komşu
+    ayları bu uç noktayla toplu olarak önceden yükler. Cevapta günlük çalışma
+    dakikaları (`study`) da bulunur.
+    """
+    from django.http import JsonResponse
+    from datetime import datetime
+
+    try:
+        if 'start' in request.GET or 'end' in request.GET:
+            start = datetime.strptime(request.GET.get('start', ''), '%Y-%m-%d').date()
+            end = datetime.strptime(request.GET.get('end', ''), '%Y-%m-%d').date()
+        else:
+            months = int(request.GET.get('months', 1))
+            if months < 1:
+                raise ValueError
+            start, end = _month_span(int(request.GET['year']), int(request.GET['month']), months)
+    except (KeyError, ValueError, OverflowError):
+        return JsonResponse({'ok': False, 'error': 'Geçersiz tarih aralığı'}, status=400)
+
+    if end < start or (end - start).days >= CALENDAR_RANGE_MAX_DAYS:
+        return JsonResponse(
+            {'ok': False, 'error': f'Tarih aralığı en fazla {CALENDAR_RANGE_MAX_DAYS} gün olabilir'},
+            status=400,
+        )
+
+    return JsonResponse({
+        'ok': True,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'events': _calendar_events_by_date(request.user, start, end),
+        'study': _calendar_study_by_date(request.user, start, end),
+        'streak_minutes': cache.daily_threshold(request.user),
+    })
+
+
 @login_required
 def calendar_view(request):
     """
     Takvim sayfası. Sayfada tek ay gösterilir, ok ile ileri/geri gidilir.
     """
-    from datetime import date
-    from calendar import monthrange
-
     # Bugünü uygulama saat dilimine göre al (UTC değil, örn. Europe/Istanbul)
     now_local = timezone.localtime(timezone.now())
     today = now_local.date()
     offset = int(request.GET.get('offset', 0))  # -1: geri, 0: şimdi, 1: ileri
-    year = today.year
-    month = today.month + offset  # her tıklamada 1 ay kaydır
-    while month > 12:
-        month -= 12
-        year += 1
-    while month < 1:
-        month += 12
-        year -= 1
-
-    def month_days(y, m):
-        first = date(y, m, 1)
-        last_day = monthrange(y, m)[1]
-        start_weekday = first.weekday()  # Pazartesi=0 (hafta pazartesi ile başlar)
-        weeks = []
-        day = 1
-        week = [None] * 7
-        for i in range(42):
-            pos = i % 7  # hafta içindeki gün (0-6)
-            if i < start_weekday and day == 1:
-                week[pos] = None
-            else:
-                if day <= last_day:
-                    week[pos] = date(y, m, day)
-                    day += 1
-                else:
-                    week[pos] = None
-            if (i + 1) % 7 == 0:
-                weeks.append(week)
-                week = [None] * 7
-        return weeks, first
-
-    weeks, first_day = month_days(year, month)
-    month_name = ['', 'Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
-                  'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'][month]
+    year, month = _shift_month(today.year, today.month, offset)  # her tıklamada 1 ay kaydır
+
+    # Etkinlikleri getir: sadece bu ay (komşu aylar tarayıcıda calendar_events ile yüklenir)
+    start, end = _month_span(year, month)
+    events_by_date = _calendar_events_by_date(request.user, start, end)
+    # Günlük çalışma dakikaları (günlük özet tablosundan tek sorgu)
+    study_by_date = _calendar_study_by_date(request.user, start, end)
+    # Streak günlerini işaretlemek için kullanıcının günlük hedefi
+    streak_minutes = cache.daily_threshold(request.user)
+
+    # Önbellekteki ay ızgarasındaki günlere etkinlik listesi ve çalışma süresi ekle
+    weeks = [
+        [
+            {
+                'date': cell[0],
+                'date_iso': cell[1],
+                'events': events_by_date.get(cell[1], []),
+                'study_minutes': study_by_date.get(cell[1], 0),
+                'streak_day': study_by_date.get(cell[1], 0) >= streak_minutes,
+            } if cell else None
+            for cell in week
+        ]
+        for week in _month_layout(year, month)
+    ]
     months_data = [{
         'year': year,
         'month': month,
-        'month_name': month_name,
+        'month_name': MONTH_NAMES[month],
         'weeks': weeks,
-        'first_day': first_day,
+        'first_day': start,
     }]
 
-    # Etkinlikleri getir: sadece bu ay
-    start = date(year, month, 1)
-    end_last = monthrange(year, month)[1]
-    end = date(year, month, end_last)
-
-    events = CalendarEvent.objects.filter(
-        user=request.user,
-        date__gte=start,
-        date__lte=end
-    ).order_by('date', 'created_at')
-
-    events_by_date = {}
-    for e in events:
-        key = e.date.isoformat()
-        if key not in events_by_date:
-            events_by_date[key] = []
-        display_hex = CALENDAR_DISPLAY_COLOR_MAP.get(e.color, e.color)
-        text_color = _calendar_text_color(display_hex)
-        events_by_date[key].append({
-            'id': e.id, 'title': e.title, 'color': e.color,
-            'color_display': display_hex, 'text_color': text_color,
-        })
-
-    # Haftalardaki günlere etkinlik listesi ekle
-    for week in months_data[0]['weeks']:
-        for i, d in enumerate(week):
-            if d is not None:
-                key = d.isoformat()
-                week[i] = {'date': d, 'date_iso': key, 'events': events_by_date.get(key, [])}
-            else:
-                week[i] = None
-
     context = {
         'months_data': months_data,
         'today': today.isoformat(),
         'next_offset': offset + 1,
         'prev_offset': offset - 1,
         'color_choices': CalendarEvent.COLOR_CHOICES,
+        'offset': offset,
+        'year': year,
+        'month': month,
+        'events_by_date': events_by_date,
+        'study_by_date': study_by_date,
+        'streak_minutes': streak_minutes,
+        'prefetch_months': CALENDAR_PREFETCH_MONTHS,
     }
     return render(request, 'tracker/calendar.html', context)
 